@@ -0,0 +1,109 @@
+# Archivo: benchmarks/carga_servicio.py
+# Prueba de carga del servicio HTTP/JSON: varias conexiones keep-alive envían
+# una mezcla de búsquedas y check-ins y se informan peticiones por segundo y
+# latencias. Sin host/puerto levanta una instancia local sobre un CSV temporal.
+# Uso: python -m benchmarks.carga_servicio [peticiones] [conexiones] [host:puerto]
+
+import asyncio
+import json
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from modulos.operaciones import cerrar_persistencia, crear_estructura
+from modulos.servicio import iniciar_servicio
+
+PETICIONES_POR_DEFECTO = 20_000
+CONEXIONES_POR_DEFECTO = 32
+
+# Proporción de check-ins (el resto son búsquedas por documento o habitación)
+PROPORCION_ESCRITURAS = 0.2
+
+
+async def _pedir(lector, escritor, metodo: str, ruta: str, datos=None) -> int:
+    cuerpo = b"" if datos is None else json.dumps(datos).encode()
+    escritor.write(
+        f"{metodo} {ruta} HTTP/1.1\r\nHost: carga\r\n"
+        f"Content-Length: {len(cuerpo)}\r\n\r\n".encode() + cuerpo
+    )
+    cabecera = await lector.readuntil(b"\r\n\r\n")
+    largo = 0
+    for linea in cabecera.split(b"\r\n"):
+        if linea.lower().startswith(b"content-length:"):
+            largo = int(linea.split(b":")[1])
+    await lector.readexactly(largo)
+    return int(cabecera.split(b" ", 2)[1])
+
+
+async def _cliente(host: str, puerto: int, numero: int, cantidad: int) -> list:
+    # Una conexión que envía `cantidad` peticiones seguidas; devuelve latencias
+    lector, escritor = await asyncio.open_connection(host, puerto)
+    latencias = []
+    cada_escritura = round(1 / PROPORCION_ESCRITURAS)
+    for i in range(cantidad):
+        inicio = time.perf_counter()
+        if i % cada_escritura == 0:
+            documento = f"C{numero}X{i}"
+            await _pedir(lector, escritor, "POST", "/pasajeros", {
+                "nombre": f"Carga {documento}",
+                "documento": documento,
+                "nacionalidad": "Chilena",
+                "habitacion": 10_000 + numero * cantidad + i,
+                "fecha_ingreso": "10-01-2025",
+                "fecha_salida": "12-01-2025",
+                "estado": "Alojado",
+            })
+        elif i % 2:
+            await _pedir(lector, escritor, "GET", f"/pasajeros/C{numero}X0")
+        else:
+            await _pedir(lector, escritor, "GET", f"/habitaciones/{10_000 + numero * cantidad}")
+        latencias.append(time.perf_counter() - inicio)
+    escritor.close()
+    return latencias
+
+
+def _percentil(valores: list, p: float) -> float:
+    return valores[min(len(valores) - 1, int(len(valores) * p))]
+
+
+async def _cargar(host: str, puerto: int, peticiones: int, conexiones: int) -> None:
+    por_conexion = max(1, peticiones // conexiones)
+    inicio = time.perf_counter()
+    resultados = await asyncio.gather(
+        *(_cliente(host, puerto, n, por_conexion) for n in range(conexiones))
+    )
+    segundos = time.perf_counter() - inicio
+
+    latencias = sorted(x for lista in resultados for x in lista)
+    print(f"peticiones: {len(latencias):,} en {segundos:.2f} s "
+          f"({len(latencias) / segundos:,.0f} req/s, {conexiones} conexiones)")
+    for nombre, p in (("p50", 0.50), ("p95", 0.95), ("p99", 0.99)):
+        print(f"latencia {nombre}: {_percentil(latencias, p) * 1000:.2f} ms")
+
+
+async def _con_instancia_local(peticiones: int, conexiones: int) -> None:
+    with tempfile.TemporaryDirectory() as directorio:
+        sistema = crear_estructura(ruta=Path(directorio) / "carga.csv")
+        servidor = await iniciar_servicio(sistema, "127.0.0.1", 0)
+        puerto = servidor.sockets[0].getsockname()[1]
+        try:
+            await _cargar("127.0.0.1", puerto, peticiones, conexiones)
+        finally:
+            servidor.close()
+            await servidor.wait_closed()
+            cerrar_persistencia(sistema)
+
+
+def main(argumentos: list) -> None:
+    peticiones = int(argumentos[0]) if argumentos else PETICIONES_POR_DEFECTO
+    conexiones = int(argumentos[1]) if len(argumentos) > 1 else CONEXIONES_POR_DEFECTO
+    if len(argumentos) > 2:
+        host, puerto = argumentos[2].rsplit(":", 1)
+        asyncio.run(_cargar(host, int(puerto), peticiones, conexiones))
+    else:
+        asyncio.run(_con_instancia_local(peticiones, conexiones))
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -0,0 +1,151 @@
+# Archivo: benchmarks/datos.py
+# Generador reproducible (con semilla) de pasajeros realistas para las
+# mediciones: RUT válidos y pasaportes extranjeros, estadías que no se pisan
+# dentro de cada habitación, pisos con habitaciones numeradas 101, 102, ...
+# y estados según la fecha de referencia (Check-out, Alojado o Reservado).
+# Uso: python -m benchmarks.datos cantidad ruta.csv [semilla]
+
+import csv
+import math
+import random
+import sys
+from datetime import date
+from pathlib import Path
+
+from modulos.operaciones import CAMPOS_CSV
+from modulos.rut import calcular_dv
+
+SEMILLA_POR_DEFECTO = 42
+
+# Día que los datos toman como "hoy" (fijo, para que sean reproducibles)
+HOY = date(2025, 6, 15)
+
+# Habitaciones por piso y pasajeros (estadías) por habitación en promedio
+HABITACIONES_POR_PISO = 30
+ESTADIAS_POR_HABITACION = 250
+
+# Nacionalidad -> (peso, prefijo del pasaporte); None = chilena, usa RUT
+_NACIONALIDADES = {
+    "Chilena": (60, None),
+    "Argentina": (10, "AR"),
+    "Peruana": (8, "PE"),
+    "Boliviana": (4, "BO"),
+    "Brasileña": (5, "BR"),
+    "Colombiana": (4, "CO"),
+    "Estadounidense": (3, "US"),
+    "Española": (3, "ES"),
+    "Alemana": (2, "DE"),
+    "Francesa": (1, "FR"),
+}
+
+_NOMBRES = (
+    "Ana", "María", "José", "Juan", "Luis", "Carmen", "Jorge", "Camila", "Pedro",
+    "Valentina", "Sofía", "Diego", "Martina", "Matías", "Isidora", "Benjamín",
+    "Florencia", "Tomás", "Catalina", "Vicente", "Agustina", "Joaquín", "Ignacia",
+    "Lucas", "Emilia", "Gabriel", "Antonia", "Felipe", "Josefa", "Cristóbal",
+    "Renata", "Maximiliano", "Francisca", "Sebastián", "Javiera", "Nicolás",
+)
+_APELLIDOS = (
+    "González", "Muñoz", "Rojas", "Díaz", "Pérez", "Soto", "Contreras", "Silva",
+    "Martínez", "Sepúlveda", "Morales", "Rodríguez", "López", "Fuentes", "Hernández",
+    "Torres", "Araya", "Flores", "Espinoza", "Valenzuela", "Castillo", "Tapia",
+    "Reyes", "Gutiérrez", "Castro", "Pizarro", "Álvarez", "Vásquez", "Sánchez",
+    "Fernández", "Ramírez", "Carrasco", "Gómez", "Cortés", "Herrera", "Núñez",
+    "Jara", "Vergara", "Rivera", "Figueroa", "Riquelme", "García", "Miranda",
+    "Bravo", "Vera", "Molina", "Vega", "Campos", "Sandoval", "Orellana",
+)
+
+# Noches por estadía (peso de cada duración): muchas cortas, pocas largas
+_NOCHES = (1, 2, 3, 4, 5, 6, 7, 10, 14, 21)
+_PESOS_NOCHES = (20, 25, 18, 10, 8, 5, 6, 4, 3, 1)
+
+
+def habitaciones(cantidad: int) -> list:
+    # Habitaciones del hotel según la cantidad de pasajeros: piso * 100 + número
+    total = max(HABITACIONES_POR_PISO, math.ceil(cantidad / ESTADIAS_POR_HABITACION))
+    pisos = math.ceil(total / HABITACIONES_POR_PISO)
+    return [
+        piso * 100 + numero
+        for piso in range(1, pisos + 1)
+        for numero in range(1, HABITACIONES_POR_PISO + 1)
+    ][:total]
+
+
+def _documento(azar: random.Random, numero: int, prefijo: str | None) -> str:
+    # RUT con dígito verificador correcto o pasaporte; únicos por `numero`
+    if prefijo is None:
+        cuerpo = str(3_000_000 + numero * 20 + azar.randrange(20))
+        return f"{cuerpo}-{calcular_dv(cuerpo)}"
+    return f"{prefijo}{azar.randrange(10)}{numero:08d}"
+
+
+def generar_pasajeros(cantidad: int, semilla: int = SEMILLA_POR_DEFECTO):
+    # Genera `cantidad` pasajeros (dicts con los campos del CSV) en orden de
+    # registro. Cada habitación tiene una línea de tiempo de estadías
+    # consecutivas que termina poco después de HOY, así hay historia pasada,
+    # huéspedes alojados y algunas reservas.
+    azar = random.Random(semilla)
+    nacionalidades = list(_NACIONALIDADES)
+    pesos = [peso for peso, _ in _NACIONALIDADES.values()]
+    cuartos = habitaciones(cantidad)
+
+    noches_promedio = sum(n * p for n, p in zip(_NOCHES, _PESOS_NOCHES)) / sum(_PESOS_NOCHES)
+    estadias = math.ceil(cantidad / len(cuartos))
+    dias_por_habitacion = int(estadias * (noches_promedio + 1))
+    # Próximo día libre de cada habitación (ordinal), con un desfase al azar
+    libre = [
+        HOY.toordinal() - int(dias_por_habitacion * 0.95) + azar.randrange(7)
+        for _ in cuartos
+    ]
+    hoy = HOY.toordinal()
+
+    for numero in range(cantidad):
+        posicion = numero % len(cuartos)
+        ingreso = libre[posicion] + (0 if azar.random() < 0.5 else azar.randint(1, 3))
+        salida = ingreso + azar.choices(_NOCHES, _PESOS_NOCHES)[0]
+        libre[posicion] = salida
+
+        nacionalidad = azar.choices(nacionalidades, pesos)[0]
+        if salida < hoy:
+            estado = "Check-out"
+        elif ingreso <= hoy:
+            estado = "Alojado"
+        else:
+            estado = "Reservado"
+
+        yield {
+            "documento": _documento(azar, numero, _NACIONALIDADES[nacionalidad][1]),
+            "nombre": (
+                f"{azar.choice(_NOMBRES)} {azar.choice(_APELLIDOS)} "
+                f"{azar.choice(_APELLIDOS)}"
+            ),
+            "nacionalidad": nacionalidad,
+            "habitacion": cuartos[posicion],
+            "fecha_ingreso": date.fromordinal(ingreso).strftime("%d-%m-%Y"),
+            "fecha_salida": date.fromordinal(salida).strftime("%d-%m-%Y"),
+            "estado": estado,
+        }
+
+
+def escribir_csv(ruta: Path, pasajeros) -> int:
+    # Escribe los pasajeros con el encabezado del sistema. Devuelve cuántos.
+    cantidad = 0
+    with ruta.open("w", newline="", encoding="utf-8") as archivo:
+        escritor = csv.DictWriter(archivo, fieldnames=CAMPOS_CSV)
+        escritor.writeheader()
+        for pasajero in pasajeros:
+            escritor.writerow(pasajero)
+            cantidad += 1
+    return cantidad
+
+
+def main(argumentos: list) -> None:
+    cantidad = int(argumentos[0])
+    ruta = Path(argumentos[1])
+    semilla = int(argumentos[2]) if len(argumentos) > 2 else SEMILLA_POR_DEFECTO
+    escritos = escribir_csv(ruta, generar_pasajeros(cantidad, semilla))
+    print(f"{escritos:,} pasajeros en {ruta}")
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -0,0 +1,69 @@
+# Archivo: benchmarks/documentos.py
+# Rendimiento de la normalización de documentos: funciones por ítem frente
+# a la API por lotes (en este proceso y repartida entre procesos).
+# Uso: python -m benchmarks.documentos [cantidad] [procesos]
+
+import os
+import random
+import sys
+import time
+
+from modulos.documentos import (
+    normalizar_documento,
+    normalizar_documentos,
+    parece_rut_chileno,
+)
+from modulos.rut import calcular_dv, formatear_rut
+
+CANTIDAD_POR_DEFECTO = 1_000_000
+
+
+def generar_documentos(cantidad: int, semilla: int = 42) -> list:
+    # Mezcla de RUT válidos, RUT con DV erróneo y pasaportes
+    azar = random.Random(semilla)
+    documentos = []
+    for _ in range(cantidad):
+        tipo = azar.random()
+        cuerpo = str(azar.randint(1_000_000, 25_000_000))
+        if tipo < 0.7:
+            documentos.append(f"{int(cuerpo):,}".replace(",", ".") + "-" + calcular_dv(cuerpo))
+        elif tipo < 0.8:
+            documentos.append(f"{cuerpo}-{(int(calcular_dv(cuerpo).replace('K', '10')) + 1) % 10}")
+        else:
+            documentos.append(f"P{azar.randint(10**6, 10**9)}")
+    return documentos
+
+
+def _cadena_anterior(documento: str) -> str | None:
+    # Camino previo: parece_rut_chileno -> formatear_rut (limpia dos veces)
+    doc = documento.strip()
+    if parece_rut_chileno(doc):
+        return formatear_rut(doc)
+    doc = doc.upper()
+    return doc if len(doc) >= 5 else None
+
+
+def _medir(nombre: str, funcion, documentos: list) -> None:
+    inicio = time.perf_counter()
+    funcion(documentos)
+    segundos = time.perf_counter() - inicio
+    print(f"{nombre:<28} {segundos:8.3f} s  {len(documentos) / segundos:>12,.0f} docs/s")
+
+
+def main(argumentos: list) -> None:
+    cantidad = int(argumentos[0]) if argumentos else CANTIDAD_POR_DEFECTO
+    procesos = int(argumentos[1]) if len(argumentos) > 1 else os.cpu_count() or 1
+    documentos = generar_documentos(cantidad)
+
+    _medir("cadena anterior por ítem", lambda d: [_cadena_anterior(x) for x in d], documentos)
+    _medir("normalizar_documento", lambda d: [normalizar_documento(x) for x in d], documentos)
+    _medir("lotes, 1 proceso", lambda d: normalizar_documentos(d, procesos=1), documentos)
+    _medir(
+        f"lotes, {procesos} procesos",
+        lambda d: normalizar_documentos(d, procesos=procesos),
+        documentos,
+    )
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
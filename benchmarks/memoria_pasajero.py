@@ -0,0 +1,56 @@
+# Archivo: benchmarks/memoria_pasajero.py
+# Compara la memoria de N pasajeros guardados como dict o como Pasajero.
+# Uso: python -m benchmarks.memoria_pasajero [cantidad ...]
+
+import sys
+import tracemalloc
+
+from modulos.operaciones import Pasajero
+
+CANTIDADES_POR_DEFECTO = (10_000, 100_000, 1_000_000)
+NACIONALIDADES = ("Chilena", "Peruana", "Argentina", "Boliviana", "Brasileña")
+ESTADOS = ("Alojado", "Check-out")
+
+
+def _fila(numero: int) -> dict:
+    # Simula una fila recién leída del CSV: textos nuevos en cada fila
+    dia = numero % 28 + 1
+    return {
+        "documento": f"{10_000_000 + numero}-{numero % 10}",
+        "nombre": f"Pasajero {numero}",
+        "nacionalidad": "".join(NACIONALIDADES[numero % len(NACIONALIDADES)]),
+        "habitacion": 100 + numero % 900,
+        "fecha_ingreso": f"{dia:02d}-01-2025",
+        "fecha_salida": f"{dia:02d}-02-2025",
+        "estado": "".join(ESTADOS[numero % len(ESTADOS)]),
+    }
+
+
+def medir(cantidad: int, compacto: bool) -> int:
+    # Bytes retenidos por `cantidad` pasajeros en la representación elegida
+    tracemalloc.start()
+    inicio = tracemalloc.get_traced_memory()[0]
+    if compacto:
+        pasajeros = {p["documento"]: p for p in map(Pasajero, map(_fila, range(cantidad)))}
+    else:
+        pasajeros = {p["documento"]: p for p in map(_fila, range(cantidad))}
+    usado = tracemalloc.get_traced_memory()[0] - inicio
+    tracemalloc.stop()
+    del pasajeros
+    return usado
+
+
+def main(argumentos: list) -> None:
+    cantidades = [int(valor) for valor in argumentos] or CANTIDADES_POR_DEFECTO
+    print(f"{'pasajeros':>10} | {'dict (MB)':>10} | {'Pasajero (MB)':>13} | ahorro")
+    for cantidad in cantidades:
+        con_dict = medir(cantidad, compacto=False)
+        compacto = medir(cantidad, compacto=True)
+        print(
+            f"{cantidad:>10} | {con_dict / 2**20:>10.1f} | "
+            f"{compacto / 2**20:>13.1f} | {1 - compacto / con_dict:.0%}"
+        )
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
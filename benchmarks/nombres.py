@@ -0,0 +1,70 @@
+# Archivo: benchmarks/nombres.py
+# Latencia de la búsqueda por nombre (prefijo y aproximada) con muchos
+# pasajeros, usando el índice de nombres directamente.
+# Uso: python -m benchmarks.nombres [cantidad]
+
+import random
+import sys
+import time
+
+from modulos.nombres import IndiceNombres
+
+CANTIDAD_POR_DEFECTO = 1_000_000
+
+_NOMBRES = (
+    "Ana", "María", "José", "Juan", "Luis", "Carmen", "Jorge", "Camila", "Pedro",
+    "Valentina", "Sofía", "Diego", "Martina", "Matías", "Isidora", "Benjamín",
+    "Florencia", "Tomás", "Catalina", "Vicente", "Agustina", "Joaquín", "Ignacia",
+)
+_APELLIDOS = (
+    "González", "Muñoz", "Rojas", "Díaz", "Pérez", "Soto", "Contreras", "Silva",
+    "Martínez", "Sepúlveda", "Morales", "Rodríguez", "López", "Fuentes", "Hernández",
+    "Torres", "Araya", "Flores", "Espinoza", "Valenzuela", "Castillo", "Tapia",
+    "Reyes", "Gutiérrez", "Castro", "Pizarro", "Álvarez", "Vásquez", "Sánchez",
+)
+
+_CONSULTAS = ("mar", "jose perez", "valentina soto gonzalez", "gonzales", "sepulbeda rojas")
+
+
+def generar_nombres(cantidad: int, semilla: int = 42) -> list:
+    # Nombre + dos apellidos, con un sufijo numérico ocasional para que haya
+    # muchos nombres distintos (como en un padrón real)
+    azar = random.Random(semilla)
+    nombres = []
+    for i in range(cantidad):
+        nombre = (
+            f"{azar.choice(_NOMBRES)} {azar.choice(_APELLIDOS)} {azar.choice(_APELLIDOS)}"
+        )
+        if azar.random() < 0.5:
+            nombre += f" {azar.choice(_APELLIDOS)}{i % 997}"
+        nombres.append(nombre)
+    return nombres
+
+
+def main(argumentos: list) -> None:
+    cantidad = int(argumentos[0]) if argumentos else CANTIDAD_POR_DEFECTO
+    nombres = generar_nombres(cantidad)
+
+    indice = IndiceNombres()
+    inicio = time.perf_counter()
+    for documento, nombre in enumerate(nombres):
+        indice.agregar(str(documento), nombre)
+    indice.buscar("a")  # ordena las altas pendientes
+    print(f"indexar {cantidad:,} pasajeros ({len(indice):,} nombres distintos): "
+          f"{time.perf_counter() - inicio:.2f} s")
+    inicio = time.perf_counter()
+    indice.aproximados("x")  # arma los trigramas (primera búsqueda aproximada)
+    print(f"trigramas (primera búsqueda aproximada): {time.perf_counter() - inicio:.2f} s")
+
+    repeticiones = 200
+    for consulta in _CONSULTAS:
+        inicio = time.perf_counter()
+        for _ in range(repeticiones):
+            resultado = indice.buscar(consulta)
+        milisegundos = (time.perf_counter() - inicio) / repeticiones * 1000
+        primero = resultado[0][1] if resultado else "-"
+        print(f"{consulta!r:<28} {milisegundos:7.3f} ms  primero: {primero}")
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -0,0 +1,242 @@
+# Archivo: benchmarks/suite.py
+# Conjunto de mediciones sobre datos sintéticos (benchmarks/datos.py) para
+# seguir el rendimiento en el tiempo: carga del CSV, sincronización, altas,
+# cambios y bajas con persistencia, búsqueda por habitación, normalización
+# de documentos y validación de fechas, y un check-in grupal de 1000
+# huéspedes llamada por llamada contra una sola transacción, y la exportación
+# en cada formato (con MB/s). El resultado se emite como JSON.
+# Uso: python -m benchmarks.suite [tamaños ...] [--semilla N] [--salida archivo.json]
+#      (por defecto 1000 y 100000 filas; agregar 1000000 para la medición grande)
+
+import argparse
+import json
+import platform
+import random
+import sys
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+
+from benchmarks.datos import SEMILLA_POR_DEFECTO, escribir_csv, generar_pasajeros
+from modulos.documentos import normalizar_documentos
+from modulos.exportacion import COMPRESORES, exportar
+from modulos.operaciones import (
+    actualizar_pasajero,
+    buscar_pasajero_por_habitacion,
+    cerrar_persistencia,
+    confirmar_cambios,
+    crear_estructura,
+    eliminar_pasajero,
+    registrar_pasajero,
+    sincronizar_desde_csv,
+    transaccion,
+)
+from modulos.persistencia import UMBRAL_COMPACTACION
+from modulos.validaciones import es_fecha_dd_mm_yyyy
+
+TAMANOS_POR_DEFECTO = (1_000, 100_000)
+
+# Operaciones por caso como máximo (las escrituras y búsquedas no necesitan
+# recorrer toda la tabla para dar una tasa estable)
+MAXIMO_OPERACIONES = 10_000
+
+# Huéspedes del check-in grupal; en modo "csv" llamada por llamada cada alta
+# reescribe el archivo, así que se miden solo MUESTRA_CSV y se da la tasa
+TAMANO_GRUPO = 1_000
+MUESTRA_CSV = 20
+
+# Versión del formato del JSON de resultados
+VERSION_FORMATO = 1
+
+
+def _medir(resultados: list, caso: str, filas: int, operaciones: int, funcion) -> None:
+    inicio = time.perf_counter()
+    funcion()
+    segundos = time.perf_counter() - inicio
+    resultados.append({
+        "caso": caso,
+        "filas": filas,
+        "operaciones": operaciones,
+        "segundos": round(segundos, 6),
+        "por_segundo": round(operaciones / segundos, 1) if segundos else None,
+    })
+    print(f"{caso:<32} {filas:>10,} filas {segundos:9.3f} s", file=sys.stderr)
+
+
+def _documento_crudo(documento: str, azar: random.Random) -> str:
+    # Documento como lo escribiría una persona: RUT con puntos, pasaporte en
+    # minúsculas, espacios alrededor
+    if documento[0].isdigit():
+        cuerpo, dv = documento.split("-")
+        return f" {int(cuerpo):,}".replace(",", ".") + f"-{dv.lower()} "
+    return documento.lower() if azar.random() < 0.5 else f" {documento}"
+
+
+def _medir_grupo(resultados: list, sistema: dict, filas: int, modo: str) -> None:
+    # Check-in grupal: cada alta persistida por separado contra todas juntas
+    # dentro de transaccion(), con el modo de persistencia dado
+    config = sistema["persistencia"]
+    config["modo"], anterior = modo, config["modo"]
+    por_llamada = MUESTRA_CSV if modo == "csv" else TAMANO_GRUPO
+    grupos = {
+        forma: [
+            {"documento": f"GRUPO-{modo}-{forma}-{numero}",
+             "nombre": f"Turista {numero}", "nacionalidad": "Chilena",
+             "habitacion": 2_000_000 + numero, "estado": "Alojado"}
+            for numero in range(cantidad)
+        ]
+        for forma, cantidad in (("llamadas", por_llamada), ("transaccion", TAMANO_GRUPO))
+    }
+
+    def registrar_por_llamada():
+        for pasajero in grupos["llamadas"]:
+            registrar_pasajero(sistema, pasajero)
+
+    def registrar_en_transaccion():
+        with transaccion(sistema):
+            for pasajero in grupos["transaccion"]:
+                registrar_pasajero(sistema, pasajero)
+
+    _medir(resultados, f"grupo_por_llamada_{modo}", filas, por_llamada,
+           registrar_por_llamada)
+    with transaccion(sistema):
+        for pasajero in grupos["llamadas"]:
+            eliminar_pasajero(sistema, pasajero["documento"])
+    _medir(resultados, f"grupo_transaccion_{modo}", filas, TAMANO_GRUPO,
+           registrar_en_transaccion)
+    with transaccion(sistema):
+        for pasajero in grupos["transaccion"]:
+            eliminar_pasajero(sistema, pasajero["documento"])
+    config["modo"] = anterior
+
+
+def _medir_exportacion(resultados: list, sistema: dict, filas: int, directorio: Path) -> None:
+    # Exportación completa en cada formato y compresión disponible
+    for extension in ("csv", "jsonl", "csv.gz", "jsonl.gz", "csv.bz2", "csv.xz", "csv.zst"):
+        if extension.endswith(".zst") and "zstd" not in COMPRESORES:
+            continue
+        ruta = directorio / f"exportacion_{filas}.{extension}"
+        resumen = exportar(sistema, ruta)
+        ruta.unlink()
+        resultados.append({
+            "caso": f"exportar_{extension.replace('.', '_')}",
+            "filas": filas,
+            "operaciones": resumen["filas"],
+            "segundos": round(resumen["segundos"], 6),
+            "por_segundo": round(resumen["filas"] / resumen["segundos"], 1),
+            "bytes": resumen["bytes"],
+            "mb_por_segundo": round(resumen["mb_por_segundo"], 2),
+        })
+        print(
+            f"{'exportar_' + extension:<32} {filas:>10,} filas "
+            f"{resumen['segundos']:9.3f} s {resumen['mb_por_segundo']:8.1f} MB/s",
+            file=sys.stderr,
+        )
+
+
+def medir_tamano(filas: int, semilla: int, directorio: Path) -> list:
+    # Todas las mediciones para una cantidad de filas
+    resultados = []
+    azar = random.Random(semilla)
+    ruta = directorio / f"hotel_{filas}.csv"
+    pasajeros = list(generar_pasajeros(filas, semilla))
+    escribir_csv(ruta, pasajeros)
+    operaciones = min(filas, MAXIMO_OPERACIONES)
+
+    sistema = {}
+    _medir(resultados, "cargar_csv", filas, filas,
+           lambda: sistema.update(crear_estructura(ruta=ruta)))
+    # Que la bitácora de las escrituras no dispare compactaciones a mitad
+    sistema["persistencia"]["umbral_compactacion"] = max(
+        UMBRAL_COMPACTACION, operaciones * 200
+    )
+
+    _medir(resultados, "sincronizar_sin_cambios", filas, 100,
+           lambda: [sincronizar_desde_csv(sistema, ruta) for _ in range(100)])
+
+    # Otra terminal anexa filas al final del CSV: solo se lee la cola
+    nuevos = list(generar_pasajeros(filas + operaciones, semilla))[filas:]
+    with ruta.open("a", newline="", encoding="utf-8") as archivo:
+        archivo.writelines(
+            ",".join(str(p[campo] or "") for campo in p) + "\r\n" for p in nuevos
+        )
+    _medir(resultados, "sincronizar_anexado", filas, len(nuevos),
+           lambda: sincronizar_desde_csv(sistema, ruta))
+
+    # Altas, cambios y bajas con persistencia (bitácora + confirmación final)
+    altas = [
+        {"documento": f"BENCH{numero}", "nombre": f"Pasajero {numero}",
+         "nacionalidad": "Chilena", "habitacion": 1_000_000 + numero,
+         "estado": "Alojado"}
+        for numero in range(operaciones)
+    ]
+
+    def registrar():
+        for pasajero in altas:
+            registrar_pasajero(sistema, pasajero)
+        confirmar_cambios(sistema)
+
+    def actualizar():
+        for pasajero in altas:
+            actualizar_pasajero(sistema, pasajero["documento"], {"estado": "Check-out"})
+        confirmar_cambios(sistema)
+
+    def eliminar():
+        for pasajero in altas:
+            eliminar_pasajero(sistema, pasajero["documento"])
+        confirmar_cambios(sistema)
+
+    _medir(resultados, "registrar_persistido", filas, operaciones, registrar)
+    _medir(resultados, "actualizar_persistido", filas, operaciones, actualizar)
+    _medir(resultados, "eliminar_persistido", filas, operaciones, eliminar)
+
+    for modo in ("journal", "csv"):
+        _medir_grupo(resultados, sistema, filas, modo)
+
+    cuartos = [azar.choice(pasajeros)["habitacion"] for _ in range(operaciones)]
+    _medir(resultados, "buscar_por_habitacion", filas, operaciones,
+           lambda: [buscar_pasajero_por_habitacion(sistema, c) for c in cuartos])
+    _medir_exportacion(resultados, sistema, filas, directorio)
+    cerrar_persistencia(sistema)
+
+    documentos = [_documento_crudo(p["documento"], azar) for p in pasajeros]
+    _medir(resultados, "normalizar_documentos", filas, filas,
+           lambda: normalizar_documentos(documentos, procesos=1))
+
+    fechas = [p["fecha_ingreso"] for p in pasajeros]
+    fechas[::50] = ["31-02-2025"] * len(fechas[::50])  # algunas inválidas
+    _medir(resultados, "validar_fechas", filas, filas,
+           lambda: [es_fecha_dd_mm_yyyy(fecha) for fecha in fechas])
+    return resultados
+
+
+def main(argumentos: list) -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("tamanos", nargs="*", type=int, default=list(TAMANOS_POR_DEFECTO))
+    parser.add_argument("--semilla", type=int, default=SEMILLA_POR_DEFECTO)
+    parser.add_argument("--salida", type=Path, help="archivo JSON (por defecto, stdout)")
+    opciones = parser.parse_args(argumentos)
+
+    resultados = []
+    with tempfile.TemporaryDirectory() as directorio:
+        for filas in opciones.tamanos:
+            resultados += medir_tamano(filas, opciones.semilla, Path(directorio))
+
+    informe = {
+        "version": VERSION_FORMATO,
+        "fecha": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "plataforma": platform.platform(),
+        "semilla": opciones.semilla,
+        "resultados": resultados,
+    }
+    texto = json.dumps(informe, ensure_ascii=False, indent=2)
+    if opciones.salida is None:
+        print(texto)
+    else:
+        opciones.salida.write_text(texto + "\n", encoding="utf-8")
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
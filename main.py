@@ -2,23 +2,45 @@
 # Sistema de Registro de Pasajeros en un Hotel
 # Este archivo orquesta el menú principal y conecta con los módulos del sistema
 
+import argparse
+import asyncio
+import sys
+
+from modulos.comandos import ejecutar_lote
 from modulos.entradas import (
     pedir_texto,
     pedir_habitacion,
     pedir_fecha,
+    pedir_fecha_opcional,
     pedir_estado,
     pedir_documento,
 )
+from modulos.exportacion import exportar
 from modulos.operaciones import (
     crear_estructura,
     registrar_pasajero,
-    listar_pasajeros,
+    pagina_pasajeros,
     sincronizar_desde_csv,
     buscar_por_documento,
     actualizar_pasajero,
     eliminar_pasajero,
     buscar_pasajero_por_habitacion,
+    buscar_por_nombre,
+    reporte_ocupacion,
+    iniciar_escritor,
+    cerrar_persistencia,
+    tomar_conflictos,
+    tomar_error_escritura,
 )
+from modulos.metricas import sesion_perfilada
+from modulos.reportes import mostrar_historial, mostrar_metricas, mostrar_reporte
+from modulos.servicio import HOST_POR_DEFECTO, PUERTO_POR_DEFECTO, servir
+
+# Pasajeros por página en el listado del menú
+TAMANO_PAGINA = 20
+
+# Opción de salida: la misma de siempre; las opciones nuevas van después
+OPCION_SALIR = "7"
 
 
 def mostrar_menu() -> None:
@@ -29,8 +51,19 @@ def mostrar_menu() -> None:
     print("3. Buscar pasajero por documento")
     print("4. Actualizar datos de pasajero")
     print("5. Eliminar pasajero")
-    print("6. Buscar pasajero por habitación (recursivo)")
-    print("7. Salir")
+    print("6. Buscar pasajero por habitación")
+    print(f"{OPCION_SALIR}. Salir")
+    print("8. Buscar pasajero por nombre")
+    print("9. Ver historial de acciones")
+    print("10. Ver métricas de rendimiento")
+    print("11. Ver reporte de ocupación")
+
+
+def _lectura(sistema: dict):
+    # Cerrojo entre hilos para consultar sin que el escritor en segundo plano
+    # recargue los pasajeros (al fusionar cambios de otra terminal) a mitad
+    # de la consulta
+    return sistema["persistencia"]["bloqueo"].hilos
 
 
 def accion_registrar(sistema: dict) -> None:
@@ -51,25 +84,34 @@ def accion_registrar(sistema: dict) -> None:
     if registrar_pasajero(sistema, pasajero):
         print("Pasajero registrado correctamente.")
     else:
-        print("Error: documento duplicado o habitación ocupada.")
+        print("Error: documento duplicado, habitación ocupada o salida anterior al ingreso.")
 
 
 def accion_listar(sistema: dict) -> None:
     # Muestra todos los pasajeros registrados
     if sincronizar_desde_csv(sistema):
         print("Datos sincronizados desde datos_prueba.csv.")
-    pasajeros = listar_pasajeros(sistema)
+    # Se pide una página a la vez: la memoria no crece con la cantidad de pasajeros
+    with _lectura(sistema):
+        pagina, cursor = pagina_pasajeros(sistema, TAMANO_PAGINA)
 
-    if not pasajeros:
+    if not pagina:
         print("No hay pasajeros registrados.")
         return
 
     print("\n--- Lista de Pasajeros ---")
-    for p in pasajeros:
-        print(
-            f"{p['documento']} | {p['nombre']} | "
-            f"{p['nacionalidad']} | Hab {p['habitacion']} | {p['estado']}"
-        )
+    while True:
+        for p in pagina:
+            print(
+                f"{p['documento']} | {p['nombre']} | "
+                f"{p['nacionalidad']} | Hab {p['habitacion']} | {p['estado']}"
+            )
+        if cursor is None:
+            return
+        if input("Enter = siguiente página, s = salir: ").strip().lower() == "s":
+            return
+        with _lectura(sistema):
+            pagina, cursor = pagina_pasajeros(sistema, TAMANO_PAGINA, cursor)
 
 
 def accion_buscar_documento(sistema: dict) -> None:
@@ -77,7 +119,8 @@ def accion_buscar_documento(sistema: dict) -> None:
     if sincronizar_desde_csv(sistema):
         print("Datos sincronizados desde datos_prueba.csv.")
     documento = pedir_documento("Documento a buscar: ")
-    pasajero = buscar_por_documento(sistema, documento)
+    with _lectura(sistema):
+        pasajero = buscar_por_documento(sistema, documento)
 
     if pasajero is None:
         print("Pasajero no encontrado.")
@@ -106,7 +149,7 @@ def accion_actualizar(sistema: dict) -> None:
     if actualizar_pasajero(sistema, documento, cambios):
         print("Pasajero actualizado correctamente.")
     else:
-        print("Error: pasajero no existe o habitación ocupada.")
+        print("Error: pasajero no existe, habitación ocupada o salida anterior al ingreso.")
 
 
 def accion_eliminar(sistema: dict) -> None:
@@ -122,11 +165,12 @@ def accion_eliminar(sistema: dict) -> None:
 
 
 def accion_buscar_habitacion(sistema: dict) -> None:
-    # Busca un pasajero usando función recursiva
+    # Busca el pasajero asignado a una habitación
     if sincronizar_desde_csv(sistema):
         print("Datos sincronizados desde datos_prueba.csv.")
     habitacion = pedir_habitacion("Número de habitación a buscar: ")
-    pasajero = buscar_pasajero_por_habitacion(sistema, habitacion)
+    with _lectura(sistema):
+        pasajero = buscar_pasajero_por_habitacion(sistema, habitacion)
 
     if pasajero is None:
         print("No hay pasajero asignado a esa habitación.")
@@ -137,12 +181,164 @@ def accion_buscar_habitacion(sistema: dict) -> None:
         )
 
 
-def main() -> None:
+def accion_buscar_nombre(sistema: dict) -> None:
+    # Busca pasajeros por nombre (sin tildes ni mayúsculas, tolera errores)
+    if sincronizar_desde_csv(sistema):
+        print("Datos sincronizados desde datos_prueba.csv.")
+    consulta = pedir_texto("Nombre o parte del nombre: ")
+    with _lectura(sistema):
+        pasajeros = buscar_por_nombre(sistema, consulta)
+
+    if not pasajeros:
+        print("No se encontraron pasajeros con ese nombre.")
+        return
+
+    for pasajero in pasajeros:
+        print(
+            f"{pasajero['documento']} | {pasajero['nombre']} | "
+            f"Hab {pasajero['habitacion']} | {pasajero.get('estado', '')}"
+        )
+
+
+def accion_historial(sistema: dict) -> None:
+    # Muestra el historial por páginas, de lo más reciente a lo más antiguo
+    pagina = 1
+    while mostrar_historial(sistema, pagina, TAMANO_PAGINA):
+        if input("Enter para ver más, cualquier otra tecla para volver: ").strip():
+            return
+        pagina += 1
+
+
+def _ejecutar_lote(sistema: dict, ruta: str) -> None:
+    # Modo por lotes: un resultado JSON por comando en la salida estándar y el
+    # resumen (con operaciones por segundo) en la salida de errores
+    try:
+        if ruta == "-":
+            resumen = ejecutar_lote(sistema, sys.stdin, sys.stdout)
+        else:
+            with open(ruta, encoding="utf-8") as archivo:
+                resumen = ejecutar_lote(sistema, archivo, sys.stdout)
+    finally:
+        cerrar_persistencia(sistema)
+    print(
+        f"{resumen['comandos']} comandos ({resumen['correctos']} correctos, "
+        f"{resumen['errores']} con error, {resumen['conflictos']} por conflicto) "
+        f"en {resumen['segundos']:.3f} s: "
+        f"{resumen['por_segundo']:,.0f} ops/s",
+        file=sys.stderr,
+    )
+
+
+def accion_reporte(sistema: dict) -> None:
+    # Muestra el reporte de ocupación de una fecha (por defecto, hoy)
+    if sincronizar_desde_csv(sistema):
+        print("Datos sincronizados desde datos_prueba.csv.")
+    fecha = pedir_fecha_opcional("Fecha del reporte (DD-MM-YYYY, Enter = hoy): ")
+    with _lectura(sistema):
+        reporte = reporte_ocupacion(sistema, fecha)
+    mostrar_reporte(reporte)
+
+
+def _exportar(sistema: dict, opciones: argparse.Namespace) -> None:
+    # Exportación sin menú; el resumen va a la salida de errores
+    try:
+        resumen = exportar(
+            sistema, opciones.exportar,
+            fecha_desde=opciones.desde, fecha_hasta=opciones.hasta,
+        )
+    finally:
+        cerrar_persistencia(sistema)
+    print(
+        f"{resumen['filas']} pasajeros exportados a {opciones.exportar} "
+        f"({resumen['bytes']:,} bytes) en {resumen['segundos']:.3f} s: "
+        f"{resumen['mb_por_segundo']:.1f} MB/s",
+        file=sys.stderr,
+    )
+
+
+def main(argumentos: list | None = None) -> None:
     # Punto de entrada principal del sistema
-    sistema = crear_estructura()
+    parser = argparse.ArgumentParser(description="Registro de pasajeros")
+    parser.add_argument(
+        "--sqlite",
+        action="store_true",
+        help="guardar los pasajeros en SQLite (datos_prueba.sqlite3) en vez del CSV",
+    )
+    parser.add_argument(
+        "--servir",
+        action="store_true",
+        help="atender peticiones HTTP/JSON en vez de mostrar el menú",
+    )
+    parser.add_argument(
+        "--batch",
+        metavar="ARCHIVO",
+        help="ejecutar los comandos JSON (uno por línea) del archivo, o de la "
+             "entrada estándar con -, en vez de mostrar el menú",
+    )
+    parser.add_argument(
+        "--exportar",
+        metavar="ARCHIVO",
+        help="exportar los pasajeros y salir; el formato sale de la extensión "
+             "(.csv, .jsonl, más .gz, .bz2, .xz o .zst)",
+    )
+    parser.add_argument("--desde", metavar="DD-MM-YYYY", help="exportar solo estadías desde esta fecha")
+    parser.add_argument("--hasta", metavar="DD-MM-YYYY", help="exportar solo estadías hasta esta fecha")
+    parser.add_argument("--host", default=HOST_POR_DEFECTO)
+    parser.add_argument("--puerto", type=int, default=PUERTO_POR_DEFECTO)
+    opciones = parser.parse_args(argumentos)
+
+    # Con HOTEL_PERFIL=cprofile|tracemalloc|ambos la sesión entera se perfila
+    with sesion_perfilada():
+        _ejecutar(opciones)
+
+
+def _ejecutar(opciones: argparse.Namespace) -> None:
+    # Carga el sistema y atiende el menú (o el servicio HTTP)
+    sistema = crear_estructura(almacen="sqlite" if opciones.sqlite else "memoria")
+    if opciones.exportar:
+        _exportar(sistema, opciones)
+        return
+    if opciones.servir:
+        try:
+            asyncio.run(servir(sistema, opciones.host, opciones.puerto))
+        except KeyboardInterrupt:
+            print("Servicio detenido.")
+        return
+
+    iniciar_escritor(sistema)
+    if opciones.batch:
+        _ejecutar_lote(sistema, opciones.batch)
+        return
+    # Ctrl+C o fin de la entrada también dejan en disco lo ya confirmado
+    try:
+        _menu(sistema)
+    except (KeyboardInterrupt, EOFError):
+        print("\nSaliendo del sistema...")
+    finally:
+        cerrar_persistencia(sistema)
+    _avisar_error_escritura(sistema)
+
+
+def _avisar_error_escritura(sistema: dict) -> None:
+    # Informa si el escritor en segundo plano no pudo guardar los cambios o
+    # si otra terminal invalidó alguno antes de guardarlo
+    error = tomar_error_escritura(sistema)
+    if error is not None:
+        print(f"Atención: no se pudieron guardar los cambios ({error}). Se reintentará.")
+    # Cambios ya informados como hechos que otra terminal invalidó al guardar
+    for accion, documento in tomar_conflictos(sistema):
+        print(
+            f"Atención: otra terminal invalidó '{accion}' del documento {documento}; "
+            "el cambio no se guardó."
+        )
+
+
+def _menu(sistema: dict) -> None:
+    # Atiende el menú interactivo hasta que se elija salir
     opcion = ""
 
-    while opcion != "7":
+    while opcion != OPCION_SALIR:
+        _avisar_error_escritura(sistema)
         mostrar_menu()
         opcion = input("Seleccione una opción: ").strip()
 
@@ -158,12 +354,19 @@ def main() -> None:
             accion_eliminar(sistema)
         elif opcion == "6":
             accion_buscar_habitacion(sistema)
-        elif opcion == "7":
+        elif opcion == OPCION_SALIR:
             print("Saliendo del sistema...")
+        elif opcion == "8":
+            accion_buscar_nombre(sistema)
+        elif opcion == "9":
+            accion_historial(sistema)
+        elif opcion == "10":
+            mostrar_metricas()
+        elif opcion == "11":
+            accion_reporte(sistema)
         else:
             print("Opción no válida. Intente nuevamente.")
 
-
 # Ejecución directa del programa
 if __name__ == "__main__":
     main()
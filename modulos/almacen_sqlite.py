@@ -0,0 +1,484 @@
+# Archivo: modulos/almacen_sqlite.py
+# Almacenamiento de pasajeros en SQLite (módulo sqlite3 de la biblioteca
+# estándar). Las consultas usan índices, así que no hace falta cargar toda la
+# tabla en memoria, y varios procesos pueden compartir la base en modo WAL.
+
+from __future__ import annotations
+
+import csv
+import sqlite3
+from collections.abc import Iterator
+from itertools import islice
+from pathlib import Path
+
+from modulos.nombres import normalizar_nombre
+
+# Filas por transacción al importar un CSV
+TAMANO_LOTE_SQL = 5_000
+
+_COLUMNAS = (
+    "documento",
+    "nombre",
+    "nacionalidad",
+    "habitacion",
+    "ingreso",
+    "salida",
+    "estado",
+)
+
+_ESQUEMA = """
+CREATE TABLE IF NOT EXISTS pasajeros (
+    documento    TEXT PRIMARY KEY,
+    nombre       TEXT,
+    nacionalidad TEXT,
+    habitacion   INTEGER,
+    ingreso,               -- sin tipo: ordinal del día o texto si la fecha no es válida
+    salida,
+    estado       TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_pasajeros_habitacion ON pasajeros (habitacion, ingreso);
+CREATE INDEX IF NOT EXISTS idx_pasajeros_estado ON pasajeros (estado);
+CREATE INDEX IF NOT EXISTS idx_pasajeros_nacionalidad ON pasajeros (nacionalidad);
+CREATE INDEX IF NOT EXISTS idx_pasajeros_ingreso ON pasajeros (ingreso);
+CREATE INDEX IF NOT EXISTS idx_pasajeros_salida ON pasajeros (salida);
+"""
+
+# Estadías que chocan con [?ingreso, ?salida) en una habitación. Una estadía
+# sin fechas (ordinales no enteros) ocupa la habitación completa; una estadía
+# de día (salida == ingreso) ocupa una noche.
+_SQL_CHOQUE = """
+SELECT documento FROM pasajeros
+WHERE habitacion = :habitacion
+  AND (:excluir IS NULL OR documento != :excluir)
+  AND (
+        :ingreso IS NULL
+        OR typeof(ingreso) != 'integer'
+        OR typeof(salida) != 'integer'
+        OR (ingreso < max(:salida, :ingreso + 1) AND max(salida, ingreso + 1) > :ingreso)
+  )
+LIMIT 1
+"""
+
+
+# Campo de orden del listado -> expresión SQL
+_COLUMNA_ORDEN = {
+    "documento": "documento",
+    "nombre": "plegar(nombre)",
+    "nacionalidad": "nacionalidad",
+    "habitacion": "habitacion",
+    "fecha_ingreso": "ingreso",
+    "fecha_salida": "salida",
+    "estado": "estado",
+}
+
+
+def _base_ocupada(error: sqlite3.OperationalError) -> bool:
+    # SQLITE_BUSY / SQLITE_LOCKED: otra conexión tiene la escritura tomada
+    codigo = getattr(error, "sqlite_errorcode", None)
+    return codigo in (5, 6) or "locked" in str(error)
+
+
+def _condicion_cursor(columna: str, valor, descendente: bool) -> str:
+    # Filas posteriores al cursor en el orden (columna, documento). NULL va
+    # primero en orden ascendente y las comparaciones con NULL se escriben aparte.
+    if valor is None:
+        if descendente:
+            return f"({columna} IS NULL AND documento < ?)"
+        return f"({columna} IS NOT NULL OR documento > ?)"
+    if descendente:
+        return f"({columna} IS NULL OR {columna} < ? OR ({columna} = ? AND documento < ?))"
+    return f"({columna} > ? OR ({columna} = ? AND documento > ?))"
+
+
+class AlmacenSQLite:
+    # Implementa las operaciones de pasajeros sobre una base SQLite. Cada
+    # escritura abre (si no lo está) una transacción con BEGIN IMMEDIATE, que
+    # toma la escritura de la base antes de validar, y queda abierta hasta
+    # `confirmar()`. Quien escribe debe confirmar antes de soltar el cerrojo
+    # entre terminales (ver _persistir): otra terminal no puede esperar una
+    # transacción que solo se cierra después de tomar ese cerrojo.
+
+    def __init__(self, ruta: Path, fabrica_pasajero) -> None:
+        self.ruta = ruta
+        self._fabrica = fabrica_pasajero
+        # Sin transacciones implícitas: las abre _empezar
+        self.conexion = sqlite3.connect(ruta, check_same_thread=False, isolation_level=None)
+        self.conexion.execute("PRAGMA journal_mode=WAL")
+        self.conexion.execute("PRAGMA synchronous=NORMAL")
+        self.conexion.executescript(_ESQUEMA)
+        # Orden de nombres sin distinguir mayúsculas, igual que en memoria
+        self.conexion.create_function(
+            "plegar", 1, lambda t: t.casefold() if isinstance(t, str) else t,
+            deterministic=True,
+        )
+        self.conexion.create_function(
+            "normalizar_nombre", 1,
+            lambda t: normalizar_nombre(t) if isinstance(t, str) else t,
+            deterministic=True,
+        )
+
+    # -------- CONVERSIÓN --------
+
+    def _pasajero(self, fila: tuple | None):
+        # Fila de la tabla -> Pasajero (las fechas ya vienen como ordinales)
+        if fila is None:
+            return None
+        pasajero = self._fabrica()
+        for columna, valor in zip(_COLUMNAS, fila):
+            setattr(pasajero, columna, valor)
+        return pasajero
+
+    @staticmethod
+    def _parametros(pasajero) -> dict:
+        return {columna: getattr(pasajero, columna) for columna in _COLUMNAS}
+
+    @staticmethod
+    def _noches(pasajero) -> tuple:
+        if type(pasajero.ingreso) is int and type(pasajero.salida) is int:
+            return pasajero.ingreso, pasajero.salida
+        return None, None
+
+    def _consultar(self, sql: str, parametros=()) -> list:
+        cursor = self.conexion.execute(
+            f"SELECT {', '.join(_COLUMNAS)} FROM pasajeros {sql}", parametros
+        )
+        return [self._pasajero(fila) for fila in cursor]
+
+    # -------- ESCRITURA --------
+
+    def choque(self, habitacion, ingreso, salida, excluir: str | None = None) -> bool:
+        # True si la habitación ya está tomada en [ingreso, salida)
+        fila = self.conexion.execute(
+            _SQL_CHOQUE,
+            {
+                "habitacion": habitacion,
+                "ingreso": ingreso,
+                "salida": salida,
+                "excluir": excluir,
+            },
+        ).fetchone()
+        return fila is not None
+
+    def _empezar(self) -> bool:
+        # Abre la transacción de escritura. False si otra conexión (p. ej. un
+        # proceso que no usa el cerrojo entre terminales) no la libera a tiempo.
+        if self.conexion.in_transaction:
+            return True
+        try:
+            self.conexion.execute("BEGIN IMMEDIATE")
+        except sqlite3.OperationalError as error:
+            if _base_ocupada(error):
+                return False
+            raise
+        return True
+
+    def _descartar(self, nueva: bool) -> bool:
+        # Una escritura rechazada no deja tomada la base: si abrió la
+        # transacción, la cierra (sin cambios que perder)
+        if nueva:
+            self.conexion.rollback()
+        return False
+
+    def _insertar(self, pasajero) -> bool:
+        # Inserta con las reglas de la carga en memoria: documento nuevo,
+        # salida no anterior al ingreso y habitación libre en esas fechas
+        ingreso, salida = self._noches(pasajero)
+        if ingreso is not None and salida < ingreso:
+            return False
+        if self.buscar(pasajero.documento) is not None:
+            return False
+        if self.choque(pasajero.habitacion, ingreso, salida):
+            return False
+        self.conexion.execute(
+            f"INSERT INTO pasajeros ({', '.join(_COLUMNAS)}) "
+            f"VALUES ({', '.join(':' + c for c in _COLUMNAS)})",
+            self._parametros(pasajero),
+        )
+        return True
+
+    def registrar(self, pasajero) -> bool:
+        nueva = not self.conexion.in_transaction
+        if not self._empezar():
+            return False
+        return self._insertar(pasajero) or self._descartar(nueva)
+
+    def actualizar(self, documento: str, cambios: dict) -> bool:
+        nueva = not self.conexion.in_transaction
+        if not self._empezar():
+            return False
+        pasajero = self.buscar(documento)
+        if pasajero is None:
+            return self._descartar(nueva)
+        pasajero.update(cambios)
+        if self.choque(pasajero.habitacion, *self._noches(pasajero), excluir=documento):
+            return self._descartar(nueva)
+        asignaciones = ", ".join(f"{c} = :{c}" for c in _COLUMNAS if c != "documento")
+        self.conexion.execute(
+            f"UPDATE pasajeros SET {asignaciones} WHERE documento = :documento",
+            self._parametros(pasajero),
+        )
+        return True
+
+    def eliminar(self, documento: str) -> bool:
+        nueva = not self.conexion.in_transaction
+        if not self._empezar():
+            return False
+        cursor = self.conexion.execute(
+            "DELETE FROM pasajeros WHERE documento = ?", (documento,)
+        )
+        return cursor.rowcount > 0 or self._descartar(nueva)
+
+    def confirmar(self) -> None:
+        # Confirma la transacción abierta (un solo commit por lote de cambios)
+        if self.conexion.in_transaction:
+            self.conexion.commit()
+
+    def deshacer(self) -> None:
+        # Descarta lo escrito desde el último commit
+        if self.conexion.in_transaction:
+            self.conexion.rollback()
+
+    def cerrar(self) -> None:
+        self.confirmar()
+        self.conexion.close()
+
+    # -------- CONSULTAS --------
+
+    def buscar(self, documento: str):
+        fila = self.conexion.execute(
+            f"SELECT {', '.join(_COLUMNAS)} FROM pasajeros WHERE documento = ?",
+            (documento,),
+        ).fetchone()
+        return self._pasajero(fila)
+
+    def buscar_por_habitacion(self, habitacion: int):
+        # Prioriza al pasajero alojado y luego la estadía que empieza antes
+        encontrados = self._consultar(
+            "WHERE habitacion = ? "
+            "ORDER BY estado != 'Alojado', typeof(ingreso) != 'integer', ingreso, documento "
+            "LIMIT 1",
+            (habitacion,),
+        )
+        return encontrados[0] if encontrados else None
+
+    def buscar_por_nombre(self, consulta: str, limite: int) -> list:
+        # Nombres que contienen la consulta normalizada, ordenados como en
+        # memoria (exacto, prefijo, palabra). Sin búsqueda aproximada: SQLite
+        # no tiene el índice de trigramas y la consulta recorre la tabla.
+        buscada = normalizar_nombre(consulta)
+        if not buscada:
+            return []
+        encontrados = self._consultar(
+            "WHERE instr(normalizar_nombre(nombre), ?) > 0", (buscada,)
+        )
+
+        def relevancia(pasajero) -> tuple:
+            nombre = normalizar_nombre(pasajero.nombre)
+            if nombre == buscada:
+                puntaje = 3.0
+            elif nombre.startswith(buscada):
+                puntaje = 2.0
+            elif f" {buscada}" in f" {nombre}":
+                puntaje = 1.5
+            else:
+                puntaje = 1.0
+            return (-puntaje, nombre, pasajero.documento)
+
+        return sorted(encontrados, key=relevancia)[:limite]
+
+    def buscar_por_campo(self, campo: str, valor) -> list:
+        columnas = {
+            "estado": "estado",
+            "nacionalidad": "nacionalidad",
+            "fecha_ingreso": "ingreso",
+            "fecha_salida": "salida",
+        }
+        if campo not in columnas:
+            raise ValueError(f"Campo sin índice: {campo}")
+        return self._consultar(
+            f"WHERE {columnas[campo]} = ? ORDER BY documento", (valor,)
+        )
+
+    def alojados(self, dia: int) -> list:
+        return self._consultar(
+            "WHERE ingreso <= ? AND salida > ? AND typeof(ingreso) = 'integer' "
+            "AND typeof(salida) = 'integer'",
+            (dia, dia),
+        )
+
+    def llegadas(self, dia: int) -> list:
+        return self._consultar("WHERE ingreso = ?", (dia,))
+
+    def salidas(self, dia: int) -> list:
+        return self._consultar("WHERE salida = ?", (dia,))
+
+    def habitaciones_libres(self, ingreso: int, salida: int, candidatas=None) -> list:
+        if candidatas is None:
+            candidatas = [
+                fila[0]
+                for fila in self.conexion.execute(
+                    "SELECT DISTINCT habitacion FROM pasajeros"
+                )
+            ]
+        return sorted(h for h in candidatas if not self.choque(h, ingreso, salida))
+
+    def contar_por_nacionalidad(self, dia: int | None, estado: str | None) -> dict:
+        condiciones, parametros = [], []
+        if estado is not None:
+            condiciones.append("estado = ?")
+            parametros.append(estado)
+        if dia is not None:
+            condiciones.append(
+                "typeof(ingreso) = 'integer' AND typeof(salida) = 'integer' "
+                "AND ingreso <= ? AND salida > ?"
+            )
+            parametros += [dia, dia]
+        donde = f"WHERE {' AND '.join(condiciones)}" if condiciones else ""
+        cursor = self.conexion.execute(
+            f"SELECT nacionalidad, count(*) FROM pasajeros {donde} GROUP BY nacionalidad",
+            parametros,
+        )
+        return dict(cursor.fetchall())
+
+    def _conteo(self, sql: str, parametros=()) -> dict:
+        # {valor: cantidad} de un SELECT valor, count(*) ... GROUP BY valor
+        return dict(self.conexion.execute(sql, parametros).fetchall())
+
+    def totales(self, dia: int, estado_alojado: str) -> dict:
+        # Contadores de Agregados (ver reportes.py) calculados con GROUP BY,
+        # sin recorrer la tabla en Python. Llegadas y salidas solo del día.
+        alojados = "WHERE estado = ?"
+        return {
+            "pasajeros": self.contar(),
+            "por_estado": self._conteo(
+                "SELECT estado, count(*) FROM pasajeros GROUP BY estado"
+            ),
+            "por_nacionalidad": self._conteo(
+                "SELECT nacionalidad, count(*) FROM pasajeros GROUP BY nacionalidad"
+            ),
+            "alojados_por_nacionalidad": self._conteo(
+                f"SELECT nacionalidad, count(*) FROM pasajeros {alojados} "
+                "GROUP BY nacionalidad",
+                (estado_alojado,),
+            ),
+            "por_habitacion": self._conteo(
+                "SELECT habitacion, count(*) FROM pasajeros GROUP BY habitacion"
+            ),
+            "alojados_por_habitacion": self._conteo(
+                f"SELECT habitacion, count(*) FROM pasajeros {alojados} "
+                "GROUP BY habitacion",
+                (estado_alojado,),
+            ),
+            "llegadas": self._conteo(
+                "SELECT ingreso, count(*) FROM pasajeros WHERE ingreso = ? GROUP BY ingreso",
+                (dia,),
+            ),
+            "salidas": self._conteo(
+                "SELECT salida, count(*) FROM pasajeros WHERE salida = ? GROUP BY salida",
+                (dia,),
+            ),
+        }
+
+    def habitaciones_ocupadas(self, dia: int, sin_estado: str) -> int:
+        # Habitaciones con una estadía que incluye el día, sin contar `sin_estado`
+        return self.conexion.execute(
+            "SELECT count(DISTINCT habitacion) FROM pasajeros "
+            "WHERE ingreso <= ? AND salida > ? AND typeof(ingreso) = 'integer' "
+            "AND typeof(salida) = 'integer' AND estado IS NOT ?",
+            (dia, dia, sin_estado),
+        ).fetchone()[0]
+
+    def iterar(self, orden: str = "documento") -> Iterator:
+        # Recorre la tabla con un cursor, sin materializarla
+        cursor = self.conexion.execute(
+            f"SELECT {', '.join(_COLUMNAS)} FROM pasajeros ORDER BY {orden}"
+        )
+        for fila in cursor:
+            yield self._pasajero(fila)
+
+    def listar(
+        self,
+        criterios: dict,
+        orden: str | None = None,
+        descendente: bool = False,
+        despues: tuple | None = None,
+        limite: int | None = None
+    ) -> Iterator:
+        # Listado filtrado y ordenado por (campo, documento). `despues` es la
+        # clave ((grupo, valor), documento) de la última fila ya entregada.
+        condiciones, parametros = [], []
+        for campo, sql in (
+            ("estado", "estado = ?"),
+            ("nacionalidad", "nacionalidad = ?"),
+            ("habitacion_desde", "habitacion >= ?"),
+            ("habitacion_hasta", "habitacion <= ?"),
+        ):
+            if criterios.get(campo) is not None:
+                condiciones.append(sql)
+                parametros.append(criterios[campo])
+        desde, hasta = criterios.get("fecha_desde"), criterios.get("fecha_hasta")
+        if desde is not None or hasta is not None:
+            condiciones.append("typeof(ingreso) = 'integer' AND typeof(salida) = 'integer'")
+            if hasta is not None:
+                condiciones.append("ingreso <= ?")
+                parametros.append(hasta)
+            if desde is not None:
+                condiciones.append("max(salida, ingreso + 1) > ?")
+                parametros.append(desde)
+
+        orden_sql = ""
+        if orden is not None:
+            columna = _COLUMNA_ORDEN[orden]
+            sentido = "DESC" if descendente else "ASC"
+            orden_sql = f"ORDER BY {columna} {sentido}, documento {sentido}"
+            if despues is not None:
+                (_, valor), documento = despues
+                condiciones.append(_condicion_cursor(columna, valor, descendente))
+                parametros += [valor, valor, documento] if valor is not None else [documento]
+
+        donde = f"WHERE {' AND '.join(condiciones)}" if condiciones else ""
+        tope = f"LIMIT {int(limite)}" if limite is not None else ""
+        cursor = self.conexion.execute(
+            f"SELECT {', '.join(_COLUMNAS)} FROM pasajeros {donde} {orden_sql} {tope}",
+            parametros,
+        )
+        for fila in cursor:
+            yield self._pasajero(fila)
+
+    def contar(self) -> int:
+        return self.conexion.execute("SELECT count(*) FROM pasajeros").fetchone()[0]
+
+    # -------- CSV COMO FORMATO DE INTERCAMBIO --------
+
+    def importar(
+        self,
+        pasajeros,
+        tamano_lote: int = TAMANO_LOTE_SQL,
+        rechazados: list | None = None
+    ) -> int:
+        # Inserta pasajeros en lotes (un commit por lote) con las mismas
+        # reglas que la carga en memoria: se saltan documentos repetidos,
+        # fechas invertidas y habitaciones ya tomadas en esas fechas (por la
+        # base o por una fila anterior). Los documentos saltados se agregan a
+        # `rechazados`. Devuelve cuántos se agregaron.
+        agregados = 0
+        iterador = iter(pasajeros)
+        while True:
+            lote = list(islice(iterador, tamano_lote))
+            if not lote:
+                break
+            self.conexion.execute("BEGIN IMMEDIATE")
+            with self.conexion:
+                for pasajero in lote:
+                    if self._insertar(pasajero):
+                        agregados += 1
+                    elif rechazados is not None:
+                        rechazados.append(pasajero.documento)
+        return agregados
+
+    def exportar_csv(self, archivo, campos: tuple) -> None:
+        # Escribe la tabla como CSV en un archivo ya abierto, fila a fila
+        escritor = csv.DictWriter(archivo, fieldnames=campos)
+        escritor.writeheader()
+        for pasajero in self.iterar():
+            escritor.writerow({campo: pasajero.get(campo, "") for campo in campos})
@@ -0,0 +1,74 @@
+# Archivo: modulos/cache.py
+# Caché LRU acotada para funciones puras de un argumento (p. ej. normalizar
+# documentos). Segura entre hilos y con contadores de aciertos y desalojos.
+
+from __future__ import annotations
+
+import functools
+import threading
+from collections.abc import Callable
+
+
+class CacheLRU:
+    # Envuelve `funcion` y recuerda hasta `capacidad` resultados; al llenarse
+    # desaloja el menos usado recientemente. Con capacidad 0 no guarda nada.
+    # Se apoya en functools.lru_cache (implementada en C y segura entre hilos).
+
+    def __init__(self, funcion: Callable, capacidad: int) -> None:
+        functools.update_wrapper(self, funcion)
+        self._funcion = funcion
+        self._bloqueo = threading.Lock()
+        self._acumulado = {"aciertos": 0, "fallos": 0, "desalojos": 0}
+        self._crear(capacidad)
+
+    def _crear(self, capacidad: int) -> None:
+        self.capacidad = capacidad
+        self._memoria = functools.lru_cache(maxsize=max(capacidad, 0))(self._funcion)
+
+    def __call__(self, argumento):
+        return self._memoria(argumento)
+
+    def _contadores(self) -> dict:
+        # Contadores de la caché actual: cada fallo inserta un valor y el
+        # tamaño solo baja al desalojar, así que desalojos = fallos - tamaño.
+        info = self._memoria.cache_info()
+        desalojos = info.misses - info.currsize if self.capacidad > 0 else 0
+        return {"aciertos": info.hits, "fallos": info.misses, "desalojos": desalojos}
+
+    def configurar(self, capacidad: int) -> None:
+        # Cambia la capacidad; la caché vuelve a empezar vacía
+        with self._bloqueo:
+            anteriores = self._contadores()
+            for clave, valor in anteriores.items():
+                self._acumulado[clave] += valor
+            self._acumulado["desalojos"] += self._memoria.cache_info().currsize
+            self._crear(capacidad)
+
+    def limpiar(self) -> None:
+        # Vacía la caché y reinicia los contadores
+        with self._bloqueo:
+            self._acumulado = {"aciertos": 0, "fallos": 0, "desalojos": 0}
+            self._crear(self.capacidad)
+
+    def estadisticas(self) -> dict:
+        # Contadores de uso y tasa de aciertos
+        with self._bloqueo:
+            actuales = self._contadores()
+            totales = {
+                clave: self._acumulado[clave] + valor
+                for clave, valor in actuales.items()
+            }
+            consultas = totales["aciertos"] + totales["fallos"]
+            return {
+                "capacidad": self.capacidad,
+                "tamano": self._memoria.cache_info().currsize,
+                **totales,
+                "tasa_aciertos": totales["aciertos"] / consultas if consultas else 0.0,
+            }
+
+
+def cache_lru(capacidad: int) -> Callable[[Callable], CacheLRU]:
+    # Decorador: @cache_lru(10_000)
+    def decorar(funcion: Callable) -> CacheLRU:
+        return CacheLRU(funcion, capacidad)
+    return decorar
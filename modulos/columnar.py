@@ -0,0 +1,239 @@
+# Archivo: modulos/columnar.py
+# Almacén columnar opcional para reportes de ocupación: cada campo es una
+# columna (array) y los filtros se resuelven sobre columnas completas. Sin
+# NumPy, los filtros no recorren las filas en Python: cada comparación es un
+# bytes.translate sobre una columna de bytes y las máscaras se combinan con
+# operaciones de enteros grandes, ambas en C.
+
+from __future__ import annotations
+
+from array import array
+from collections import Counter
+from itertools import compress
+
+# Valor usado en las columnas de fecha cuando el pasajero no tiene fecha válida
+# (los ordinales empiezan en 1)
+SIN_FECHA = 0
+
+# Bytes por fecha: el ordinal de 31-12-9999 es 3_652_059 < 2**24
+BYTES_FECHA = 3
+
+# Bytes por código de nacionalidad (hasta 65_536 nacionalidades distintas)
+BYTES_NACIONALIDAD = 2
+
+# Se compacta cuando las filas borradas superan esta fracción del total
+FRACCION_COMPACTACION = 0.5
+
+
+def _ordinal(valor) -> int:
+    # Columna de fechas: ordinal o SIN_FECHA
+    return valor if type(valor) is int and 0 < valor < 1 << 8 * BYTES_FECHA else SIN_FECHA
+
+
+def _entero(mascara: bytes) -> int:
+    # Máscara 0/1 (un byte por fila) como entero grande, para combinarla con
+    # & y | en C; to_bytes(len, "big") la devuelve a bytes
+    return int.from_bytes(mascara, "big")
+
+
+def _tabla(condicion) -> bytes:
+    # Tabla para bytes.translate: 1 en los bytes que cumplen la condición
+    return bytes(1 if condicion(byte) else 0 for byte in range(256))
+
+
+class ColumnaBytes:
+    # Enteros sin signo de `ancho` bytes guardados como `ancho` columnas de
+    # bytes, de la más a la menos significativa. Comparar toda la columna con
+    # un valor son unos pocos bytes.translate, sin recorrer las filas en
+    # Python. Las comparaciones devuelven la máscara como entero (_entero).
+
+    def __init__(self, ancho: int, columnas: list | None = None) -> None:
+        self.ancho = ancho
+        self.columnas = columnas or [bytearray() for _ in range(ancho)]
+
+    def __len__(self) -> int:
+        return len(self.columnas[0])
+
+    def _digitos(self, valor: int) -> list:
+        return list(valor.to_bytes(self.ancho, "big"))
+
+    def agregar(self, valor: int) -> None:
+        for columna, digito in zip(self.columnas, self._digitos(valor)):
+            columna.append(digito)
+
+    def comprimir(self, vivas: bytes) -> ColumnaBytes:
+        # Nueva columna solo con las filas marcadas en `vivas`
+        return ColumnaBytes(
+            self.ancho, [bytearray(compress(columna, vivas)) for columna in self.columnas]
+        )
+
+    def tuplas(self):
+        # Bytes de cada fila (para agrupar); int.from_bytes(bytes(t)) da el valor
+        return zip(*self.columnas)
+
+    def igual(self, valor: int) -> int:
+        # Filas con ese valor
+        if not 0 <= valor < 1 << 8 * self.ancho:
+            return 0
+        resultado = -1
+        for columna, digito in zip(self.columnas, self._digitos(valor)):
+            resultado &= _entero(columna.translate(_tabla(digito.__eq__)))
+        return resultado
+
+    def menor(self, valor: int) -> int:
+        # Filas con valor < `valor`: menor en el primer byte distinto,
+        # recorriendo desde la columna más significativa
+        if valor <= 0:
+            return 0
+        if valor >= 1 << 8 * self.ancho:
+            return _entero(b"\x01" * len(self))
+        resultado, iguales = 0, -1
+        ultima = self.ancho - 1
+        for posicion, (columna, digito) in enumerate(zip(self.columnas, self._digitos(valor))):
+            if digito:
+                resultado |= iguales & _entero(columna.translate(_tabla(digito.__gt__)))
+            if posicion < ultima:
+                iguales &= _entero(columna.translate(_tabla(digito.__eq__)))
+        return resultado
+
+
+class TablaTextos:
+    # Tabla de textos repetidos: cada valor distinto recibe un código entero
+
+    def __init__(self) -> None:
+        self.valores = []
+        self.codigos = {}
+
+    def codigo(self, valor) -> int:
+        codigo = self.codigos.get(valor)
+        if codigo is None:
+            codigo = len(self.valores)
+            self.codigos[valor] = codigo
+            self.valores.append(valor)
+        return codigo
+
+
+class AlmacenColumnar:
+    # Columnas paralelas indexadas por fila. Las altas se agregan al final
+    # (append amortizado) y las bajas dejan una lápida hasta compactar.
+
+    def __init__(self) -> None:
+        self.habitacion = array("q")
+        self.ingreso = ColumnaBytes(BYTES_FECHA)   # ordinal o SIN_FECHA
+        self.salida = ColumnaBytes(BYTES_FECHA)
+        self.estado = bytearray()          # código en self.estados (< 256)
+        self.nacionalidad = ColumnaBytes(BYTES_NACIONALIDAD)  # código en self.nacionalidades
+        self.vivo = bytearray()            # 1 = fila vigente, 0 = lápida
+        self.documentos = []               # tabla de textos por fila
+        self.nombres = []
+        self.estados = TablaTextos()
+        self.nacionalidades = TablaTextos()
+        self.fila_de = {}                  # documento -> fila vigente
+        self.borrados = 0
+
+    def __len__(self) -> int:
+        return len(self.fila_de)
+
+    def agregar(self, pasajero) -> None:
+        # Agrega un pasajero al final de las columnas
+        documento = pasajero.get("documento")
+        if documento in self.fila_de:
+            self.quitar(documento)
+
+        codigo_estado = self.estados.codigo(pasajero.get("estado"))
+        if codigo_estado > 255:
+            raise ValueError("Demasiados estados distintos para la columna")
+        codigo_nacionalidad = self.nacionalidades.codigo(pasajero.get("nacionalidad"))
+        if codigo_nacionalidad >= 1 << 8 * BYTES_NACIONALIDAD:
+            raise ValueError("Demasiadas nacionalidades distintas para la columna")
+
+        self.fila_de[documento] = len(self.documentos)
+        self.documentos.append(documento)
+        self.nombres.append(pasajero.get("nombre"))
+        habitacion = pasajero.get("habitacion")
+        self.habitacion.append(habitacion if type(habitacion) is int else -1)
+        self.ingreso.agregar(_ordinal(getattr(pasajero, "ingreso", None)))
+        self.salida.agregar(_ordinal(getattr(pasajero, "salida", None)))
+        self.estado.append(codigo_estado)
+        self.nacionalidad.agregar(codigo_nacionalidad)
+        self.vivo.append(1)
+
+    def quitar(self, documento: str) -> None:
+        # Marca la fila del documento como borrada (lápida)
+        fila = self.fila_de.pop(documento, None)
+        if fila is None:
+            return
+        self.vivo[fila] = 0
+        self.borrados += 1
+        if self.borrados > FRACCION_COMPACTACION * len(self.vivo):
+            self.compactar()
+
+    def compactar(self) -> None:
+        # Elimina las lápidas reconstruyendo las columnas
+        vivas = self.vivo
+        self.habitacion = array("q", compress(self.habitacion, vivas))
+        self.ingreso = self.ingreso.comprimir(vivas)
+        self.salida = self.salida.comprimir(vivas)
+        self.estado = bytearray(compress(self.estado, vivas))
+        self.nacionalidad = self.nacionalidad.comprimir(vivas)
+        self.documentos = list(compress(self.documentos, vivas))
+        self.nombres = list(compress(self.nombres, vivas))
+        self.vivo = bytearray(b"\x01" * len(self.documentos))
+        self.fila_de = {documento: fila for fila, documento in enumerate(self.documentos)}
+        self.borrados = 0
+
+    # -------- FILTROS SOBRE COLUMNAS COMPLETAS --------
+
+    def mascara(
+        self,
+        estado: str | None = None,
+        nacionalidad: str | None = None,
+        desde: int | None = None,
+        hasta: int | None = None
+    ) -> bytes:
+        # Máscara 0/1 por fila. desde/hasta son ordinales de un rango [desde, hasta)
+        # que debe traslaparse con la estadía [ingreso, salida); cualquiera de
+        # los dos puede faltar (rango abierto por ese lado). Con un filtro de
+        # fechas solo cuentan las filas con ambas fechas válidas.
+        resultado = _entero(self.vivo)
+
+        if estado is not None:
+            codigo = self.estados.codigos.get(estado)
+            if codigo is None:
+                return bytes(len(self.vivo))
+            tabla = bytearray(256)
+            tabla[codigo] = 1
+            resultado &= _entero(self.estado.translate(tabla))
+
+        if nacionalidad is not None:
+            codigo = self.nacionalidades.codigos.get(nacionalidad)
+            if codigo is None:
+                return bytes(len(self.vivo))
+            resultado &= self.nacionalidad.igual(codigo)
+
+        if desde is not None or hasta is not None:
+            # ingreso válido y salida > desde: las filas vivas que no tienen
+            # ingreso < 1 ni salida < desde + 1 (SIN_FECHA es 0)
+            inicio = desde if desde is not None else SIN_FECHA
+            resultado &= ~(self.ingreso.menor(SIN_FECHA + 1) | self.salida.menor(inicio + 1))
+            if hasta is not None:
+                resultado &= self.ingreso.menor(hasta)
+
+        return resultado.to_bytes(len(self.vivo), "big")
+
+    def documentos_filtrados(self, **filtros) -> list:
+        # Documentos de las filas que cumplen los filtros de `mascara`
+        return list(compress(self.documentos, self.mascara(**filtros)))
+
+    def contar_por_nacionalidad(self, **filtros) -> dict:
+        # Cantidad de pasajeros por nacionalidad entre las filas filtradas
+        conteo = Counter(compress(self.nacionalidad.tuplas(), self.mascara(**filtros)))
+        valores = self.nacionalidades.valores
+        return {
+            valores[int.from_bytes(bytes(codigo), "big")]: cantidad
+            for codigo, cantidad in conteo.items()
+        }
+
+    def contar(self, **filtros) -> int:
+        # Cantidad de filas que cumplen los filtros
+        return self.mascara(**filtros).count(1)
@@ -0,0 +1,228 @@
+# Archivo: modulos/comandos.py
+# Modo por lotes (python main.py --batch comandos.jsonl): lee un comando JSON
+# por línea, lo valida con las mismas reglas del menú (entradas.py) y lo
+# ejecuta sobre un solo sistema ya cargado, sin preguntar campo por campo ni
+# resincronizar el CSV en cada comando. Por cada comando escribe una línea
+# JSON con el resultado. Ejemplos de comandos:
+#   {"accion": "registrar", "nombre": "Ana", "documento": "11111111-1",
+#    "nacionalidad": "Chilena", "habitacion": 101, "fecha_ingreso": "01-03-2025",
+#    "fecha_salida": "05-03-2025", "estado": "Alojado"}
+#   {"accion": "actualizar", "documento": "11111111-1", "habitacion": 102}
+#   {"accion": "eliminar", "documento": "11111111-1"}
+#   {"accion": "buscar_documento", "documento": "11111111-1"}
+#   {"accion": "buscar_habitacion", "habitacion": 101}
+#   {"accion": "buscar_nombre", "consulta": "ana", "limite": 5}
+#   {"accion": "listar", "limite": 20, "cursor": null}
+#   {"accion": "reporte", "fecha": "15-06-2025", "verificar": true}
+
+from __future__ import annotations
+
+import json
+import time
+
+from modulos.entradas import (
+    convertir_documento,
+    convertir_estado,
+    convertir_fecha,
+    convertir_habitacion,
+    convertir_texto,
+)
+from modulos.operaciones import (
+    CAMPOS_PASAJERO,
+    actualizar_pasajero,
+    buscar_por_documento,
+    buscar_por_nombre,
+    buscar_pasajero_por_habitacion,
+    confirmar_cambios,
+    eliminar_pasajero,
+    pagina_pasajeros,
+    registrar_pasajero,
+    reporte_ocupacion,
+    tomar_conflictos,
+)
+
+# Campo -> validación (la misma que usa el menú)
+CONVERSIONES = {
+    "nombre": convertir_texto,
+    "documento": convertir_documento,
+    "nacionalidad": convertir_texto,
+    "habitacion": convertir_habitacion,
+    "fecha_ingreso": convertir_fecha,
+    "fecha_salida": convertir_fecha,
+    "estado": convertir_estado,
+    "fecha": convertir_fecha,
+    "habitaciones": convertir_habitacion,
+    "consulta": convertir_texto,
+}
+
+# Campos que pueden venir como número JSON; los demás validados deben ser texto
+CAMPOS_NUMERICOS = ("habitacion", "habitaciones")
+
+# Resultados por página de "listar" y de "buscar_nombre" si no se indica otro
+LIMITE_POR_DEFECTO = 20
+
+
+def _campos(comando: dict, permitidos: tuple, obligatorios: tuple) -> dict:
+    # Valida los campos del comando; ValueError con el campo y el motivo
+    desconocidos = set(comando) - set(permitidos) - {"accion"}
+    if desconocidos:
+        raise ValueError(f"campos desconocidos: {', '.join(sorted(desconocidos))}")
+    for campo in obligatorios:
+        if comando.get(campo) is None:
+            raise ValueError(f"falta el campo {campo}")
+    datos = {}
+    for campo in permitidos:
+        if comando.get(campo) is None:
+            continue
+        valor = comando[campo]
+        convertir = CONVERSIONES.get(campo)
+        # Como en el servicio: un objeto o una lista no se guarda como nombre
+        if convertir is not None and campo not in CAMPOS_NUMERICOS and type(valor) is not str:
+            raise ValueError(f"{campo}: debe ser texto.")
+        try:
+            datos[campo] = valor if convertir is None else convertir(valor)
+        except ValueError as error:
+            raise ValueError(f"{campo}: {error}") from None
+    return datos
+
+
+def _limite(datos: dict) -> int:
+    limite = datos.get("limite", LIMITE_POR_DEFECTO)
+    if type(limite) is not int or limite <= 0:
+        raise ValueError("limite: debe ser un entero positivo.")
+    return limite
+
+
+def _registrar(sistema: dict, comando: dict):
+    pasajero = _campos(comando, CAMPOS_PASAJERO, CAMPOS_PASAJERO)
+    if not registrar_pasajero(sistema, pasajero):
+        raise LookupError("documento duplicado, habitación ocupada o salida anterior al ingreso.")
+    return {"documento": pasajero["documento"]}
+
+
+def _actualizar(sistema: dict, comando: dict):
+    cambios = _campos(comando, CAMPOS_PASAJERO, ("documento",))
+    documento = cambios.pop("documento")
+    if not cambios:
+        raise ValueError("no hay campos para actualizar")
+    if not actualizar_pasajero(sistema, documento, cambios):
+        raise LookupError("pasajero no existe, habitación ocupada o salida anterior al ingreso.")
+    return dict(buscar_por_documento(sistema, documento))
+
+
+def _eliminar(sistema: dict, comando: dict):
+    documento = _campos(comando, ("documento",), ("documento",))["documento"]
+    if not eliminar_pasajero(sistema, documento):
+        raise LookupError("pasajero no encontrado.")
+    return {"documento": documento}
+
+
+def _buscar_documento(sistema: dict, comando: dict):
+    documento = _campos(comando, ("documento",), ("documento",))["documento"]
+    pasajero = buscar_por_documento(sistema, documento)
+    if pasajero is None:
+        raise LookupError("pasajero no encontrado.")
+    return dict(pasajero)
+
+
+def _buscar_habitacion(sistema: dict, comando: dict):
+    habitacion = _campos(comando, ("habitacion",), ("habitacion",))["habitacion"]
+    pasajero = buscar_pasajero_por_habitacion(sistema, habitacion)
+    if pasajero is None:
+        raise LookupError("no hay pasajero asignado a esa habitación.")
+    return dict(pasajero)
+
+
+def _buscar_nombre(sistema: dict, comando: dict):
+    datos = _campos(comando, ("consulta", "limite"), ("consulta",))
+    return [dict(p) for p in buscar_por_nombre(sistema, datos["consulta"], _limite(datos))]
+
+
+def _listar(sistema: dict, comando: dict):
+    datos = _campos(comando, ("limite", "cursor"), ())
+    pagina, siguiente = pagina_pasajeros(sistema, _limite(datos), datos.get("cursor"))
+    return {"pasajeros": [dict(p) for p in pagina], "siguiente": siguiente}
+
+
+def _reporte(sistema: dict, comando: dict):
+    datos = _campos(comando, ("fecha", "habitaciones", "verificar"), ())
+    verificar = datos.get("verificar", False)
+    if type(verificar) is not bool:
+        raise ValueError("verificar: debe ser true o false.")
+    return reporte_ocupacion(
+        sistema, datos.get("fecha"), datos.get("habitaciones"), verificar
+    )
+
+
+# Acción -> función que la ejecuta (las mismas opciones del menú)
+ACCIONES = {
+    "registrar": _registrar,
+    "listar": _listar,
+    "buscar_documento": _buscar_documento,
+    "actualizar": _actualizar,
+    "eliminar": _eliminar,
+    "buscar_habitacion": _buscar_habitacion,
+    "buscar_nombre": _buscar_nombre,
+    "reporte": _reporte,
+}
+
+
+def ejecutar_comando(sistema: dict, linea: str) -> dict:
+    # Ejecuta una línea JSON y devuelve {"accion", "ok", "resultado" o "error"}
+    try:
+        comando = json.loads(linea)
+    except ValueError:
+        return {"accion": None, "ok": False, "error": "JSON inválido"}
+    if not isinstance(comando, dict):
+        return {"accion": None, "ok": False, "error": "se esperaba un objeto JSON"}
+
+    accion = comando.get("accion")
+    funcion = ACCIONES.get(accion)
+    if funcion is None:
+        return {"accion": accion, "ok": False, "error": f"acción desconocida: {accion}"}
+    try:
+        # Con el cerrojo entre hilos el escritor en segundo plano no recarga
+        # los pasajeros a mitad del comando (las escrituras además toman el
+        # de persistencia)
+        with sistema["persistencia"]["bloqueo"].hilos:
+            resultado = funcion(sistema, comando)
+        return {"accion": accion, "ok": True, "resultado": resultado}
+    except (ValueError, LookupError) as error:
+        return {"accion": accion, "ok": False, "error": str(error)}
+
+
+def ejecutar_lote(sistema: dict, lineas, salida) -> dict:
+    # Ejecuta los comandos de `lineas` (se saltan las vacías) y escribe en
+    # `salida` una línea JSON por comando con su número de línea. Devuelve el
+    # resumen; el tiempo incluye dejar los cambios confirmados. Los cambios
+    # que otra terminal invalidó antes de escribirse se informan al final con
+    # una línea por cambio y se descuentan de los correctos.
+    inicio = time.perf_counter()
+    comandos = correctos = 0
+    for numero, linea in enumerate(lineas, 1):
+        if not linea.strip():
+            continue
+        resultado = {"linea": numero, **ejecutar_comando(sistema, linea)}
+        salida.write(json.dumps(resultado, ensure_ascii=False) + "\n")
+        comandos += 1
+        correctos += resultado["ok"]
+    confirmar_cambios(sistema)
+    conflictos = tomar_conflictos(sistema)
+    for accion, documento in conflictos:
+        resultado = {
+            "ok": False,
+            "accion": accion,
+            "documento": documento,
+            "error": "otra terminal lo invalidó antes de guardarlo",
+        }
+        salida.write(json.dumps(resultado, ensure_ascii=False) + "\n")
+    correctos -= len(conflictos)
+    segundos = time.perf_counter() - inicio
+    return {
+        "comandos": comandos,
+        "correctos": correctos,
+        "errores": comandos - correctos,
+        "conflictos": len(conflictos),
+        "segundos": segundos,
+        "por_segundo": comandos / segundos if segundos else 0.0,
+    }
@@ -0,0 +1,117 @@
+# Archivo: modulos/disponibilidad.py
+# Motor de disponibilidad de habitaciones por fecha. Cada habitación guarda un
+# mapa de bits (un entero de Python) donde el bit i indica si la noche
+# base + i está ocupada; así "¿está libre R en [ingreso, salida)?" es un
+# desplazamiento y un AND, sin recorrer reservas.
+
+from __future__ import annotations
+
+
+def _noches(ingreso: int, salida: int) -> int:
+    # Una estadía de día (salida == ingreso) ocupa al menos una noche
+    return max(salida - ingreso, 1)
+
+
+class Disponibilidad:
+    # habitación -> [base, bits, sin_fecha]. `sin_fecha` cuenta a los
+    # pasajeros sin fechas válidas, que ocupan la habitación por completo.
+
+    def __init__(self) -> None:
+        self.habitaciones = {}
+
+    def _estado(self, habitacion: int, ingreso: int | None = None) -> list:
+        estado = self.habitaciones.get(habitacion)
+        if estado is None:
+            estado = [ingreso or 0, 0, 0]
+            self.habitaciones[habitacion] = estado
+        elif ingreso is not None and not estado[1]:
+            estado[0] = ingreso
+        elif ingreso is not None and ingreso < estado[0]:
+            # Corre la base hacia atrás para que la nueva fecha quepa en el mapa
+            estado[1] <<= estado[0] - ingreso
+            estado[0] = ingreso
+        return estado
+
+    def libre(
+        self,
+        habitacion: int,
+        ingreso: int | None = None,
+        salida: int | None = None
+    ) -> bool:
+        # True si la habitación está libre en [ingreso, salida). Sin fechas,
+        # solo está libre si no tiene ninguna estadía.
+        estado = self.habitaciones.get(habitacion)
+        if estado is None:
+            return True
+        base, bits, sin_fecha = estado
+        if sin_fecha:
+            return False
+        if ingreso is None or salida is None:
+            return bits == 0
+
+        mascara = (1 << _noches(ingreso, salida)) - 1
+        if ingreso >= base:
+            return not (bits >> (ingreso - base)) & mascara
+        return not bits & (mascara >> (base - ingreso))
+
+    def ocupar(
+        self,
+        habitacion: int,
+        ingreso: int | None = None,
+        salida: int | None = None
+    ) -> None:
+        # Marca la estadía como ocupada (se asume que ya se verificó `libre`)
+        if ingreso is None or salida is None:
+            self._estado(habitacion)[2] += 1
+            return
+        estado = self._estado(habitacion, ingreso)
+        mascara = (1 << _noches(ingreso, salida)) - 1
+        estado[1] |= mascara << (ingreso - estado[0])
+
+    def liberar(
+        self,
+        habitacion: int,
+        ingreso: int | None = None,
+        salida: int | None = None
+    ) -> None:
+        # Desmarca una estadía ocupada antes con los mismos datos
+        estado = self.habitaciones.get(habitacion)
+        if estado is None:
+            return
+        if ingreso is None or salida is None:
+            estado[2] = max(estado[2] - 1, 0)
+        else:
+            mascara = (1 << _noches(ingreso, salida)) - 1
+            desplazamiento = ingreso - estado[0]
+            if desplazamiento >= 0:
+                estado[1] &= ~(mascara << desplazamiento)
+            else:
+                estado[1] &= ~(mascara >> -desplazamiento)
+        if not estado[1] and not estado[2]:
+            del self.habitaciones[habitacion]
+
+    def habitaciones_libres(
+        self,
+        ingreso: int,
+        salida: int,
+        candidatas=None
+    ) -> list:
+        # Habitaciones libres en [ingreso, salida) entre las candidatas
+        # (por defecto, todas las que tienen alguna estadía registrada)
+        if candidatas is None:
+            candidatas = self.habitaciones
+        return sorted(h for h in candidatas if self.libre(h, ingreso, salida))
+
+    def recortar(self, dia: int) -> None:
+        # Descarta las noches anteriores a `dia` (horizonte móvil) para que
+        # los mapas de bits no crezcan con el historial
+        for habitacion in list(self.habitaciones):
+            estado = self.habitaciones[habitacion]
+            if estado[0] < dia:
+                estado[1] >>= dia - estado[0]
+                estado[0] = dia
+                if not estado[1] and not estado[2]:
+                    del self.habitaciones[habitacion]
+
+    def limpiar(self) -> None:
+        self.habitaciones.clear()
@@ -1,7 +1,21 @@
 # Archivo: modulos/documentos.py
 # Validación flexible de documentos: RUT chileno (si corresponde) o documento internacional
 
-from modulos.rut import formatear_rut
+from __future__ import annotations
+
+import os
+from collections.abc import Iterable
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+
+from modulos.cache import cache_lru
+from modulos.rut import calcular_dv, es_cuerpo_rut
+
+# Documentos por tarea al repartir la validación entre procesos
+TAMANO_LOTE_DOCUMENTOS = 50_000
+
+# Documentos normalizados que se recuerdan (ver normalizar_documento.estadisticas())
+TAMANO_CACHE_DOCUMENTOS = 100_000
 
 
 def parece_rut_chileno(documento: str) -> bool:
@@ -18,25 +32,68 @@ def parece_rut_chileno(documento: str) -> bool:
     # Si termina en K o dígito, y lo demás son dígitos, también puede ser RUT.
     if doc[-1] in "0123456789K":
         cuerpo = doc[:-1]
-        return cuerpo.isdigit()
+        return es_cuerpo_rut(cuerpo)
 
     return False
 
 
+def _normalizar_rut(doc: str) -> str | None:
+    # Valida y formatea un RUT ya recortado y en mayúsculas, limpiándolo una sola vez
+    rut_limpio = doc.replace(".", "").replace("-", "")
+    if len(rut_limpio) < 2:
+        return None
+
+    cuerpo = rut_limpio[:-1]
+    dv = rut_limpio[-1]
+    if not es_cuerpo_rut(cuerpo) or dv != calcular_dv(cuerpo):
+        return None
+    return f"{cuerpo}-{dv}"
+
+
+@cache_lru(TAMANO_CACHE_DOCUMENTOS)
 def normalizar_documento(documento: str) -> str | None:
     # Si parece RUT, lo valida y devuelve formateado. Si no, devuelve normalizado simple.
-    doc = documento.strip()
+    # Resultados memorizados: repetir un documento cuesta una consulta a la caché.
+    doc = documento.strip().upper()
 
     if doc == "":
         return None
 
     if parece_rut_chileno(doc):
-        return formatear_rut(doc)  # None si es inválido
+        return _normalizar_rut(doc)  # None si es inválido
 
     # Documento internacional: normalización simple (sin imponer formato país-específico)
     # Puedes ajustar el mínimo de largo si quieres.
-    doc_norm = doc.upper()
-    if len(doc_norm) < 5:
+    if len(doc) < 5:
         return None
 
-    return doc_norm
\ No newline at end of file
+    return doc
+
+
+def _normalizar_lote(documentos: list) -> list:
+    # Normaliza un lote completo (se ejecuta dentro de cada proceso). Los lotes
+    # masivos no pasan por la caché para no desalojar los documentos frecuentes.
+    normalizar = normalizar_documento.__wrapped__
+    return [normalizar(documento) for documento in documentos]
+
+
+def normalizar_documentos(
+    documentos: Iterable[str],
+    procesos: int | None = None,
+    tamano_lote: int = TAMANO_LOTE_DOCUMENTOS
+) -> list:
+    # Normaliza muchos documentos y devuelve los resultados en el mismo orden.
+    # Con procesos > 1 reparte lotes entre varios procesos; con 1 trabaja aquí.
+    iterador = iter(documentos)
+    lotes = iter(lambda: list(islice(iterador, tamano_lote)), [])
+
+    procesos = procesos if procesos is not None else os.cpu_count() or 1
+    if procesos <= 1:
+        return [resultado for lote in lotes for resultado in _normalizar_lote(lote)]
+
+    with ProcessPoolExecutor(max_workers=procesos) as ejecutor:
+        return [
+            resultado
+            for lote in ejecutor.map(_normalizar_lote, lotes)
+            for resultado in lote
+        ]
@@ -1,5 +1,10 @@
 # Archivo: modulos/entradas.py
-# Funciones para solicitar y validar datos ingresados por el usuario
+# Funciones para solicitar y validar datos ingresados por el usuario.
+# Las convertir_* validan un valor ya leído (lanzan ValueError con el mensaje
+# para el usuario); las pedir_* preguntan por consola hasta que sea válido.
+# El modo por lotes (comandos.py) usa las mismas convertir_* sin preguntar.
+
+from __future__ import annotations
 
 from modulos.documentos import normalizar_documento, parece_rut_chileno
 
@@ -9,67 +14,94 @@ from modulos.validaciones import (
     es_fecha_dd_mm_yyyy,
 )
 
+# Opción del menú -> estado de la estadía
+OPCIONES_ESTADO = {
+    "1": "Alojado",
+    "2": "Check-out",
+}
+
+
+def convertir_texto(valor) -> str:
+    # Texto no vacío, sin espacios alrededor
+    texto = str(valor).strip()
+    if not texto_no_vacio(texto):
+        raise ValueError("este campo no puede estar vacío.")
+    return texto
 
-def pedir_texto(mensaje: str) -> str:
-    # Solicita un texto no vacío al usuario
-    texto = input(mensaje).strip()
 
-    while not texto_no_vacio(texto):
-        print("Error: este campo no puede estar vacío.")
-        texto = input(mensaje).strip()
+def convertir_habitacion(valor) -> int:
+    # Número de habitación (entero positivo), como texto o como número
+    texto = str(valor).strip() if type(valor) is not bool else ""
+    if not es_entero_positivo(texto):
+        raise ValueError("la habitación debe ser un número entero positivo.")
+    return int(texto)
 
+
+def convertir_fecha(valor) -> str:
+    # Fecha con formato dd-mm-yyyy
+    texto = str(valor).strip()
+    if not es_fecha_dd_mm_yyyy(texto):
+        raise ValueError("formato inválido. Use dd-mm-yyyy.")
     return texto
 
 
-def pedir_habitacion(mensaje: str) -> int:
-    # Solicita un número de habitación válido (entero positivo)
-    valor = input(mensaje).strip()
+def convertir_estado(valor) -> str:
+    # Estado por número de opción (1, 2) o por nombre (Alojado, Check-out)
+    texto = str(valor).strip()
+    if texto in OPCIONES_ESTADO:
+        return OPCIONES_ESTADO[texto]
+    for estado in OPCIONES_ESTADO.values():
+        if texto.casefold() == estado.casefold():
+            return estado
+    raise ValueError("opción inválida.")
+
+
+def convertir_documento(valor) -> str:
+    # Documento normalizado. Si parece RUT, se valida como RUT; si no, se
+    # acepta como internacional.
+    texto = str(valor).strip()
+    documento = normalizar_documento(texto)
+    if documento is None:
+        if parece_rut_chileno(texto):
+            raise ValueError("RUT chileno inválido. Ejemplo: 22222222-2 o 22222222-K")
+        raise ValueError("documento inválido (mínimo 5 caracteres).")
+    return documento
+
 
-    while not es_entero_positivo(valor):
-        print("Error: la habitación debe ser un número entero positivo.")
-        valor = input(mensaje).strip()
+def _pedir(mensaje: str, convertir):
+    # Pregunta hasta que `convertir` acepte la respuesta
+    while True:
+        try:
+            return convertir(input(mensaje))
+        except ValueError as error:
+            print(f"Error: {error}")
 
-    return int(valor)
+
+def pedir_texto(mensaje: str) -> str:
+    # Solicita un texto no vacío al usuario
+    return _pedir(mensaje, convertir_texto)
+
+
+def pedir_habitacion(mensaje: str) -> int:
+    # Solicita un número de habitación válido (entero positivo)
+    return _pedir(mensaje, convertir_habitacion)
 
 
 def pedir_fecha(mensaje: str) -> str:
     # Solicita una fecha con formato dd-mm-yyyy
-    valor = input(mensaje).strip()
+    return _pedir(mensaje, convertir_fecha)
 
-    while not es_fecha_dd_mm_yyyy(valor):
-        print("Error: formato inválido. Use dd-mm-yyyy.")
-        valor = input(mensaje).strip()
 
-    return valor
+def pedir_fecha_opcional(mensaje: str) -> str | None:
+    # Como pedir_fecha, pero Enter sin escribir nada devuelve None
+    return _pedir(mensaje, lambda valor: convertir_fecha(valor) if valor.strip() else None)
 
 
 def pedir_estado(mensaje: str) -> str:
     # Solicita el estado de la estadía con opciones controladas
-    opciones = {
-        "1": "Alojado",
-        "2": "Check-out",
-    }
-
-    opcion = input(f"{mensaje} (1 = Alojado, 2 = Check-out): ").strip()
-
-    while opcion not in opciones:
-        print("Error: opción inválida.")
-        opcion = input(f"{mensaje} (1 = Alojado, 2 = Check-out): ").strip()
+    return _pedir(f"{mensaje} (1 = Alojado, 2 = Check-out): ", convertir_estado)
 
-    return opciones[opcion]
 
 def pedir_documento(mensaje: str) -> str:
     # Pide un documento. Si parece RUT, lo valida como RUT; si no, lo acepta como internacional.
-    doc = input(mensaje).strip()
-    doc_ok = normalizar_documento(doc)
-
-    while doc_ok is None:
-        if parece_rut_chileno(doc):
-            print("Error: RUT chileno inválido. Ejemplo: 22222222-2 o 22222222-K")
-        else:
-            print("Error: documento inválido (mínimo 5 caracteres).")
-
-        doc = input(mensaje).strip()
-        doc_ok = normalizar_documento(doc)
-
-    return doc_ok
\ No newline at end of file
+    return _pedir(mensaje, convertir_documento)
@@ -0,0 +1,141 @@
+# Archivo: modulos/estadias.py
+# Índice de intervalos sobre las estadías [fecha_ingreso, fecha_salida), con las
+# fechas como números de día (ordinales). Responde quién está alojado, quién
+# llega y quién se va en una fecha sin recorrer todos los pasajeros.
+
+from __future__ import annotations
+
+from bisect import bisect_left, insort
+
+# Hasta cuántas altas pendientes se insertan una a una en los arreglos
+# ordenados; con más (p. ej. al cargar el CSV) conviene reordenar de una vez
+MAXIMO_INSERCIONES = 64
+
+
+def _nodo(ingreso: int, salida: int) -> tuple:
+    # Nodo del árbol de intervalos implícito sobre los días: (nivel, prefijo)
+    # del bloque alineado de 2**nivel días más chico que contiene la estadía
+    # completa [ingreso, salida - 1]. Toda estadía guardada en un nodo de
+    # nivel > 0 cruza su centro.
+    nivel = (ingreso ^ (salida - 1)).bit_length()
+    return nivel, ingreso >> nivel
+
+
+class IndiceEstadias:
+    # Dos arreglos ordenados: (ingreso, salida, documento) por ingreso y
+    # (salida, documento) por salida. Las llegadas y salidas de un día son un
+    # rango por búsqueda binaria: O(log N + k).
+    # Para "alojados en D" hay además un árbol de intervalos implícito: cada
+    # estadía cuelga del nodo (nivel, prefijo) que parte su rango de días en el
+    # centro, y cada nodo guarda sus estadías ordenadas por ingreso y por
+    # salida. Una consulta baja por los nodos que contienen D (uno por nivel,
+    # ~22 para fechas hasta el año 9999) y en cada uno toma un prefijo o un
+    # sufijo con búsqueda binaria: O(niveles · log N + k), sin importar cuánto
+    # dure la estadía más larga.
+    # Las altas se juntan en `_altas` y se ordenan recién al consultar.
+
+    def __init__(self) -> None:
+        self.por_ingreso = []
+        self.por_salida = []
+        self.nodos = {}      # (nivel, prefijo) -> ([(ingreso, salida, doc)], [(salida, doc)])
+        self.niveles = 0     # los nodos van de nivel 0 a niveles - 1
+        self._altas = []     # (ingreso, salida, documento) aún no ordenadas
+
+    def __len__(self) -> int:
+        return len(self.por_ingreso) + len(self._altas)
+
+    def _ordenar_altas(self) -> None:
+        # Incorpora las altas pendientes a los arreglos ordenados y al árbol
+        if not self._altas:
+            return
+        if len(self._altas) <= MAXIMO_INSERCIONES:
+            for ingreso, salida, documento in self._altas:
+                insort(self.por_ingreso, (ingreso, salida, documento))
+                insort(self.por_salida, (salida, documento))
+                if salida > ingreso:
+                    nodo = self.nodos.setdefault(_nodo(ingreso, salida), ([], []))
+                    insort(nodo[0], (ingreso, salida, documento))
+                    insort(nodo[1], (salida, documento))
+        else:
+            self.por_ingreso.extend(self._altas)
+            self.por_ingreso.sort()
+            self.por_salida.extend((salida, documento) for _, salida, documento in self._altas)
+            self.por_salida.sort()
+            tocados = set()
+            for ingreso, salida, documento in self._altas:
+                if salida > ingreso:
+                    clave = _nodo(ingreso, salida)
+                    nodo = self.nodos.setdefault(clave, ([], []))
+                    nodo[0].append((ingreso, salida, documento))
+                    nodo[1].append((salida, documento))
+                    tocados.add(clave)
+            for clave in tocados:
+                self.nodos[clave][0].sort()
+                self.nodos[clave][1].sort()
+        self._altas.clear()
+
+    def agregar(self, documento: str, ingreso: int, salida: int) -> None:
+        # Agrega una estadía (ordinales de ingreso y salida)
+        self._altas.append((ingreso, salida, documento))
+        if salida > ingreso:
+            self.niveles = max(self.niveles, _nodo(ingreso, salida)[0] + 1)
+
+    def quitar(self, documento: str, ingreso: int, salida: int) -> None:
+        # Quita una estadía agregada antes con los mismos datos
+        self._ordenar_altas()
+        entrada = (ingreso, salida, documento)
+        posicion = bisect_left(self.por_ingreso, entrada)
+        if posicion == len(self.por_ingreso) or self.por_ingreso[posicion] != entrada:
+            return
+        del self.por_ingreso[posicion]
+        del self.por_salida[bisect_left(self.por_salida, (salida, documento))]
+
+        if salida > ingreso:
+            clave = _nodo(ingreso, salida)
+            por_ingreso, por_salida = self.nodos[clave]
+            del por_ingreso[bisect_left(por_ingreso, entrada)]
+            del por_salida[bisect_left(por_salida, (salida, documento))]
+            if not por_ingreso:
+                del self.nodos[clave]
+
+    def limpiar(self) -> None:
+        self.por_ingreso.clear()
+        self.por_salida.clear()
+        self.nodos.clear()
+        self.niveles = 0
+        self._altas.clear()
+
+    def llegadas(self, dia: int) -> list:
+        # Documentos con ingreso en el día
+        self._ordenar_altas()
+        inicio = bisect_left(self.por_ingreso, (dia,))
+        fin = bisect_left(self.por_ingreso, (dia + 1,))
+        return [documento for _, _, documento in self.por_ingreso[inicio:fin]]
+
+    def salidas(self, dia: int) -> list:
+        # Documentos con salida en el día
+        self._ordenar_altas()
+        inicio = bisect_left(self.por_salida, (dia,))
+        fin = bisect_left(self.por_salida, (dia + 1,))
+        return [documento for _, documento in self.por_salida[inicio:fin]]
+
+    def alojados(self, dia: int) -> list:
+        # Documentos con ingreso <= día < salida. En cada nodo que contiene el
+        # día, las estadías cruzan el centro: si el día está antes del centro
+        # sirven las que ya ingresaron y si no, las que aún no salen.
+        self._ordenar_altas()
+        documentos = []
+        for nivel in range(self.niveles):
+            prefijo = dia >> nivel
+            nodo = self.nodos.get((nivel, prefijo))
+            if nodo is None:
+                continue
+            por_ingreso, por_salida = nodo
+            centro = (prefijo << nivel) | (1 << nivel >> 1)
+            if dia < centro:
+                fin = bisect_left(por_ingreso, (dia + 1,))
+                documentos.extend(documento for _, _, documento in por_ingreso[:fin])
+            else:
+                inicio = bisect_left(por_salida, (dia + 1,))
+                documentos.extend(documento for _, documento in por_salida[inicio:])
+        return documentos
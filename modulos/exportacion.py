@@ -0,0 +1,216 @@
+# Archivo: modulos/exportacion.py
+# Exportación de pasajeros para contabilidad y migraciones: CSV o JSONL,
+# opcionalmente comprimido (gzip, bz2, xz y zstd si está disponible),
+# filtrado por rango de fechas. Los pasajeros se recorren con un generador y
+# se reparten en bloques; cada bloque se codifica (y comprime) en un proceso
+# del grupo y se escribe en orden. Como hay un número fijo de bloques en
+# vuelo, la memoria no crece con la cantidad de pasajeros. Un archivo
+# comprimido queda como varios miembros seguidos, que gzip, bzip2, xz y zstd
+# leen como un solo archivo.
+
+from __future__ import annotations
+
+import bz2
+import csv
+import gzip
+import io
+import json
+import lzma
+import os
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+from pathlib import Path
+
+from modulos.metricas import medido
+from modulos.operaciones import CAMPOS_CSV, iterar_pasajeros
+from modulos.persistencia import escritura_atomica
+from modulos.validaciones import ordinal_a_fecha
+
+_zstd = _zstandard = None
+try:
+    from compression import zstd as _zstd  # Python 3.14+
+except ImportError:
+    try:
+        import zstandard as _zstandard  # paquete opcional
+    except ImportError:  # sin zstd: solo los compresores de la biblioteca estándar
+        pass
+
+FORMATOS = ("csv", "jsonl")
+
+# Extensión del archivo -> compresión
+EXTENSIONES = {
+    ".gz": "gzip",
+    ".bz2": "bz2",
+    ".xz": "xz",
+    ".zst": "zstd",
+}
+
+# Pasajeros por bloque que codifica cada proceso
+FILAS_POR_BLOQUE = 20_000
+
+# Bloques en vuelo por proceso (acota la memoria)
+BLOQUES_POR_PROCESO = 2
+
+
+def _comprimir_zstd(datos: bytes, nivel: int | None) -> bytes:
+    if _zstd is not None:
+        return _zstd.compress(datos, level=nivel)
+    return _zstandard.ZstdCompressor(level=3 if nivel is None else nivel).compress(datos)
+
+
+# Compresión -> función (datos, nivel) -> bytes; nivel None usa el por defecto
+COMPRESORES = {
+    "gzip": lambda datos, nivel: gzip.compress(
+        datos, compresslevel=6 if nivel is None else nivel, mtime=0
+    ),
+    "bz2": lambda datos, nivel: bz2.compress(datos, 9 if nivel is None else nivel),
+    "xz": lambda datos, nivel: lzma.compress(datos, preset=nivel),
+}
+if _zstd is not None or _zstandard is not None:
+    COMPRESORES["zstd"] = _comprimir_zstd
+
+
+class _Fechas(dict):
+    # Fecha guardada como ordinal -> "dd-mm-yyyy"; las inválidas (texto) y
+    # None quedan igual. Se arma una por bloque: las fechas se repiten mucho y
+    # así cada una se convierte una sola vez.
+
+    def __missing__(self, valor):
+        texto = self[valor] = ordinal_a_fecha(valor) if type(valor) is int else valor
+        return texto
+
+
+def _lineas_csv(filas: list, encabezado: bool) -> str:
+    texto = io.StringIO()
+    escritor = csv.writer(texto)
+    if encabezado:
+        escritor.writerow(CAMPOS_CSV)
+    fecha = _Fechas()
+    # Igual que guardar_pasajeros_a_csv: un campo vacío se escribe como ""
+    escritor.writerows([
+        (documento, nombre, nacionalidad, habitacion, fecha[ingreso], fecha[salida], estado)
+        for nombre, documento, nacionalidad, habitacion, ingreso, salida, estado in filas
+    ])
+    return texto.getvalue()
+
+
+# Un solo codificador: json.dumps con opciones arma uno nuevo en cada llamada
+_JSON = json.JSONEncoder(ensure_ascii=False)
+
+
+def _lineas_jsonl(filas: list, encabezado: bool) -> str:
+    fecha = _Fechas()
+    codificar = _JSON.encode
+    return "".join([
+        codificar(dict(zip(CAMPOS_CSV, (
+            documento, nombre, nacionalidad, habitacion,
+            fecha[ingreso], fecha[salida], estado,
+        )))) + "\n"
+        for nombre, documento, nacionalidad, habitacion, ingreso, salida, estado in filas
+    ])
+
+
+def _codificar_bloque(
+    formato: str,
+    compresion: str | None,
+    nivel: int | None,
+    filas: list,
+    encabezado: bool
+) -> tuple:
+    # Convierte un bloque de filas (valores de Pasajero en el orden de
+    # __slots__) y lo comprime. Se ejecuta dentro de cada proceso.
+    # Devuelve (bytes a escribir, bytes sin comprimir).
+    if formato == "csv":
+        datos = _lineas_csv(filas, encabezado).encode("utf-8")
+    else:
+        datos = _lineas_jsonl(filas, encabezado).encode("utf-8")
+    if compresion is None:
+        return datos, len(datos)
+    return COMPRESORES[compresion](datos, nivel), len(datos)
+
+
+def deducir_formato(ruta: Path) -> tuple:
+    # (formato, compresión) según la extensión: pasajeros.jsonl.gz -> ("jsonl", "gzip")
+    sufijos = [sufijo.lower() for sufijo in ruta.suffixes]
+    compresion = EXTENSIONES.get(sufijos[-1]) if sufijos else None
+    if compresion is not None:
+        sufijos.pop()
+    formato = sufijos[-1].lstrip(".") if sufijos else "csv"
+    return (formato if formato in FORMATOS else "csv"), compresion
+
+
+@medido
+def exportar(
+    sistema: dict,
+    ruta: Path,
+    formato: str | None = None,
+    compresion: str | None = None,
+    fecha_desde: str | None = None,
+    fecha_hasta: str | None = None,
+    procesos: int | None = None,
+    nivel: int | None = None,
+    filas_por_bloque: int = FILAS_POR_BLOQUE,
+    **filtros
+) -> dict:
+    # Exporta a `ruta` los pasajeros alojados algún día entre fecha_desde y
+    # fecha_hasta (ambas opcionales, dd-mm-yyyy), más los filtros de
+    # iterar_pasajeros (estado, nacionalidad, ...). Formato y compresión se
+    # deducen de la extensión si no se indican. Con procesos > 1 codifica en
+    # varios procesos; con 1 trabaja aquí. Devuelve filas, bytes y MB/s.
+    ruta = Path(ruta)
+    deducido, comprimido = deducir_formato(ruta)
+    formato = formato or deducido
+    compresion = compresion if compresion is not None else comprimido
+    if formato not in FORMATOS:
+        raise ValueError(f"Formato desconocido: {formato}")
+    if compresion is not None and compresion not in COMPRESORES:
+        raise ValueError(f"Compresión no disponible: {compresion}")
+
+    pasajeros = iterar_pasajeros(
+        sistema, fecha_desde=fecha_desde, fecha_hasta=fecha_hasta, **filtros
+    )
+    valores = (pasajero._valores() for pasajero in pasajeros)
+    bloques = iter(lambda: list(islice(valores, filas_por_bloque)), [])
+    procesos = procesos if procesos is not None else os.cpu_count() or 1
+
+    inicio = time.perf_counter()
+    resumen = {"filas": 0, "bytes": 0, "bytes_sin_comprimir": 0}
+
+    def escribir(archivo, bloque: tuple) -> None:
+        datos, sin_comprimir = bloque
+        archivo.write(datos)
+        resumen["bytes"] += len(datos)
+        resumen["bytes_sin_comprimir"] += sin_comprimir
+
+    with escritura_atomica(ruta, binario=True) as archivo:
+        # El primer bloque lleva el encabezado; sin pasajeros igual se escribe
+        primero = next(bloques, [])
+        resumen["filas"] += len(primero)
+        if procesos <= 1:
+            escribir(archivo, _codificar_bloque(formato, compresion, nivel, primero, True))
+            for bloque in bloques:
+                resumen["filas"] += len(bloque)
+                escribir(archivo, _codificar_bloque(formato, compresion, nivel, bloque, False))
+        else:
+            with ProcessPoolExecutor(max_workers=procesos) as ejecutor:
+                en_vuelo = deque([ejecutor.submit(
+                    _codificar_bloque, formato, compresion, nivel, primero, True
+                )])
+                for bloque in bloques:
+                    resumen["filas"] += len(bloque)
+                    en_vuelo.append(ejecutor.submit(
+                        _codificar_bloque, formato, compresion, nivel, bloque, False
+                    ))
+                    if len(en_vuelo) >= procesos * BLOQUES_POR_PROCESO:
+                        escribir(archivo, en_vuelo.popleft().result())
+                while en_vuelo:
+                    escribir(archivo, en_vuelo.popleft().result())
+
+    segundos = time.perf_counter() - inicio
+    resumen["segundos"] = segundos
+    resumen["mb_por_segundo"] = (
+        resumen["bytes_sin_comprimir"] / 1e6 / segundos if segundos else 0.0
+    )
+    return resumen
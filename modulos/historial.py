@@ -0,0 +1,187 @@
+# Archivo: modulos/historial.py
+# Historial de acciones como eventos con tipo (acción, documento, fecha y
+# cambios antes/después). En memoria se guardan solo los últimos, en un
+# buffer circular; los que salen de él pasan a un registro de auditoría en
+# disco que rota por tamaño.
+
+from __future__ import annotations
+
+import json
+import os
+import time
+from collections import deque
+from collections.abc import Callable
+from contextlib import nullcontext
+from itertools import chain, islice
+from pathlib import Path
+from typing import NamedTuple
+
+# Eventos que se conservan en memoria
+CAPACIDAD_HISTORIAL = 1_000
+
+# Eventos desalojados que se juntan antes de escribirlos en disco
+LOTE_VOLCADO = 256
+
+# Tamaño a partir del cual se rota el registro de auditoría, y cuántos
+# archivos rotados (.1, .2, ...) se conservan
+TAMANO_MAXIMO_AUDITORIA = 1 << 20
+ARCHIVOS_AUDITORIA = 5
+
+
+class Evento(NamedTuple):
+    fecha: float     # segundos desde la época (time.time())
+    accion: str      # CHECK-IN, UPDATE o DELETE
+    documento: str
+    cambios: dict    # campo -> [antes, después]; None si no había valor
+
+    def __str__(self) -> str:
+        momento = time.strftime("%d-%m-%Y %H:%M:%S", time.localtime(self.fecha))
+        detalle = ", ".join(
+            f"{campo}: {antes!r} -> {despues!r}"
+            for campo, (antes, despues) in self.cambios.items()
+        )
+        return f"[{momento}] {self.accion}: {self.documento}" + (
+            f" ({detalle})" if detalle else ""
+        )
+
+
+def diferencias(antes: dict | None, despues: dict | None) -> dict:
+    # Campos que cambiaron entre dos versiones de un pasajero (None = no existía)
+    antes = antes or {}
+    despues = despues or {}
+    cambios = {}
+    for campo in dict.fromkeys(chain(antes, despues)):
+        anterior, nuevo = antes.get(campo), despues.get(campo)
+        if anterior != nuevo:
+            cambios[campo] = [anterior, nuevo]
+    return cambios
+
+
+def ruta_auditoria(ruta_csv: Path) -> Path:
+    # El registro de auditoría vive junto al CSV: datos_prueba.auditoria
+    return ruta_csv.with_suffix(".auditoria")
+
+
+def _rotar(ruta: Path, archivos: int) -> None:
+    # ruta -> ruta.1 -> ruta.2 ...; el más antiguo se descarta
+    for numero in range(archivos, 0, -1):
+        origen = ruta if numero == 1 else ruta.with_name(f"{ruta.name}.{numero - 1}")
+        if origen.exists():
+            os.replace(origen, ruta.with_name(f"{ruta.name}.{numero}"))
+
+
+def _leer_al_reves(ruta: Path):
+    # Eventos de un archivo de auditoría, del más nuevo al más viejo. El
+    # archivo se anexa sin fsync: tras una caída la última línea puede quedar
+    # a medias (incluso cortando un carácter UTF-8) y se salta.
+    try:
+        lineas = ruta.read_text(encoding="utf-8", errors="replace").splitlines()
+    except FileNotFoundError:
+        return
+    for linea in reversed(lineas):
+        if not linea:
+            continue
+        try:
+            evento = Evento(**json.loads(linea))
+        except (json.JSONDecodeError, TypeError):
+            continue
+        yield evento
+
+
+class Historial:
+    # Buffer circular de eventos con volcado a disco. `ruta` es una función que
+    # devuelve el archivo de auditoría (o None para no guardar nada en disco) y
+    # `bloqueo` protege la escritura y rotación frente a otras terminales.
+
+    def __init__(
+        self,
+        ruta: Callable[[], Path | None] = lambda: None,
+        bloqueo=None,
+        capacidad: int = CAPACIDAD_HISTORIAL,
+        tamano_maximo: int = TAMANO_MAXIMO_AUDITORIA,
+        archivos: int = ARCHIVOS_AUDITORIA
+    ) -> None:
+        self._ruta = ruta
+        self._bloqueo = bloqueo
+        self._eventos = deque(maxlen=capacidad)
+        self._por_volcar = []   # desalojados de memoria, aún no escritos
+        self.tamano_maximo = tamano_maximo
+        self.archivos = archivos
+
+    def __len__(self) -> int:
+        return len(self._eventos)
+
+    def __iter__(self):
+        # Eventos en memoria, del más viejo al más nuevo
+        return iter(self._eventos)
+
+    def registrar(
+        self,
+        accion: str,
+        documento: str,
+        antes: dict | None = None,
+        despues: dict | None = None
+    ) -> Evento:
+        evento = Evento(time.time(), accion, documento, diferencias(antes, despues))
+        if len(self._eventos) == self._eventos.maxlen:
+            self._por_volcar.append(self._eventos[0])
+            if len(self._por_volcar) >= LOTE_VOLCADO:
+                self.volcar()
+        self._eventos.append(evento)
+        return evento
+
+    def volcar(self, todo: bool = False) -> None:
+        # Escribe en disco los eventos desalojados (con todo=True, también los
+        # que están en memoria, p. ej. al salir del programa)
+        eventos = self._por_volcar
+        if todo:
+            eventos = eventos + list(self._eventos)
+        ruta = self._ruta()
+        if ruta is None:
+            self._por_volcar = []  # sin archivo de auditoría lo desalojado se pierde
+            return
+        if not eventos:
+            return
+
+        datos = "".join(
+            json.dumps(evento._asdict(), ensure_ascii=False) + "\n" for evento in eventos
+        ).encode("utf-8")
+        with self._bloqueo or nullcontext():
+            try:
+                if ruta.stat().st_size >= self.tamano_maximo:
+                    _rotar(ruta, self.archivos)
+            except FileNotFoundError:
+                pass
+            with ruta.open("ab+") as archivo:
+                # Si una caída dejó la última línea a medias, el lote empieza
+                # en una línea nueva para no arrastrar su primer evento
+                if archivo.seek(0, os.SEEK_END):
+                    archivo.seek(-1, os.SEEK_END)
+                    if archivo.read(1) != b"\n":
+                        archivo.write(b"\n")
+                archivo.write(datos)
+        self._por_volcar = []
+        if todo:
+            self._eventos.clear()
+
+    def _en_disco(self):
+        # Eventos del registro de auditoría y sus rotaciones, del más nuevo
+        # al más viejo
+        ruta = self._ruta()
+        if ruta is None:
+            return
+        yield from _leer_al_reves(ruta)
+        for numero in range(1, self.archivos + 1):
+            yield from _leer_al_reves(ruta.with_name(f"{ruta.name}.{numero}"))
+
+    def recientes(self):
+        # Todos los eventos, del más nuevo al más viejo: memoria y luego disco
+        return chain(reversed(self._eventos), reversed(self._por_volcar), self._en_disco())
+
+    def pagina(self, numero: int = 1, tamano: int = 20) -> tuple:
+        # (eventos, quedan_mas) de la página `numero` (desde 1), del más nuevo
+        # al más viejo. Solo se lee del disco si la página va más allá de la
+        # memoria.
+        desde = (numero - 1) * tamano
+        eventos = list(islice(self.recientes(), desde, desde + tamano + 1))
+        return eventos[:tamano], len(eventos) > tamano
@@ -0,0 +1,156 @@
+# Archivo: modulos/importacion.py
+# Importación masiva de pasajeros desde CSV (p. ej. exportaciones de auditoría
+# nocturna): se procesa por lotes, se valida cada lote completo y las filas
+# rechazadas se escriben en un archivo aparte con el motivo.
+
+from __future__ import annotations
+
+import csv
+import time
+from contextlib import nullcontext
+from itertools import islice
+from pathlib import Path
+
+from modulos.documentos import normalizar_documento
+from modulos.operaciones import (
+    CAMPOS_CSV,
+    buscar_por_documento,
+    compactar_journal,
+    registrar_pasajero,
+    sincronizar_desde_csv,
+)
+from modulos.validaciones import es_entero_positivo, fecha_a_ordinal
+
+TAMANO_LOTE = 10_000
+
+CAMPOS_RECHAZOS = CAMPOS_CSV + ("motivo",)
+
+
+def _validar_lote(filas: list) -> tuple:
+    # Valida columna por columna todo el lote.
+    # Devuelve (registros normalizados o None, motivos por fila).
+    motivos = [None] * len(filas)
+
+    documentos = [normalizar_documento(fila.get("documento") or "") for fila in filas]
+    habitaciones = [(fila.get("habitacion") or "").strip() for fila in filas]
+    ingresos = [fecha_a_ordinal((fila.get("fecha_ingreso") or "").strip()) for fila in filas]
+    salidas = [fecha_a_ordinal((fila.get("fecha_salida") or "").strip()) for fila in filas]
+
+    for posicion, fila in enumerate(filas):
+        if documentos[posicion] is None:
+            motivos[posicion] = "documento inválido"
+        elif not (fila.get("nombre") or "").strip():
+            motivos[posicion] = "nombre vacío"
+        elif not es_entero_positivo(habitaciones[posicion]):
+            motivos[posicion] = "habitación inválida"
+        elif ingresos[posicion] is None or salidas[posicion] is None:
+            motivos[posicion] = "fecha inválida"
+        elif salidas[posicion] < ingresos[posicion]:
+            motivos[posicion] = "salida anterior al ingreso"
+
+    registros = []
+    for posicion, fila in enumerate(filas):
+        if motivos[posicion] is not None:
+            registros.append(None)
+            continue
+        registros.append({
+            "documento": documentos[posicion],
+            "nombre": fila["nombre"].strip(),
+            "nacionalidad": (fila.get("nacionalidad") or "").strip(),
+            "habitacion": int(habitaciones[posicion]),
+            "fecha_ingreso": fila["fecha_ingreso"].strip(),
+            "fecha_salida": fila["fecha_salida"].strip(),
+            "estado": (fila.get("estado") or "").strip(),
+        })
+    return registros, motivos
+
+
+def _marcar_duplicados(sistema: dict, registros: list, motivos: list) -> None:
+    # Marca los documentos que ya estaban registrados antes del lote. Los
+    # repetidos dentro del lote y los choques de habitación se resuelven al
+    # registrar fila por fila: gana la primera fila aceptada, igual que entre
+    # lotes, así el resultado no depende del tamaño del lote.
+    documentos = {r["documento"] for r in registros if r is not None}
+    if sistema.get("almacen") is not None:
+        documentos_repetidos = {
+            d for d in documentos if buscar_por_documento(sistema, d) is not None
+        }
+    else:
+        documentos_repetidos = documentos & sistema["pasajeros"].keys()
+    if not documentos_repetidos:
+        return
+
+    for posicion, registro in enumerate(registros):
+        if registro is not None and registro["documento"] in documentos_repetidos:
+            motivos[posicion] = "documento duplicado"
+            registros[posicion] = None
+
+
+def importar_pasajeros_masivo(
+    sistema: dict,
+    ruta: Path,
+    ruta_rechazos: Path | None = None,
+    tamano_lote: int = TAMANO_LOTE,
+    persistir: bool = True
+) -> dict:
+    # Importa un CSV grande por lotes de `tamano_lote` filas. Solo un lote vive
+    # en memoria a la vez. Devuelve un resumen con filas, aceptados,
+    # rechazados, segundos y filas_por_segundo.
+    # Con persistir=True se toma el cerrojo entre terminales durante toda la
+    # importación (como en una transacción): las filas se registran sin
+    # persistir una por una y se escriben con una sola compactación al
+    # final, así ninguna otra terminal puede escribir entremedio y obligar a
+    # recargar el CSV, lo que descartaría lo importado.
+    ruta_rechazos = ruta_rechazos or ruta.with_name(f"{ruta.stem}_rechazos.csv")
+    inicio = time.perf_counter()
+    filas_leidas = aceptados = rechazados = 0
+    bloqueo = sistema["persistencia"]["bloqueo"] if persistir else nullcontext()
+
+    with bloqueo, ruta.open(newline="", encoding="utf-8") as entrada, \
+            ruta_rechazos.open("w", newline="", encoding="utf-8") as salida:
+        if persistir:
+            # Lo que otras terminales escribieron antes de tomar el cerrojo
+            sincronizar_desde_csv(sistema)
+        lector = csv.DictReader(entrada)
+        escritor_rechazos = csv.DictWriter(
+            salida, fieldnames=CAMPOS_RECHAZOS, extrasaction="ignore"
+        )
+        escritor_rechazos.writeheader()
+
+        while True:
+            filas = list(islice(lector, tamano_lote))
+            if not filas:
+                break
+            filas_leidas += len(filas)
+
+            registros, motivos = _validar_lote(filas)
+            _marcar_duplicados(sistema, registros, motivos)
+
+            aceptados_lote = set()
+            for fila, registro, motivo in zip(filas, registros, motivos):
+                if registro is not None and registro["documento"] in aceptados_lote:
+                    motivo = "documento duplicado"
+                elif registro is not None and registrar_pasajero(
+                    sistema, registro, persistir=False
+                ):
+                    aceptados_lote.add(registro["documento"])
+                    aceptados += 1
+                    continue
+                rechazados += 1
+                escritor_rechazos.writerow(
+                    dict(fila, motivo=motivo or "habitación ocupada")
+                )
+
+        if persistir and aceptados:
+            # Una sola reescritura del snapshot en vez de una por fila
+            compactar_journal(sistema)
+
+    segundos = time.perf_counter() - inicio
+    return {
+        "filas": filas_leidas,
+        "aceptados": aceptados,
+        "rechazados": rechazados,
+        "ruta_rechazos": ruta_rechazos,
+        "segundos": segundos,
+        "filas_por_segundo": filas_leidas / segundos if segundos else 0.0,
+    }
@@ -0,0 +1,76 @@
+# Archivo: modulos/indices.py
+# Índices secundarios sobre los pasajeros: se actualizan en O(1) con cada
+# registro, actualización o eliminación y permiten búsquedas sin recorrer todo.
+
+from __future__ import annotations
+
+# Campos con índice de conjunto: valor -> {documentos}
+CAMPOS_INDEXADOS = (
+    "estado",
+    "nacionalidad",
+    "fecha_ingreso",
+    "fecha_salida",
+)
+
+
+def crear_indices() -> dict:
+    # Estructura vacía de índices
+    indices = {"habitacion": {}}  # dict: habitación -> set de documentos
+    for campo in CAMPOS_INDEXADOS:
+        indices[campo] = {}       # dict: valor -> set de documentos
+    return indices
+
+
+def _agregar(indice: dict, clave, documento: str) -> None:
+    # Agrega un documento al grupo de la clave
+    grupo = indice.get(clave)
+    if grupo is None:
+        indice[clave] = {documento}
+    else:
+        grupo.add(documento)
+
+
+def _quitar(indice: dict, clave, documento: str) -> None:
+    # Quita un documento de su grupo y borra el grupo si queda vacío
+    grupo = indice.get(clave)
+    if grupo is None:
+        return
+    grupo.discard(documento)
+    if not grupo:
+        del indice[clave]
+
+
+def indexar(indices: dict, pasajero: dict) -> None:
+    # Agrega un pasajero a todos los índices
+    documento = pasajero.get("documento")
+    _agregar(indices["habitacion"], pasajero.get("habitacion"), documento)
+    for campo in CAMPOS_INDEXADOS:
+        _agregar(indices[campo], pasajero.get(campo), documento)
+
+
+def desindexar(indices: dict, pasajero: dict) -> None:
+    # Quita un pasajero de todos los índices
+    documento = pasajero.get("documento")
+    _quitar(indices["habitacion"], pasajero.get("habitacion"), documento)
+    for campo in CAMPOS_INDEXADOS:
+        _quitar(indices[campo], pasajero.get(campo), documento)
+
+
+def reconstruir(indices: dict, pasajeros) -> None:
+    # Reconstruye todos los índices de una vez a partir de los pasajeros
+    for indice in indices.values():
+        indice.clear()
+    for pasajero in pasajeros:
+        indexar(indices, pasajero)
+
+
+def documentos_en_habitacion(indices: dict, habitacion: int) -> set:
+    # Documentos con estadía (actual o futura) en la habitación (O(1))
+    return indices["habitacion"].get(habitacion, set())
+
+
+def documentos_con(indices: dict, campo: str, valor) -> set:
+    # Documentos cuyo campo indexado tiene el valor dado (copia del grupo)
+    if campo not in CAMPOS_INDEXADOS:
+        raise ValueError(f"Campo sin índice: {campo}")
+    return set(indices[campo].get(valor, ()))
@@ -0,0 +1,114 @@
+# Archivo: modulos/listados.py
+# Piezas del listado paginado de pasajeros: claves de orden ya calculadas
+# sobre los atributos compactos (ordinales, textos internados), filtros y
+# cursores opacos para pedir "la página que sigue" de forma estable.
+
+from __future__ import annotations
+
+import base64
+import json
+
+# Campo de orden -> atributo del Pasajero (las fechas se ordenan por ordinal)
+CAMPOS_ORDEN = {
+    "documento": "documento",
+    "nombre": "nombre",
+    "nacionalidad": "nacionalidad",
+    "habitacion": "habitacion",
+    "fecha_ingreso": "ingreso",
+    "fecha_salida": "salida",
+    "estado": "estado",
+}
+
+# Filtros aceptados por el listado
+FILTROS = (
+    "estado",
+    "nacionalidad",
+    "habitacion_desde",
+    "habitacion_hasta",
+    "fecha_desde",
+    "fecha_hasta",
+)
+
+
+def valor_ordenable(valor) -> tuple:
+    # Mismo orden que SQLite entre tipos: vacío < número < texto
+    if valor is None:
+        return (0, 0)
+    if type(valor) is int:
+        return (1, valor)
+    return (2, valor)
+
+
+def clave_orden(campo: str):
+    # Función clave (valor del campo, documento): el documento desempata, así
+    # el orden es total y estable entre páginas
+    if campo not in CAMPOS_ORDEN:
+        raise ValueError(f"Campo de orden desconocido: {campo}")
+    atributo = CAMPOS_ORDEN[campo]
+
+    if atributo == "documento":
+        return lambda p: (valor_ordenable(p.documento), p.documento)
+    if atributo == "nombre":
+        # Sin distinguir mayúsculas (casefold), igual que el almacén SQLite
+        return lambda p: (
+            valor_ordenable(p.nombre.casefold() if p.nombre else p.nombre),
+            p.documento,
+        )
+    return lambda p: (valor_ordenable(getattr(p, atributo)), p.documento)
+
+
+def crear_filtro(
+    estado: str | None = None,
+    nacionalidad: str | None = None,
+    habitacion_desde: int | None = None,
+    habitacion_hasta: int | None = None,
+    fecha_desde: int | None = None,
+    fecha_hasta: int | None = None
+):
+    # Predicado sobre un Pasajero (fechas como ordinales) o None si no hay
+    # filtros. El rango de fechas incluye a quien esté alojado algún día de
+    # [fecha_desde, fecha_hasta].
+    condiciones = []
+    if estado is not None:
+        condiciones.append(lambda p: p.estado == estado)
+    if nacionalidad is not None:
+        condiciones.append(lambda p: p.nacionalidad == nacionalidad)
+    if habitacion_desde is not None:
+        condiciones.append(
+            lambda p: type(p.habitacion) is int and p.habitacion >= habitacion_desde
+        )
+    if habitacion_hasta is not None:
+        condiciones.append(
+            lambda p: type(p.habitacion) is int and p.habitacion <= habitacion_hasta
+        )
+    if fecha_desde is not None or fecha_hasta is not None:
+        desde = fecha_desde if fecha_desde is not None else float("-inf")
+        hasta = fecha_hasta if fecha_hasta is not None else float("inf")
+        condiciones.append(
+            lambda p: type(p.ingreso) is int
+            and type(p.salida) is int
+            and p.ingreso <= hasta
+            and max(p.salida, p.ingreso + 1) > desde
+        )
+
+    if not condiciones:
+        return None
+    if len(condiciones) == 1:
+        return condiciones[0]
+    return lambda p: all(condicion(p) for condicion in condiciones)
+
+
+def codificar_cursor(clave: tuple) -> str:
+    # Cursor opaco (apto para URLs) a partir de la clave de la última fila
+    (grupo, valor), documento = clave
+    datos = json.dumps([grupo, valor, documento], ensure_ascii=False)
+    return base64.urlsafe_b64encode(datos.encode("utf-8")).decode("ascii")
+
+
+def decodificar_cursor(cursor: str) -> tuple:
+    # Inverso de codificar_cursor; ValueError si el cursor no es válido
+    try:
+        grupo, valor, documento = json.loads(base64.urlsafe_b64decode(cursor))
+    except (TypeError, ValueError) as error:
+        raise ValueError(f"Cursor inválido: {cursor}") from error
+    return ((grupo, valor), documento)
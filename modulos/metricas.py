@@ -0,0 +1,195 @@
+# Archivo: modulos/metricas.py
+# Instrumentación opcional: histogramas de latencia y cantidad de llamadas
+# por operación, más contadores (bytes leídos/escritos, filas parseadas).
+# Se activa con HOTEL_METRICAS=1 o activar_metricas(); desactivada, cada
+# función medida solo paga una comparación. Con HOTEL_PERFIL=cprofile,
+# tracemalloc o ambos, la sesión completa se perfila y se escriben informes.
+
+from __future__ import annotations
+
+import cProfile
+import functools
+import io
+import os
+import pstats
+import time
+import tracemalloc
+from bisect import bisect_left
+from contextlib import contextmanager
+from pathlib import Path
+
+# Límites superiores (segundos) de los tramos del histograma de latencias
+TRAMOS_LATENCIA = (
+    0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01,
+    0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0,
+)
+
+# Prefijo de los nombres de métricas en el volcado tipo Prometheus
+PREFIJO = "hotel"
+
+# Líneas de los informes de perfilado
+LINEAS_PERFIL = 40
+
+_estado = {
+    "activas": os.environ.get("HOTEL_METRICAS", "") not in ("", "0"),
+    "latencias": {},   # operación -> [conteos por tramo..., suma, cantidad]
+    "contadores": {},  # nombre -> total
+}
+
+
+def activar_metricas(activas: bool = True) -> None:
+    _estado["activas"] = activas
+
+
+def metricas_activas() -> bool:
+    return _estado["activas"]
+
+
+def reiniciar_metricas() -> None:
+    _estado["latencias"].clear()
+    _estado["contadores"].clear()
+
+
+def observar(operacion: str, segundos: float) -> None:
+    # Suma una medición al histograma de la operación
+    datos = _estado["latencias"].get(operacion)
+    if datos is None:
+        datos = _estado["latencias"][operacion] = [0] * (len(TRAMOS_LATENCIA) + 3)
+    datos[bisect_left(TRAMOS_LATENCIA, segundos)] += 1
+    datos[-2] += segundos
+    datos[-1] += 1
+
+
+def contar(nombre: str, cantidad: int = 1) -> None:
+    # Suma al contador `nombre` (p. ej. "bytes_leidos") si las métricas están activas
+    if _estado["activas"]:
+        contadores = _estado["contadores"]
+        contadores[nombre] = contadores.get(nombre, 0) + cantidad
+
+
+def medido(funcion):
+    # Decorador: registra la latencia de cada llamada con el nombre de la función
+    nombre = funcion.__name__
+
+    @functools.wraps(funcion)
+    def envoltura(*args, **kwargs):
+        if not _estado["activas"]:
+            return funcion(*args, **kwargs)
+        inicio = time.perf_counter()
+        try:
+            return funcion(*args, **kwargs)
+        finally:
+            observar(nombre, time.perf_counter() - inicio)
+
+    return envoltura
+
+
+@contextmanager
+def medir(operacion: str):
+    # Igual que @medido, para un tramo de código
+    if not _estado["activas"]:
+        yield
+        return
+    inicio = time.perf_counter()
+    try:
+        yield
+    finally:
+        observar(operacion, time.perf_counter() - inicio)
+
+
+def percentil(operacion: str, fraccion: float) -> float | None:
+    # Cota superior del percentil según los tramos (None si no hay datos)
+    datos = _estado["latencias"].get(operacion)
+    if not datos or not datos[-1]:
+        return None
+    objetivo = fraccion * datos[-1]
+    acumulado = 0
+    for tramo, cantidad in zip(TRAMOS_LATENCIA + (float("inf"),), datos):
+        acumulado += cantidad
+        if acumulado >= objetivo:
+            return tramo
+    return float("inf")
+
+
+def texto_prometheus() -> str:
+    # Volcado en el formato de texto de Prometheus
+    lineas = [
+        f"# HELP {PREFIJO}_operacion_segundos Latencia de las operaciones del sistema",
+        f"# TYPE {PREFIJO}_operacion_segundos histogram",
+    ]
+    for operacion, datos in sorted(_estado["latencias"].items()):
+        acumulado = 0
+        for tramo, cantidad in zip(TRAMOS_LATENCIA + (float("inf"),), datos):
+            acumulado += cantidad
+            limite = "+Inf" if tramo == float("inf") else repr(tramo)
+            lineas.append(
+                f'{PREFIJO}_operacion_segundos_bucket{{operacion="{operacion}",'
+                f'le="{limite}"}} {acumulado}'
+            )
+        lineas.append(
+            f'{PREFIJO}_operacion_segundos_sum{{operacion="{operacion}"}} {datos[-2]:.6f}'
+        )
+        lineas.append(
+            f'{PREFIJO}_operacion_segundos_count{{operacion="{operacion}"}} {datos[-1]}'
+        )
+    for nombre, total in sorted(_estado["contadores"].items()):
+        lineas.append(f"# TYPE {PREFIJO}_{nombre}_total counter")
+        lineas.append(f"{PREFIJO}_{nombre}_total {total}")
+    return "\n".join(lineas) + "\n"
+
+
+def resumen() -> list:
+    # Filas (operación, llamadas, promedio ms, p50 ms, p95 ms) para mostrar
+    filas = []
+    for operacion, datos in sorted(_estado["latencias"].items()):
+        llamadas, total = datos[-1], datos[-2]
+        filas.append((
+            operacion,
+            llamadas,
+            total / llamadas * 1000,
+            percentil(operacion, 0.5) * 1000,
+            percentil(operacion, 0.95) * 1000,
+        ))
+    return filas
+
+
+def contadores() -> dict:
+    return dict(_estado["contadores"])
+
+
+@contextmanager
+def sesion_perfilada(modo: str | None = None, directorio: Path | None = None):
+    # Perfila lo que se ejecute dentro según HOTEL_PERFIL ("cprofile",
+    # "tracemalloc" o "ambos") y al terminar escribe los informes en
+    # HOTEL_PERFIL_DIR (o el directorio actual). Sin modo no hace nada.
+    modo = modo if modo is not None else os.environ.get("HOTEL_PERFIL", "")
+    if not modo:
+        yield
+        return
+    if modo not in ("cprofile", "tracemalloc", "ambos"):
+        raise ValueError(f"HOTEL_PERFIL desconocido: {modo}")
+    directorio = Path(directorio or os.environ.get("HOTEL_PERFIL_DIR", "."))
+
+    perfil = cProfile.Profile() if modo in ("cprofile", "ambos") else None
+    memoria = modo in ("tracemalloc", "ambos")
+    if memoria:
+        tracemalloc.start(25)
+    if perfil is not None:
+        perfil.enable()
+    try:
+        yield
+    finally:
+        if perfil is not None:
+            perfil.disable()
+            perfil.dump_stats(directorio / "perfil.prof")
+            texto = io.StringIO()
+            estadisticas = pstats.Stats(perfil, stream=texto)
+            estadisticas.sort_stats("cumulative").print_stats(LINEAS_PERFIL)
+            (directorio / "perfil.txt").write_text(texto.getvalue(), encoding="utf-8")
+        if memoria:
+            foto = tracemalloc.take_snapshot()
+            actual, pico = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+            lineas = [f"Memoria actual: {actual:,} bytes, pico: {pico:,} bytes", ""]
+            lineas += [str(linea) for linea in foto.statistics("lineno")[:LINEAS_PERFIL]]
+            (directorio / "memoria.txt").write_text("\n".join(lineas) + "\n", encoding="utf-8")
@@ -0,0 +1,244 @@
+# Archivo: modulos/nombres.py
+# Búsqueda de pasajeros por nombre: sin distinguir mayúsculas ni tildes, por
+# prefijo (mientras se escribe) y aproximada por trigramas (errores de tipeo).
+# El índice trabaja sobre nombres distintos, no sobre pasajeros: los nombres
+# repetidos comparten una sola entrada.
+
+from __future__ import annotations
+
+import math
+import unicodedata
+from bisect import bisect_left, insort
+from collections import Counter, defaultdict
+
+from modulos.cache import cache_lru
+
+# Nombres distintos que se recuerdan ya normalizados
+TAMANO_CACHE_NOMBRES = 65_536
+
+# Similitud mínima (trigramas en común / trigramas en total) para sugerir
+UMBRAL_SIMILITUD = 0.3
+
+# Entradas de listas de trigramas que se cuentan como máximo por búsqueda
+# aproximada, y nombres que luego se comparan uno a uno
+PRESUPUESTO_TRIGRAMAS = 10_000
+MAXIMO_CANDIDATOS = 200
+
+# Hasta cuántas altas pendientes se insertan una a una en el arreglo ordenado;
+# con más (p. ej. al cargar el CSV) conviene reordenar todo de una vez
+MAXIMO_INSERCIONES = 64
+
+
+@cache_lru(TAMANO_CACHE_NOMBRES)
+def normalizar_nombre(nombre: str) -> str:
+    # "  José  PÉREZ " -> "jose perez": sin tildes, en minúsculas y con un
+    # solo espacio entre palabras
+    if nombre.isascii():
+        return " ".join(nombre.casefold().split())
+    descompuesto = unicodedata.normalize("NFKD", nombre)
+    sin_tildes = "".join(c for c in descompuesto if not unicodedata.combining(c))
+    return " ".join(sin_tildes.casefold().split())
+
+
+def trigramas(normalizado: str) -> set:
+    # Trigramas del nombre con un espacio de borde: "ana" -> {" an", "ana", "na "}
+    texto = f" {normalizado} "
+    return {texto[i:i + 3] for i in range(len(texto) - 2)}
+
+
+def _sufijos(normalizado: str) -> list:
+    # "juan perez soto" -> ["juan perez soto", "perez soto", "soto"], para que
+    # el prefijo calce con cualquier palabra (nombre o apellido)
+    palabras = normalizado.split(" ")
+    return [" ".join(palabras[i:]) for i in range(len(palabras))]
+
+
+def _insertar_ordenado(arreglo: list, altas: list) -> None:
+    # Inserta las altas en el arreglo ordenado: una a una si son pocas o
+    # reordenando todo de una vez (p. ej. al cargar el CSV)
+    if not altas:
+        return
+    if len(altas) <= MAXIMO_INSERCIONES:
+        for entrada in altas:
+            insort(arreglo, entrada)
+    else:
+        arreglo.extend(altas)
+        arreglo.sort()
+    altas.clear()
+
+
+def _borrar_ordenado(arreglo: list, entrada) -> None:
+    posicion = bisect_left(arreglo, entrada)
+    if posicion < len(arreglo) and arreglo[posicion] == entrada:
+        del arreglo[posicion]
+
+
+def similitud(consulta: set, nombre: set) -> float:
+    # Coeficiente de Jaccard entre dos conjuntos de trigramas
+    if not consulta or not nombre:
+        return 0.0
+    comunes = len(consulta & nombre)
+    return comunes / (len(consulta) + len(nombre) - comunes)
+
+
+class IndiceNombres:
+    # documentos: nombre normalizado -> {documentos}
+    # trigramas: trigrama -> {nombres normalizados}
+    # nombres: arreglo ordenado de nombres normalizados (prefijo del nombre)
+    # prefijos: arreglo ordenado de (sufijo desde la segunda palabra, nombre
+    # normalizado), para el prefijo de un apellido
+    # Los nombres se normalizan y sus trigramas se indexan al agregarlos, así
+    # la primera búsqueda aproximada no paga por todo el índice. Solo la
+    # inserción en los arreglos ordenados se junta hasta la próxima búsqueda.
+
+    def __init__(self) -> None:
+        self.documentos = {}
+        self.trigramas = defaultdict(set)
+        self.nombres = []
+        self.prefijos = []
+        self._altas_nombres = []   # nombres aún no insertados en `nombres`
+        self._altas = []           # (sufijo, nombre) aún no insertados en `prefijos`
+
+    def __len__(self) -> int:
+        return len(self.documentos)
+
+    def agregar(self, documento: str, nombre) -> None:
+        # Un nombre que no es texto (p. ej. un número) se indexa como texto
+        if not nombre:
+            return
+        normalizado = normalizar_nombre(nombre if type(nombre) is str else str(nombre))
+        grupo = self.documentos.get(normalizado)
+        if grupo is not None:
+            grupo.add(documento)
+            return
+
+        self.documentos[normalizado] = {documento}
+        indice = self.trigramas
+        for trigrama in trigramas(normalizado):
+            indice[trigrama].add(normalizado)
+        self._altas_nombres.append(normalizado)
+        self._altas.extend((sufijo, normalizado) for sufijo in _sufijos(normalizado)[1:])
+
+    def quitar(self, documento: str, nombre) -> None:
+        if not nombre:
+            return
+        normalizado = normalizar_nombre(nombre if type(nombre) is str else str(nombre))
+        grupo = self.documentos.get(normalizado)
+        if grupo is None:
+            return
+        grupo.discard(documento)
+        if grupo:
+            return
+
+        # Era el último pasajero con ese nombre: se borra el nombre del índice
+        del self.documentos[normalizado]
+        for trigrama in trigramas(normalizado):
+            nombres = self.trigramas.get(trigrama)
+            if nombres is not None:
+                nombres.discard(normalizado)
+                if not nombres:
+                    del self.trigramas[trigrama]
+        self._ordenar_altas()
+        _borrar_ordenado(self.nombres, normalizado)
+        for sufijo in _sufijos(normalizado)[1:]:
+            _borrar_ordenado(self.prefijos, (sufijo, normalizado))
+
+    def limpiar(self) -> None:
+        self.documentos.clear()
+        self.trigramas.clear()
+        self.nombres.clear()
+        self.prefijos.clear()
+        self._altas_nombres.clear()
+        self._altas.clear()
+
+    def _ordenar_altas(self) -> None:
+        # Incorpora las altas pendientes a los arreglos ordenados
+        _insertar_ordenado(self.nombres, self._altas_nombres)
+        _insertar_ordenado(self.prefijos, self._altas)
+
+    def por_prefijo(self, consulta: str, limite: int) -> list:
+        # Hasta `limite` nombres normalizados con alguna palabra que empieza
+        # por la consulta, ya ordenados por relevancia: [(puntaje, nombre)].
+        # Primero el nombre exacto y los que empiezan por la consulta (en
+        # orden alfabético) y solo si faltan, los que la tienen en otra palabra.
+        self._ordenar_altas()
+        encontrados = {}
+        posicion = bisect_left(self.nombres, consulta)
+        while posicion < len(self.nombres) and len(encontrados) < limite:
+            normalizado = self.nombres[posicion]
+            if not normalizado.startswith(consulta):
+                break
+            encontrados[normalizado] = 3.0 if normalizado == consulta else 2.0
+            posicion += 1
+
+        posicion = bisect_left(self.prefijos, (consulta,))
+        while posicion < len(self.prefijos) and len(encontrados) < limite:
+            sufijo, normalizado = self.prefijos[posicion]
+            if not sufijo.startswith(consulta):
+                break
+            encontrados.setdefault(normalizado, 1.5)
+            posicion += 1
+        return [(puntaje, normalizado) for normalizado, puntaje in encontrados.items()]
+
+    def aproximados(self, consulta: str) -> list:
+        # Nombres con similitud de trigramas >= UMBRAL_SIMILITUD. Se cuentan
+        # los trigramas en común empezando por los más raros de la consulta
+        # (si un nombre comparte suficientes trigramas, comparte al menos uno
+        # de los más raros) y solo los mejores candidatos se comparan enteros.
+        buscados = trigramas(consulta)
+        listas = sorted((self.trigramas.get(t, ()) for t in buscados), key=len)
+        # Con similitud >= UMBRAL_SIMILITUD se comparten al menos `necesarios`
+        # trigramas de la consulta
+        necesarios = max(1, math.ceil(UMBRAL_SIMILITUD * len(buscados)))
+
+        conteo = Counter()
+        contadas = revisados = 0
+        for nombres in listas[:len(listas) - necesarios + 1]:
+            if revisados and revisados + len(nombres) > PRESUPUESTO_TRIGRAMAS:
+                break
+            conteo.update(nombres)
+            contadas += 1
+            revisados += len(nombres)
+        # Los trigramas no contados pueden aportar a lo sumo uno cada uno
+        minimo = max(1, necesarios - (len(listas) - contadas))
+        # Los que más trigramas comparten, agrupados por cantidad
+        grupos = defaultdict(list)
+        for normalizado, veces in conteo.items():
+            if veces >= minimo:
+                grupos[veces].append(normalizado)
+        candidatos = []
+        for veces in sorted(grupos, reverse=True):
+            candidatos += grupos[veces]
+            if len(candidatos) >= MAXIMO_CANDIDATOS:
+                del candidatos[MAXIMO_CANDIDATOS:]
+                break
+
+        resultado = []
+        for normalizado in candidatos:
+            puntaje = similitud(buscados, trigramas(normalizado))
+            if puntaje >= UMBRAL_SIMILITUD:
+                resultado.append((puntaje, normalizado))
+        return resultado
+
+    def buscar(self, consulta: str, limite: int = 10) -> list:
+        # Documentos ordenados por relevancia: nombre exacto, luego prefijo y
+        # después parecido. Devuelve [(puntaje, nombre normalizado, documento)].
+        normalizada = normalizar_nombre(consulta)
+        if not normalizada:
+            return []
+
+        puntajes = {
+            normalizado: puntaje for puntaje, normalizado in self.por_prefijo(normalizada, limite)
+        }
+        if len(puntajes) < limite:
+            for puntaje, normalizado in self.aproximados(normalizada):
+                puntajes.setdefault(normalizado, puntaje)
+
+        ranking = sorted(puntajes.items(), key=lambda par: (-par[1], par[0]))
+        resultado = []
+        for normalizado, puntaje in ranking:
+            for documento in sorted(self.documentos[normalizado]):
+                resultado.append((puntaje, normalizado, documento))
+                if len(resultado) == limite:
+                    return resultado
+        return resultado
@@ -4,8 +4,63 @@
 from __future__ import annotations
 
 import csv
+import hashlib
+import io
+import sys
+from collections.abc import Mapping, MutableMapping
+from contextlib import contextmanager
+from datetime import date
+from heapq import nlargest, nsmallest
+from operator import attrgetter
 from pathlib import Path
 
+from modulos.almacen_sqlite import AlmacenSQLite
+from modulos.columnar import AlmacenColumnar
+from modulos.disponibilidad import Disponibilidad
+from modulos.estadias import IndiceEstadias
+from modulos.historial import Historial, ruta_auditoria
+from modulos.indices import (
+    crear_indices,
+    desindexar,
+    documentos_con,
+    documentos_en_habitacion,
+    indexar,
+    reconstruir,
+)
+from modulos.listados import (
+    FILTROS,
+    clave_orden,
+    codificar_cursor,
+    crear_filtro,
+    decodificar_cursor,
+)
+from modulos.metricas import contar, medido, medir
+from modulos.nombres import IndiceNombres
+from modulos.persistencia import (
+    INTERVALO_ESCRITURA_MS,
+    UMBRAL_COMPACTACION,
+    BloqueoArchivo,
+    EscritorEnSegundoPlano,
+    anexar_registros,
+    escritura_atomica,
+    incrementar_generacion,
+    leer_generacion,
+    leer_registros,
+    ruta_bloqueo,
+    ruta_journal,
+    tamano_journal,
+    vaciar_journal,
+)
+from modulos.reportes import Agregados
+from modulos.snapshot import (
+    MINIMO_FILAS_SNAPSHOT,
+    escribir_snapshot,
+    leer_snapshot,
+    ruta_snapshot,
+)
+from modulos.validaciones import fecha_a_ordinal, ordinal_a_fecha
+from modulos.versiones import Versiones
+
 # Tupla con campos fijos del pasajero (datos inmutables)
 CAMPOS_PASAJERO = (
     "nombre",
@@ -28,6 +83,146 @@ CAMPOS_CSV = (
 )
 
 
+# Campos de texto repetidos entre pasajeros: se comparte una sola copia
+_CAMPOS_INTERNADOS = ("nacionalidad", "estado")
+
+
+def _fecha_compacta(valor):
+    # Guarda la fecha como número de día; si no es válida, conserva el texto
+    if isinstance(valor, str):
+        ordinal = fecha_a_ordinal(valor)
+        if ordinal is not None:
+            return ordinal
+    return valor
+
+
+class Pasajero(MutableMapping):
+    # Registro compacto de un pasajero. Usa __slots__ en vez de un dict por
+    # fila, comparte los textos repetidos y guarda las fechas como enteros,
+    # pero se sigue usando como diccionario: p["documento"], p.get(...), etc.
+
+    __slots__ = (
+        "nombre",
+        "documento",
+        "nacionalidad",
+        "habitacion",
+        "ingreso",   # fecha_ingreso como ordinal (o texto si no es válida)
+        "salida",    # fecha_salida como ordinal (o texto si no es válida)
+        "estado",
+    )
+
+    def __init__(self, datos: dict | None = None) -> None:
+        for atributo in self.__slots__:
+            setattr(self, atributo, None)
+        if datos:
+            for campo in CAMPOS_PASAJERO:
+                valor = datos.get(campo)
+                if valor is not None:
+                    self[campo] = valor
+
+    def __getitem__(self, campo: str):
+        if campo == "fecha_ingreso" or campo == "fecha_salida":
+            valor = self.ingreso if campo == "fecha_ingreso" else self.salida
+            if type(valor) is int:
+                return ordinal_a_fecha(valor)
+        elif campo in CAMPOS_PASAJERO:
+            valor = getattr(self, campo)
+        else:
+            raise KeyError(campo)
+
+        if valor is None:
+            raise KeyError(campo)
+        return valor
+
+    def __setitem__(self, campo: str, valor) -> None:
+        if campo == "fecha_ingreso":
+            self.ingreso = _fecha_compacta(valor)
+        elif campo == "fecha_salida":
+            self.salida = _fecha_compacta(valor)
+        elif campo in CAMPOS_PASAJERO:
+            if campo in _CAMPOS_INTERNADOS and type(valor) is str:
+                valor = sys.intern(valor)
+            setattr(self, campo, valor)
+        else:
+            raise KeyError(campo)
+
+    def __delitem__(self, campo: str) -> None:
+        self[campo]  # KeyError si no existe
+        self[campo] = None
+
+    def __iter__(self):
+        for campo in CAMPOS_PASAJERO:
+            if campo in self:
+                yield campo
+
+    def __len__(self) -> int:
+        return sum(1 for _ in self)
+
+    def __contains__(self, campo) -> bool:
+        try:
+            self[campo]
+        except KeyError:
+            return False
+        return True
+
+    def get(self, campo: str, defecto=None):
+        try:
+            return self[campo]
+        except KeyError:
+            return defecto
+
+    def _valores(self) -> tuple:
+        return _VALORES_PASAJERO(self)
+
+    @classmethod
+    def _desde_valores(cls, valores: tuple) -> Pasajero:
+        # Inverso de _valores: arma el registro sin pasar por la validación de
+        # campos (p. ej. desde la caché binaria del CSV)
+        pasajero = cls.__new__(cls)
+        (
+            pasajero.nombre,
+            pasajero.documento,
+            nacionalidad,
+            pasajero.habitacion,
+            pasajero.ingreso,
+            pasajero.salida,
+            estado,
+        ) = valores
+        pasajero.nacionalidad = nacionalidad if nacionalidad is None else sys.intern(nacionalidad)
+        pasajero.estado = estado if estado is None else sys.intern(estado)
+        return pasajero
+
+    def __eq__(self, otro) -> bool:
+        if isinstance(otro, Pasajero):
+            return self._valores() == otro._valores()
+        return super().__eq__(otro)
+
+    def __repr__(self) -> str:
+        return f"Pasajero({dict(self)!r})"
+
+
+# Tupla con todos los atributos de un Pasajero, en el orden de __slots__
+_VALORES_PASAJERO = attrgetter(*Pasajero.__slots__)
+
+
+# Estado de un pasajero que ocupa hoy su habitación
+ESTADO_ALOJADO = "Alojado"
+
+# Estado de quien ya dejó la habitación (aunque su estadía siga vigente)
+ESTADO_CHECK_OUT = "Check-out"
+
+# Acciones del historial; también identifican cada registro de la bitácora
+ACCION_REGISTRAR = "CHECK-IN"
+ACCION_ACTUALIZAR = "UPDATE"
+ACCION_ELIMINAR = "DELETE"
+
+# Bytes finales ya leídos que se comparan para detectar reescrituras del CSV
+BYTES_HUELLA = 4096
+
+# Conflictos sin informar que se conservan (los más antiguos se descartan)
+MAXIMO_CONFLICTOS = 1_000
+
+
 def _ruta_csv_por_defecto() -> Path:
     # Ruta del CSV de ejemplo dentro del proyecto
     return Path(__file__).resolve().parents[1] / "data" / "datos_prueba.csv"
@@ -56,110 +251,1140 @@ def _normalizar_registro(fila: dict) -> dict | None:
     return registro
 
 
+def _firma_archivo(ruta: Path) -> tuple | None:
+    # Huella barata del archivo: (mtime_ns, tamaño, inodo) o None si no existe
+    try:
+        info = ruta.stat()
+    except FileNotFoundError:
+        return None
+    return (info.st_mtime_ns, info.st_size, info.st_ino)
+
+
+def _huella_prefijo(ruta: Path, desplazamiento: int) -> bytes:
+    # Hash de los últimos bytes ya leídos, para detectar si el prefijo cambió
+    inicio = max(0, desplazamiento - BYTES_HUELLA)
+    with ruta.open("rb") as archivo:
+        archivo.seek(inicio)
+        bloque = archivo.read(desplazamiento - inicio)
+    return hashlib.blake2b(bloque, digest_size=16).digest()
+
+
+def _hash_archivo(ruta: Path) -> str:
+    # Hash del contenido completo (opcional, solo si se pide verificar)
+    hasher = hashlib.blake2b(digest_size=16)
+    with ruta.open("rb") as archivo:
+        for bloque in iter(lambda: archivo.read(1 << 20), b""):
+            hasher.update(bloque)
+    return hasher.hexdigest()
+
+
+def _leer_filas_csv(
+    sistema: dict,
+    ruta: Path,
+    desplazamiento: int = 0,
+    encabezado: list | None = None
+) -> tuple:
+    # Lee filas desde un desplazamiento en bytes y las registra en memoria.
+    # Devuelve (agregados, bytes_consumidos, encabezado, termina_en_salto).
+    agregados = filas = 0
+    with ruta.open("rb") as binario:
+        binario.seek(desplazamiento)
+        if desplazamiento == 0:
+            texto = io.TextIOWrapper(binario, encoding="utf-8", newline="")
+            lector = csv.DictReader(texto)
+            for fila in lector:
+                filas += 1
+                registro = _normalizar_registro(fila)
+                if registro and registrar_pasajero(sistema, registro, persistir=False):
+                    agregados += 1
+            encabezado = lector.fieldnames
+            texto.detach()
+            consumido = binario.tell()
+        else:
+            # Solo la cola agregada: se procesan únicamente líneas completas
+            cola = binario.read()
+            fin = cola.rfind(b"\n") + 1
+            lector = csv.DictReader(
+                io.StringIO(cola[:fin].decode("utf-8"), newline=""),
+                fieldnames=encabezado,
+            )
+            for fila in lector:
+                filas += 1
+                registro = _normalizar_registro(fila)
+                if registro and registrar_pasajero(sistema, registro, persistir=False):
+                    agregados += 1
+            consumido = desplazamiento + fin
+
+        termina_en_salto = True
+        if consumido > 0:
+            binario.seek(consumido - 1)
+            termina_en_salto = binario.read(1) == b"\n"
+
+    contar("filas_parseadas", filas)
+    contar("bytes_leidos", consumido - desplazamiento)
+    return agregados, consumido, encabezado, termina_en_salto
+
+
+def _registrar_lectura(
+    sistema: dict,
+    ruta: Path,
+    consumido: int,
+    encabezado: list | None,
+    termina_en_salto: bool
+) -> None:
+    # Guarda la huella del CSV tal como quedó reflejado en memoria
+    firma = _firma_archivo(ruta)
+    if firma is not None:
+        # El tamaño registrado es lo consumido, así una escritura a medias se relee
+        firma = (firma[0], consumido, firma[2])
+
+    anterior = sistema.get("sincronizacion") or {}
+    sistema["sincronizacion"] = {
+        "ruta": ruta,
+        "firma": firma,
+        "desplazamiento": consumido,
+        "huella": _huella_prefijo(ruta, consumido) if firma else b"",
+        "encabezado": encabezado,
+        "solo_anexable": termina_en_salto,
+        "hash": None,
+        "journal": anterior.get("journal", 0) if anterior.get("ruta") == ruta else 0,
+    }
+
+
+def _almacen(sistema: dict) -> AlmacenSQLite | None:
+    # Almacenamiento externo (SQLite) o None si los pasajeros viven en memoria
+    return sistema.get("almacen")
+
+
+def _ruta_sistema(sistema: dict) -> Path:
+    # CSV asociado al sistema: el último sincronizado o el de la creación
+    estado = sistema.get("sincronizacion")
+    if estado is not None:
+        return estado["ruta"]
+    return sistema["persistencia"]["ruta"]
+
+
+@medido
 def cargar_pasajeros_desde_csv(sistema: dict, ruta: Path | None = None) -> int:
     # Carga pasajeros desde un CSV y devuelve cuántos registros se agregaron
     ruta_final = ruta or _ruta_csv_por_defecto()
     if not ruta_final.exists():
         return 0
 
-    agregados = 0
-    with ruta_final.open(newline="", encoding="utf-8") as archivo:
-        lector = csv.DictReader(archivo)
-        for fila in lector:
-            registro = _normalizar_registro(fila)
-            if registro and registrar_pasajero(sistema, registro, persistir=False):
-                agregados += 1
-
+    agregados, _, _, _ = _leer_filas_csv(sistema, ruta_final)
     return agregados
 
 
+def _aplicar_registros_journal(sistema: dict, registros: list) -> bool:
+    # Reaplica en memoria los cambios de la bitácora; True si alguno tuvo efecto
+    hubo_cambios = False
+    for registro in registros:
+        accion, valores = registro[0], registro[1:]
+        fila = dict(zip(CAMPOS_CSV, valores))
+
+        if accion == ACCION_ELIMINAR:
+            aplicado = eliminar_pasajero(sistema, fila["documento"], persistir=False)
+        else:
+            datos = _normalizar_registro(fila)
+            if datos is None:
+                continue
+            if accion == ACCION_REGISTRAR:
+                aplicado = registrar_pasajero(sistema, datos, persistir=False)
+            else:
+                documento = datos.pop("documento")
+                aplicado = actualizar_pasajero(
+                    sistema, documento, datos, persistir=False
+                )
+        hubo_cambios = hubo_cambios or aplicado
+
+    return hubo_cambios
+
+
+def _sincronizar_journal(sistema: dict) -> bool | None:
+    # Lee lo nuevo de la bitácora. None si fue truncada y hay que recargar todo.
+    estado = sistema["sincronizacion"]
+    ruta = ruta_journal(estado["ruta"])
+    tamano = tamano_journal(ruta)
+
+    if tamano == estado["journal"]:
+        return False
+    if tamano < estado["journal"]:
+        return None
+
+    registros, consumido = leer_registros(ruta, estado["journal"])
+    estado["journal"] = consumido
+    return _aplicar_registros_journal(sistema, registros)
+
+
+@medido
 def recargar_desde_csv(sistema: dict, ruta: Path | None = None) -> int:
-    # Reemplaza los datos en memoria por el contenido del CSV
+    # Reemplaza los datos en memoria por el contenido del CSV (más su bitácora).
+    # La versión solo sube si el contenido recargado es distinto al anterior.
+    ruta_final = ruta or _ruta_sistema(sistema)
     sistema["pasajeros"].clear()
     sistema["habitaciones_ocupadas"].clear()
-    sistema["historial"].clear()
-    return cargar_pasajeros_desde_csv(sistema, ruta)
+    _reiniciar_derivados(sistema)
+    sistema["sincronizacion"] = None
+
+    versiones = sistema["versiones"]
+    versiones.iniciar_recarga()
+    try:
+        if not ruta_final.exists():
+            _registrar_lectura(sistema, ruta_final, 0, None, True)
+        else:
+            lectura = _cargar_snapshot(sistema, ruta_final)
+            if lectura is None:
+                firma = _firma_archivo(ruta_final)
+                _, consumido, encabezado, completo = _leer_filas_csv(sistema, ruta_final)
+                lectura = (consumido, encabezado, completo)
+                if firma == _firma_archivo(ruta_final):
+                    _guardar_snapshot(
+                        ruta_final, firma, lectura,
+                        [p._valores() for p in sistema["pasajeros"].values()],
+                    )
+            _registrar_lectura(sistema, ruta_final, *lectura)
 
+        _sincronizar_journal(sistema)
+    finally:
+        versiones.terminar_recarga()
+    return len(sistema["pasajeros"])
 
+
+def _cargar_snapshot(sistema: dict, ruta: Path) -> tuple | None:
+    # Carga los pasajeros desde la caché binaria si corresponde al CSV actual.
+    # Devuelve (consumido, encabezado, completo) como _leer_filas_csv, o None
+    # si no hay caché válida y hay que leer el CSV.
+    firma = _firma_archivo(ruta)
+    if firma is None or firma[1] == 0:
+        return None
+    resultado = leer_snapshot(ruta_snapshot(ruta), firma)
+    if resultado is None:
+        return None
+
+    lectura, columnas = resultado
+    pasajeros = sistema["pasajeros"]
+    versiones = sistema["versiones"]
+    filas = 0
+    for valores in zip(*columnas):
+        pasajero = Pasajero._desde_valores(valores)
+        pasajeros[pasajero.documento] = pasajero
+        _vincular(sistema, pasajero)
+        versiones.actualizar(pasajero.documento, pasajero)
+        filas += 1
+    contar("filas_snapshot", filas)
+    return lectura["consumido"], lectura["encabezado"], lectura["completo"]
+
+
+def _guardar_snapshot(ruta: Path, firma: tuple, lectura: tuple, filas: list) -> None:
+    # Deja la caché binaria del CSV recién leído o escrito (si vale la pena).
+    # Es solo una caché: si no se puede escribir, el próximo arranque lee el CSV.
+    if len(filas) < MINIMO_FILAS_SNAPSHOT:
+        return
+    consumido, encabezado, completo = lectura
+    meta = {"consumido": consumido, "encabezado": encabezado, "completo": completo}
+    try:
+        escribir_snapshot(ruta_snapshot(ruta), firma, meta, filas)
+    except (OSError, OverflowError):
+        pass
+
+
+def _fila_estable(pasajero: Pasajero) -> tuple | None:
+    # Valores del pasajero tal como quedarían al releerlo del CSV, o None si
+    # releerlo daría otra cosa (textos con espacios de borde, sin nombre, ...)
+    nombre, documento, nacionalidad, habitacion, ingreso, salida, estado = (
+        pasajero._valores()
+    )
+    if not nombre or not documento or type(habitacion) is not int:
+        return None
+    valores = [nombre, documento, nacionalidad, habitacion, ingreso, salida, estado]
+    for posicion, valor in enumerate(valores):
+        if valor is None:
+            valores[posicion] = ""
+        elif type(valor) is str and valor != valor.strip():
+            return None
+    return tuple(valores)
+
+
+def _solo_se_anexo(estado: dict, ruta: Path, firma: tuple) -> bool:
+    # True si el archivo creció sin tocar lo que ya estaba leído
+    anterior = estado["firma"]
+    if anterior is None or not estado["solo_anexable"]:
+        return False
+    if firma[2] != anterior[2] or firma[1] <= estado["desplazamiento"]:
+        return False
+    if estado["encabezado"] is None:
+        return False
+    return _huella_prefijo(ruta, estado["desplazamiento"]) == estado["huella"]
+
+
+def _sincronizar_incremental(
+    sistema: dict,
+    ruta: Path,
+    verificar_contenido: bool
+) -> bool | None:
+    # Intenta ponerse al día sin recargar. None si hace falta recarga completa.
+    estado = sistema.get("sincronizacion")
+    if estado is None or estado["ruta"] != ruta:
+        return None
+
+    firma = _firma_archivo(ruta)
+    hubo_cambios = False
+
+    if firma == estado["firma"]:
+        pass
+    elif firma is not None and _solo_se_anexo(estado, ruta, firma):
+        agregados, consumido, encabezado, completo = _leer_filas_csv(
+            sistema, ruta, estado["desplazamiento"], estado["encabezado"]
+        )
+        _registrar_lectura(sistema, ruta, consumido, encabezado, completo)
+        hubo_cambios = agregados > 0
+    elif verificar_contenido and firma is not None and estado["hash"]:
+        # Mismo contenido con otra huella (p. ej. un "touch"): no se recarga
+        contenido = _hash_archivo(ruta)
+        if contenido != estado["hash"]:
+            return None
+        _registrar_lectura(
+            sistema, ruta, firma[1], estado["encabezado"], estado["solo_anexable"]
+        )
+        sistema["sincronizacion"]["hash"] = contenido
+    else:
+        return None
+
+    cambios_journal = _sincronizar_journal(sistema)
+    if cambios_journal is None:
+        return None
+    return hubo_cambios or cambios_journal
+
+
+@medido
 def sincronizar_desde_csv(
     sistema: dict,
-    ruta: Path | None = None
+    ruta: Path | None = None,
+    verificar_contenido: bool = False
 ) -> bool:
-    # Recarga y devuelve True si hubo cambios reales en memoria.
-    antes = (
-        dict(sistema["pasajeros"]),
-        set(sistema["habitaciones_ocupadas"]),
-        list(sistema["historial"]),
-    )
+    # Sincroniza con el CSV (y su bitácora) solo si cambiaron y devuelve True
+    # si hubo cambios reales en memoria. Si solo crecieron, lee únicamente la cola.
+    # Toma el cerrojo entre terminales y primero confirma lo propio pendiente,
+    # así lo que se lee de otros nunca se mezcla con cambios sin escribir.
+    if _almacen(sistema) is not None:
+        # SQLite ya ve lo que confirman otros procesos: no hay copia que refrescar
+        return False
+
+    ruta_final = ruta or _ruta_sistema(sistema)
+    config = sistema["persistencia"]
+    with _bloqueo_persistencia(sistema):
+        if config["pendientes"]:
+            confirmar_cambios(sistema)
+        hubo_cambios = _sincronizar(sistema, ruta_final, verificar_contenido)
+        config["generacion"] = leer_generacion(ruta_bloqueo(ruta_final))
+        return hubo_cambios
+
+
+def version_datos(sistema: dict) -> int:
+    # Versión actual de los pasajeros en memoria: cambia con cada alta,
+    # modificación o baja (propia o leída del CSV), así comparar es O(1)
+    return sistema["versiones"].version
+
+
+def cambios_desde(sistema: dict, version: int) -> set:
+    # Documentos agregados, modificados o borrados después de `version`
+    return sistema["versiones"].cambios_desde(version)
+
+
+def _sincronizar(sistema: dict, ruta: Path, verificar_contenido: bool) -> bool:
+    # Cuerpo de sincronizar_desde_csv (con el cerrojo ya tomado)
+    incremental = _sincronizar_incremental(sistema, ruta, verificar_contenido)
+    if incremental is not None:
+        return incremental
+
+    # Reescritura real: recarga completa; hubo cambios si subió la versión
+    version = sistema["versiones"].version
     recargar_desde_csv(sistema, ruta)
-    despues = (
-        sistema["pasajeros"],
-        sistema["habitaciones_ocupadas"],
-        sistema["historial"],
-    )
-    return despues != antes
+    if verificar_contenido and sistema["sincronizacion"]["firma"] is not None:
+        sistema["sincronizacion"]["hash"] = _hash_archivo(ruta)
+    return sistema["versiones"].version != version
 
 
+@medido
 def guardar_pasajeros_a_csv(sistema: dict, ruta: Path | None = None) -> None:
-    # Guarda el estado actual en el CSV de ejemplo
-    ruta_final = ruta or _ruta_csv_por_defecto()
-    pasajeros = list(sistema["pasajeros"].values())
-    pasajeros.sort(key=lambda p: p.get("documento", ""))
+    # Guarda el estado actual en el CSV del sistema. Se escribe un temporal que
+    # luego reemplaza al archivo, así nunca queda un CSV truncado a la vista.
+    ruta_final = ruta or _ruta_sistema(sistema)
+    almacen = _almacen(sistema)
+    if almacen is not None:
+        # Exportación directa desde la base, recorriendo la tabla con un cursor
+        with escritura_atomica(ruta_final) as archivo:
+            almacen.exportar_csv(archivo, CAMPOS_CSV)
+        return
 
-    with ruta_final.open("w", newline="", encoding="utf-8") as archivo:
+    # Si el CSV es el del sistema, se arma a la vez su caché binaria (solo si
+    # releer el archivo daría exactamente estos mismos pasajeros)
+    estado = sistema.get("sincronizacion")
+    propio = estado is not None and estado["ruta"] == ruta_final
+    filas = [] if propio and len(sistema["pasajeros"]) >= MINIMO_FILAS_SNAPSHOT else None
+
+    with escritura_atomica(ruta_final) as archivo:
         escritor = csv.DictWriter(archivo, fieldnames=CAMPOS_CSV)
         escritor.writeheader()
-        for pasajero in pasajeros:
+        # En el orden del diccionario (de alta), sin ordenar: no se arma una
+        # lista con todos los pasajeros, solo se recorren
+        for pasajero in sistema["pasajeros"].values():
             escritor.writerow(
                 {campo: pasajero.get(campo, "") for campo in CAMPOS_CSV}
             )
+            if filas is not None:
+                fila = _fila_estable(pasajero)
+                if fila is None:
+                    filas = None  # la caché no quedaría igual al CSV: no se arma
+                else:
+                    filas.append(fila)
+
+    # El archivo recién escrito ya refleja la memoria: no hay que releerlo
+    if propio:
+        consumido = ruta_final.stat().st_size
+        lectura = (consumido, list(CAMPOS_CSV), True)
+        _registrar_lectura(sistema, ruta_final, *lectura)
+        if filas is not None:
+            _guardar_snapshot(ruta_final, _firma_archivo(ruta_final), lectura, filas)
+
+
+# -------- PERSISTENCIA (SNAPSHOT CSV + BITÁCORA) --------
+
+def _bloqueo_persistencia(sistema: dict):
+    # Cerrojo que ordena escrituras del hilo escritor y lecturas de sincronización
+    return sistema["persistencia"]["bloqueo"]
+
+
+def _bloqueo_cambio(sistema: dict, persistir: bool):
+    # Cerrojo de un alta, cambio o baja, desde la validación hasta encolar el
+    # registro: el escritor en segundo plano no puede recargar el CSV a mitad
+    # del cambio (y borrar lo recién agregado). Sin persistir (cargas,
+    # reaplicación de la bitácora) basta el cerrojo entre hilos del proceso.
+    bloqueo = _bloqueo_persistencia(sistema)
+    return bloqueo if persistir else bloqueo.hilos
+
+
+@medido
+def compactar_journal(sistema: dict) -> None:
+    # Reescribe el snapshot CSV con el estado actual y vacía la bitácora.
+    # Con SQLite confirma la transacción y lleva el WAL a la base. Si otra
+    # terminal escribió desde la última lectura se recarga el CSV y solo
+    # sobreviven los cambios encolados en "pendientes": quien registre con
+    # persistir=False y compacte después debe tener el cerrojo tomado desde
+    # antes (ver importar_pasajeros_masivo).
+    almacen = _almacen(sistema)
+    if almacen is not None:
+        with _bloqueo_persistencia(sistema):
+            almacen.confirmar()
+            almacen.conexion.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+        return
+
+    config = sistema["persistencia"]
+    with _bloqueo_persistencia(sistema):
+        config["snapshot_pendiente"] = False
+        try:
+            confirmar_cambios(sistema)
+            ruta = _ruta_sistema(sistema)
+            if leer_generacion(ruta_bloqueo(ruta)) != config["generacion"]:
+                # Otra terminal confirmó cambios: se incorporan antes de reescribir
+                _sincronizar(sistema, ruta, False)
+            guardar_pasajeros_a_csv(sistema, ruta)
+        except BaseException:
+            config["snapshot_pendiente"] = True  # se reintenta en la próxima escritura
+            raise
+        vaciar_journal(ruta_journal(ruta))
+
+        estado = sistema.get("sincronizacion")
+        if estado is not None and estado["ruta"] == ruta:
+            estado["journal"] = 0
+        config["generacion"] = incrementar_generacion(ruta_bloqueo(ruta))
+
+
+def _fusionar_pendientes(sistema: dict, ruta: Path, pendientes: list) -> list:
+    # Otra terminal confirmó cambios después de la última lectura: se recarga
+    # lo que hay en disco y se reaplican encima los cambios propios. Los que ya
+    # no son válidos (p. ej. otro tomó la habitación) van a "conflictos".
+    config = sistema["persistencia"]
+    recargar_desde_csv(sistema, ruta)
+    config["generacion"] = leer_generacion(ruta_bloqueo(ruta))
+
+    conflictos = config["conflictos"]
+    aplicados = []
+    for registro in pendientes:
+        if _aplicar_registros_journal(sistema, [registro]):
+            aplicados.append(registro)
+        else:
+            # No se escribe: tampoco se anota en el historial
+            config["eventos"].pop(id(registro), None)
+            conflictos.append(registro)
+    # Cota para programas que nunca leen los conflictos; solo se descartan
+    # los de confirmaciones anteriores
+    sobrantes = len(conflictos) - len(pendientes) + len(aplicados) - MAXIMO_CONFLICTOS
+    if sobrantes > 0:
+        del conflictos[:sobrantes]
+    return aplicados
+
+
+def _separar_conflictos(sistema: dict, registros: list) -> list:
+    # Quita de "conflictos" los de `registros` (por identidad) y los devuelve:
+    # quien encoló esos cambios es quien los informa
+    conflictos = sistema["persistencia"]["conflictos"]
+    propios = {id(registro) for registro in registros}
+    rechazados = [registro for registro in conflictos if id(registro) in propios]
+    if rechazados:
+        conflictos[:] = [r for r in conflictos if id(r) not in propios]
+    return rechazados
+
+
+def tomar_conflictos(sistema: dict) -> list:
+    # Cambios propios que otra terminal invalidó y que nadie informó todavía
+    # (p. ej. los que confirmó el escritor en segundo plano después de que
+    # el menú dijera "registrado"), como (acción, documento). Los olvida.
+    conflictos = sistema["persistencia"]["conflictos"]
+    posicion = 1 + CAMPOS_CSV.index("documento")
+    tomados = [(registro[0], registro[posicion]) for registro in conflictos]
+    conflictos.clear()
+    return tomados
+
+
+def _anotar_escritos(sistema: dict, registros: list) -> None:
+    # Anota en el historial los cambios que ya quedaron escritos en disco
+    eventos = sistema["persistencia"]["eventos"]
+    if not eventos:
+        return
+    for registro in registros:
+        evento = eventos.pop(id(registro), None)
+        if evento is not None:
+            sistema["historial"].registrar(*evento)
+
+
+@medido
+def confirmar_cambios(sistema: dict) -> int:
+    # Escribe en la bitácora los cambios pendientes con un solo fsync, con el
+    # cerrojo entre terminales tomado. Devuelve cuántos registros se confirmaron.
+    config = sistema["persistencia"]
+    almacen = _almacen(sistema)
+    with config["bloqueo"]:
+        if almacen is not None:
+            # Un solo commit para todo lo escrito desde el anterior
+            almacen.confirmar()
+            return 0
+
+        pendientes = config["pendientes"]
+        if not pendientes:
+            if config["snapshot_pendiente"]:
+                compactar_journal(sistema)
+            return 0
+        config["pendientes"] = []
+
+        ruta = _ruta_sistema(sistema)
+        try:
+            if leer_generacion(ruta_bloqueo(ruta)) != config["generacion"]:
+                pendientes = _fusionar_pendientes(sistema, ruta, pendientes)
+            if config["modo"] == "csv":
+                compactar_journal(sistema)
+            elif pendientes:
+                tamano = anexar_registros(ruta_journal(ruta), pendientes)
+        except BaseException:
+            # Si no se pudo escribir (disco lleno, permisos) los cambios siguen
+            # en memoria: se devuelven a la cola para el próximo intento
+            config["pendientes"] = pendientes + config["pendientes"]
+            raise
+        _anotar_escritos(sistema, pendientes)
+        if config["modo"] == "csv" or not pendientes:
+            return len(pendientes)
+        config["generacion"] = incrementar_generacion(ruta_bloqueo(ruta))
+
+        estado = sistema.get("sincronizacion")
+        if estado is not None and estado["ruta"] == ruta:
+            # Lo recién escrito ya está en memoria
+            estado["journal"] = tamano
+
+        if tamano > config["umbral_compactacion"] or config["snapshot_pendiente"]:
+            compactar_journal(sistema)
+        return len(pendientes)
+
+
+def _registro_bitacora(sistema: dict, accion: str, documento: str) -> list:
+    # Registro de la bitácora con el estado actual del documento. Solo una
+    # baja puede no tener pasajero; en otro caso el cambio se perdió.
+    pasajero = sistema["pasajeros"].get(documento)
+    if pasajero is None:
+        if accion != ACCION_ELIMINAR:
+            raise LookupError(f"{accion} de {documento}: el pasajero ya no está en memoria")
+        valores = [
+            documento if campo == "documento" else ""
+            for campo in CAMPOS_CSV
+        ]
+    else:
+        # Como texto, igual que al releerlos de la bitácora
+        valores = [str(pasajero.get(campo, "")) for campo in CAMPOS_CSV]
+    return [accion, *valores]
+
 
+def _persistir(
+    sistema: dict,
+    accion: str,
+    documento: str,
+    antes: Mapping | None,
+    despues: Mapping | None
+) -> bool:
+    # Persiste un cambio según el modo configurado en el sistema y lo anota
+    # en el historial recién cuando queda escrito. Con el escritor en segundo
+    # plano activo solo se encola y se le avisa; si al escribir otra terminal
+    # ya lo había invalidado, no se anota y queda en "conflictos" (ver
+    # tomar_conflictos). Devuelve False si eso pasó al confirmar aquí mismo.
+    config = sistema["persistencia"]
+    evento = (accion, documento, antes, despues)
+    almacen = _almacen(sistema)
+    if almacen is not None:
+        # SQLite valida contra la base compartida: no hay conflictos después.
+        # Se confirma ya, sin soltar el cerrojo con la transacción abierta.
+        with config["bloqueo"]:
+            almacen.confirmar()
+        sistema["historial"].registrar(*evento)
+        return True
+
+    with config["bloqueo"]:
+        if config["modo"] == "csv":
+            config["snapshot_pendiente"] = True
+        registro = _registro_bitacora(sistema, accion, documento)
+        config["pendientes"].append(registro)
+        config["eventos"][id(registro)] = evento
+
+        if config["escritor"] is not None:
+            config["escritor"].avisar()
+            return True
+        confirmar_cambios(sistema)
+        return not _separar_conflictos(sistema, [registro])
+
+
+def iniciar_escritor(
+    sistema: dict,
+    intervalo_ms: int = INTERVALO_ESCRITURA_MS
+) -> None:
+    # Activa el hilo que escribe los cambios a disco agrupados cada intervalo
+    config = sistema["persistencia"]
+    if config["escritor"] is not None:
+        return
+    escritor = EscritorEnSegundoPlano(
+        lambda: confirmar_cambios(sistema), intervalo_ms
+    )
+    config["escritor"] = escritor
+    escritor.start()
 
-def crear_estructura(cargar_csv: bool = True) -> dict:
-    # Crea la estructura principal del sistema
+
+def tomar_error_escritura(sistema: dict) -> BaseException | None:
+    # Último error del escritor en segundo plano (y lo olvida), o None. Los
+    # cambios que no se pudieron escribir siguen pendientes y se reintentan.
+    escritor = sistema["persistencia"]["escritor"]
+    if escritor is None or escritor.error is None:
+        return None
+    error, escritor.error = escritor.error, None
+    return error
+
+
+def cerrar_persistencia(sistema: dict) -> None:
+    # Detiene el escritor, escribe lo pendiente y deja el snapshot al día.
+    # Pensado para ejecutarse al salir del programa. Si la escritura final
+    # falla, el error se propaga (lo anterior del escritor ya se reintentó).
+    config = sistema["persistencia"]
+    escritor = config["escritor"]
+    if escritor is not None:
+        escritor.detener()
+        config["escritor"] = None
+
+    confirmar_cambios(sistema)
+    sistema["historial"].volcar(todo=True)
+    almacen = _almacen(sistema)
+    if almacen is not None:
+        almacen.cerrar()
+    elif tamano_journal(ruta_journal(_ruta_sistema(sistema))) > 0:
+        compactar_journal(sistema)
+
+
+def crear_estructura(
+    cargar_csv: bool = True,
+    ruta: Path | None = None,
+    persistencia: str = "journal",
+    columnar: bool = False,
+    almacen: str = "memoria",
+    ruta_db: Path | None = None
+) -> dict:
+    # Crea la estructura principal del sistema.
+    # persistencia: "journal" (anexa cada cambio) o "csv" (reescribe el archivo).
+    # columnar: mantiene además columnas para reportes de ocupación.
+    # almacen: "memoria" (dict + CSV) o "sqlite" (base en `ruta_db`; el CSV
+    # solo se importa si la base está vacía y sirve para exportar).
+    ruta_csv = ruta or _ruta_csv_por_defecto()
     sistema = {
         "pasajeros": {},                 # dict: documento -> datos del pasajero
-        "historial": [],                 # list: registro de acciones
+        "historial": None,               # Historial: eventos recientes + auditoría
         "habitaciones_ocupadas": set(),  # set: habitaciones en uso
+        "indices": crear_indices(),      # índices secundarios (ver indices.py)
+        "estadias": IndiceEstadias(),    # índice de intervalos por fechas
+        "disponibilidad": Disponibilidad(),  # ocupación por habitación y noche
+        "nombres": IndiceNombres(),      # búsqueda por nombre (prefijo y trigramas)
+        "versiones": Versiones(),        # versión y digest de "pasajeros"
+        "agregados": Agregados(),        # totales del reporte de ocupación
+        "columnar": AlmacenColumnar() if columnar else None,
+        "sincronizacion": None,          # huella del CSV ya cargado
+        "persistencia": {
+            "modo": persistencia,
+            "pendientes": [],            # registros aún no escritos en la bitácora
+            "snapshot_pendiente": False,  # modo "csv": falta reescribir el archivo
+            "umbral_compactacion": UMBRAL_COMPACTACION,
+            "escritor": None,            # hilo escritor opcional
+            "ruta": ruta_csv,            # CSV compartido por las terminales
+            "generacion": 0,             # última generación del CSV leída o escrita
+            "conflictos": [],            # cambios propios que otra terminal invalidó
+            "eventos": {},               # id(registro) -> evento del historial al escribirlo
+            # Cerrojo entre hilos y terminales (flock sobre datos_prueba.lock)
+            "bloqueo": BloqueoArchivo(lambda: ruta_bloqueo(_ruta_sistema(sistema))),
+        },
+        "almacen": None,                 # AlmacenSQLite si se usa SQLite
+        "transaccion": None,             # cambios de la transacción en curso
     }
-    if cargar_csv:
-        cargar_pasajeros_desde_csv(sistema)
+    sistema["historial"] = Historial(
+        lambda: ruta_auditoria(_ruta_sistema(sistema)),
+        sistema["persistencia"]["bloqueo"],
+    )
+    if almacen == "sqlite":
+        base = AlmacenSQLite(ruta_db or ruta_csv.with_suffix(".sqlite3"), Pasajero)
+        sistema["almacen"] = base
+        if cargar_csv and base.contar() == 0:
+            importar_csv_a_sqlite(sistema, ruta_csv)
+    elif cargar_csv:
+        with _bloqueo_persistencia(sistema):
+            recargar_desde_csv(sistema, ruta_csv)
+            sistema["persistencia"]["generacion"] = leer_generacion(
+                ruta_bloqueo(ruta_csv)
+            )
     return sistema
 
 
+def importar_csv_a_sqlite(sistema: dict, ruta: Path, rechazados: list | None = None) -> int:
+    # Carga un CSV en la base SQLite por lotes, con las validaciones de la
+    # carga en memoria. Devuelve cuántos se agregaron; los documentos de las
+    # filas saltadas (repetidas, fechas invertidas o habitación tomada) se
+    # agregan a `rechazados`.
+    if not ruta.exists():
+        return 0
+    with ruta.open(newline="", encoding="utf-8") as archivo:
+        registros = map(_normalizar_registro, csv.DictReader(archivo))
+        return _almacen(sistema).importar(
+            (Pasajero(registro) for registro in registros if registro),
+            rechazados=rechazados,
+        )
+
+
+# -------- ESTRUCTURAS DERIVADAS --------
+
+def _tiene_estadia(pasajero: Pasajero) -> bool:
+    # True si ambas fechas son válidas (guardadas como ordinales)
+    return type(pasajero.ingreso) is int and type(pasajero.salida) is int
+
+
+def _fechas_en_orden(ingreso, salida) -> bool:
+    # La salida no puede ser anterior al ingreso (si ambas fechas son válidas)
+    if type(ingreso) is int and type(salida) is int:
+        return salida >= ingreso
+    return True
+
+
+def _noches_ocupadas(pasajero: Pasajero) -> tuple:
+    # (ingreso, salida) para el motor de disponibilidad; (None, None) si no
+    # hay fechas válidas y el pasajero ocupa la habitación sin límite
+    if _tiene_estadia(pasajero):
+        return pasajero.ingreso, pasajero.salida
+    return None, None
+
+
+def _vincular(sistema: dict, pasajero: Pasajero) -> None:
+    # Agrega el pasajero a las estructuras derivadas de "pasajeros"
+    habitacion = pasajero.get("habitacion")
+    sistema["habitaciones_ocupadas"].add(habitacion)
+    sistema["disponibilidad"].ocupar(habitacion, *_noches_ocupadas(pasajero))
+    indexar(sistema["indices"], pasajero)
+    sistema["nombres"].agregar(pasajero.documento, pasajero.nombre)
+    if _tiene_estadia(pasajero):
+        sistema["estadias"].agregar(
+            pasajero.documento, pasajero.ingreso, pasajero.salida
+        )
+    sistema["agregados"].agregar(pasajero)
+    if sistema["columnar"] is not None:
+        sistema["columnar"].agregar(pasajero)
+
+
+def _desvincular(sistema: dict, pasajero: Pasajero) -> None:
+    # Quita el pasajero de las estructuras derivadas de "pasajeros"
+    habitacion = pasajero.get("habitacion")
+    sistema["disponibilidad"].liberar(habitacion, *_noches_ocupadas(pasajero))
+    desindexar(sistema["indices"], pasajero)
+    sistema["nombres"].quitar(pasajero.documento, pasajero.nombre)
+    if not documentos_en_habitacion(sistema["indices"], habitacion):
+        sistema["habitaciones_ocupadas"].discard(habitacion)
+    if _tiene_estadia(pasajero):
+        sistema["estadias"].quitar(
+            pasajero.documento, pasajero.ingreso, pasajero.salida
+        )
+    sistema["agregados"].quitar(pasajero)
+    if sistema["columnar"] is not None:
+        sistema["columnar"].quitar(pasajero.get("documento"))
+
+
+def _reiniciar_derivados(sistema: dict) -> None:
+    # Deja vacías las estructuras derivadas (antes de recargar)
+    reconstruir(sistema["indices"], ())
+    sistema["estadias"].limpiar()
+    sistema["disponibilidad"].limpiar()
+    sistema["nombres"].limpiar()
+    sistema["agregados"].limpiar()
+    if sistema["columnar"] is not None:
+        sistema["columnar"] = AlmacenColumnar()
+
+
+def _anotar(
+    sistema: dict,
+    accion: str,
+    documento: str,
+    antes: Mapping | None,
+    despues: Mapping | None,
+    persistir: bool
+) -> bool:
+    # Persiste el cambio y lo agrega al historial. Con persistir=False (cargas
+    # del CSV, reaplicación de la bitácora, importaciones) no es una acción
+    # nueva del usuario y no se anota. Dentro de una transacción solo se
+    # acumula: se persiste y se anota todo junto al confirmarla.
+    if not persistir:
+        return True
+    transaccion = sistema.get("transaccion")
+    if transaccion is not None:
+        registro = None
+        if _almacen(sistema) is None:
+            registro = _registro_bitacora(sistema, accion, documento)
+        transaccion["cambios"].append((
+            registro,
+            accion,
+            documento,
+            None if antes is None else dict(antes),
+            None if despues is None else dict(despues),
+        ))
+        return True
+    return _persistir(sistema, accion, documento, antes, despues)
+
+
+@medido
 def registrar_pasajero(
     sistema: dict,
     pasajero: dict,
     persistir: bool = True
 ) -> bool:
-    # Registra un pasajero si no existe y la habitación está libre
-    documento = pasajero.get("documento")
-    habitacion = pasajero.get("habitacion")
+    # Registra un pasajero si no existe, la habitación está libre en sus fechas
+    # y la salida no es anterior al ingreso. Permite reservas a futuro en una
+    # habitación ocupada hoy. Se guarda como Pasajero (registro compacto).
+    with _bloqueo_cambio(sistema, persistir):
+        documento = pasajero.get("documento")
 
-    if documento in sistema["pasajeros"]:
-        return False
+        if documento in sistema["pasajeros"]:
+            return False
 
-    if habitacion in sistema["habitaciones_ocupadas"]:
-        return False
+        if not isinstance(pasajero, Pasajero):
+            pasajero = Pasajero(pasajero)
+        if not _fechas_en_orden(pasajero.ingreso, pasajero.salida):
+            return False
 
-    sistema["pasajeros"][documento] = pasajero
-    sistema["habitaciones_ocupadas"].add(habitacion)
-    sistema["historial"].append(f"CHECK-IN: {documento}")
-    if persistir:
-        guardar_pasajeros_a_csv(sistema)
-    return True
+        almacen = _almacen(sistema)
+        if almacen is not None:
+            with _bloqueo_persistencia(sistema):
+                if not almacen.registrar(pasajero):
+                    return False
+            return _anotar(sistema, ACCION_REGISTRAR, documento, None, pasajero, persistir)
+
+        habitacion = pasajero.get("habitacion")
+        with medir("validar_disponibilidad"):
+            libre = sistema["disponibilidad"].libre(habitacion, *_noches_ocupadas(pasajero))
+        if not libre:
+            return False
+
+        _recordar(sistema, documento)
+        sistema["pasajeros"][documento] = pasajero
+        _vincular(sistema, pasajero)
+        sistema["versiones"].actualizar(documento, pasajero)
+        return _anotar(sistema, ACCION_REGISTRAR, documento, None, pasajero, persistir)
 
 
 def listar_pasajeros(sistema: dict) -> list:
-    # Devuelve una lista con todos los pasajeros
-    return list(sistema["pasajeros"].values())
+    # Devuelve una lista con todos los pasajeros (para listados grandes
+    # conviene iterar_pasajeros o pagina_pasajeros)
+    return list(iterar_pasajeros(sistema))
+
 
+def _criterios_listado(filtros: dict) -> dict:
+    # Valida los filtros del listado y pasa las fechas a ordinales
+    desconocidos = set(filtros) - set(FILTROS)
+    if desconocidos:
+        raise ValueError(f"Filtro desconocido: {', '.join(sorted(desconocidos))}")
+    criterios = {campo: valor for campo, valor in filtros.items() if valor is not None}
+    for campo in ("fecha_desde", "fecha_hasta"):
+        if campo in criterios:
+            criterios[campo] = _dia(criterios[campo])
+    return criterios
 
+
+def _candidatos(sistema: dict, criterios: dict):
+    # Pasajeros a revisar: si se filtra por estado o nacionalidad, solo los
+    # del grupo más chico de esos índices; si no, todos
+    grupos = [
+        sistema["indices"][campo].get(criterios[campo], ())
+        for campo in ("estado", "nacionalidad")
+        if campo in criterios
+    ]
+    if not grupos:
+        return iter(sistema["pasajeros"].values())
+    pasajeros = sistema["pasajeros"]
+    return (pasajeros[documento] for documento in min(grupos, key=len))
+
+
+def _filtrados(sistema: dict, criterios: dict, clave, descendente: bool, cursor):
+    # Candidatos que cumplen los filtros y quedan después del cursor
+    filtro = crear_filtro(**criterios)
+    pasajeros = _candidatos(sistema, criterios)
+    if filtro is not None:
+        pasajeros = filter(filtro, pasajeros)
+    if cursor is not None:
+        limite = decodificar_cursor(cursor)
+        if descendente:
+            pasajeros = (p for p in pasajeros if clave(p) < limite)
+        else:
+            pasajeros = (p for p in pasajeros if clave(p) > limite)
+    return pasajeros
+
+
+def iterar_pasajeros(
+    sistema: dict,
+    orden: str | None = None,
+    descendente: bool = False,
+    cursor: str | None = None,
+    **filtros
+):
+    # Generador de pasajeros filtrados (estado, nacionalidad, habitacion_desde,
+    # habitacion_hasta, fecha_desde, fecha_hasta). Sin `orden` no arma ninguna
+    # lista; con `orden` entrega por (campo, documento) desde el `cursor`.
+    criterios = _criterios_listado(filtros)
+    if cursor is not None and orden is None:
+        raise ValueError("El cursor requiere un orden")
+
+    almacen = _almacen(sistema)
+    if almacen is not None:
+        despues = decodificar_cursor(cursor) if cursor is not None else None
+        yield from almacen.listar(criterios, orden, descendente, despues)
+        return
+
+    clave = clave_orden(orden) if orden is not None else None
+    pasajeros = _filtrados(sistema, criterios, clave, descendente, cursor)
+    if clave is None:
+        yield from pasajeros
+    else:
+        yield from sorted(pasajeros, key=clave, reverse=descendente)
+
+
+@medido
+def pagina_pasajeros(
+    sistema: dict,
+    limite: int = 20,
+    cursor: str | None = None,
+    orden: str = "documento",
+    descendente: bool = False,
+    **filtros
+) -> tuple:
+    # Una página del listado: (pasajeros, cursor_siguiente). El cursor
+    # siguiente es None en la última página. En memoria usa un heap de tamaño
+    # `limite` en vez de ordenar todo; en SQLite, LIMIT sobre el índice.
+    criterios = _criterios_listado(filtros)
+    clave = clave_orden(orden)
+
+    almacen = _almacen(sistema)
+    if almacen is not None:
+        despues = decodificar_cursor(cursor) if cursor is not None else None
+        pagina = list(almacen.listar(criterios, orden, descendente, despues, limite))
+    else:
+        pasajeros = _filtrados(sistema, criterios, clave, descendente, cursor)
+        elegir = nlargest if descendente else nsmallest
+        pagina = elegir(limite, pasajeros, key=clave)
+
+    siguiente = None
+    if pagina and len(pagina) == limite:
+        siguiente = codificar_cursor(clave(pagina[-1]))
+    return pagina, siguiente
+
+
+@medido
 def buscar_por_documento(sistema: dict, documento: str) -> dict | None:
     # Busca un pasajero por su documento
+    almacen = _almacen(sistema)
+    if almacen is not None:
+        return almacen.buscar(documento)
     return sistema["pasajeros"].get(documento)
 
 
+@medido
+def buscar_por_nombre(sistema: dict, consulta: str, limite: int = 10) -> list:
+    # Pasajeros cuyo nombre se parece a la consulta, del más al menos
+    # relevante: nombre exacto, prefijo de alguna palabra y luego parecidos
+    # (tolera tildes, mayúsculas y errores de tipeo)
+    almacen = _almacen(sistema)
+    if almacen is not None:
+        return almacen.buscar_por_nombre(consulta, limite)
+    resultado = sistema["nombres"].buscar(consulta, limite)
+    return [sistema["pasajeros"][documento] for _, _, documento in resultado]
+
+
+def buscar_por_campo(sistema: dict, campo: str, valor) -> list:
+    # Pasajeros cuyo campo indexado (estado, nacionalidad, fechas) vale `valor`
+    almacen = _almacen(sistema)
+    if almacen is not None:
+        if campo in ("fecha_ingreso", "fecha_salida"):
+            valor = _fecha_compacta(valor)
+        return almacen.buscar_por_campo(campo, valor)
+    documentos = documentos_con(sistema["indices"], campo, valor)
+    return [sistema["pasajeros"][documento] for documento in sorted(documentos)]
+
+
+def contar_por_nacionalidad(
+    sistema: dict,
+    fecha: str | None = None,
+    estado: str | None = None
+) -> dict:
+    # Pasajeros por nacionalidad, opcionalmente alojados en `fecha` y con `estado`.
+    # Usa el almacén columnar si está activo; si no, recorre los pasajeros.
+    dia = _dia(fecha) if fecha is not None else None
+
+    almacen = _almacen(sistema)
+    if almacen is not None:
+        return almacen.contar_por_nacionalidad(dia, estado)
+
+    if sistema["columnar"] is not None:
+        return sistema["columnar"].contar_por_nacionalidad(
+            estado=estado, desde=dia, hasta=None if dia is None else dia + 1
+        )
+
+    conteo = {}
+    for pasajero in sistema["pasajeros"].values():
+        if estado is not None and pasajero.get("estado") != estado:
+            continue
+        if dia is not None:
+            ingreso, salida = pasajero.ingreso, pasajero.salida
+            if type(ingreso) is not int or type(salida) is not int:
+                continue
+            if not ingreso <= dia < salida:
+                continue
+        nacionalidad = pasajero.get("nacionalidad")
+        conteo[nacionalidad] = conteo.get(nacionalidad, 0) + 1
+    return conteo
+
+
+@medido
+def reporte_ocupacion(
+    sistema: dict,
+    fecha: str | None = None,
+    habitaciones: int | None = None,
+    verificar: bool = False
+) -> dict:
+    # Reporte de ocupación (totales, estados, nacionalidades, llegadas y
+    # salidas de `fecha`, por defecto hoy) leído de los agregados que se
+    # mantienen en cada alta, cambio y baja. Las habitaciones ocupadas son
+    # las de ese día, según las estadías (ver _habitaciones_ocupadas). Con verificar=True además se
+    # recalcula todo desde los pasajeros; si no coincide, se corrigen los
+    # agregados y el reporte lo indica en "verificado".
+    dia = _dia(fecha) if fecha is not None else date.today().toordinal()
+    almacen = _almacen(sistema)
+    if almacen is not None:
+        # Con SQLite los pasajeros no están en memoria: se cuentan en la base
+        agregados = Agregados.desde_totales(almacen.totales(dia, ESTADO_ALOJADO))
+    else:
+        agregados = sistema["agregados"]
+
+    verificado = None
+    if verificar and almacen is None:
+        recalculados = Agregados.recalcular(sistema["pasajeros"].values())
+        verificado = recalculados == agregados
+        if not verificado:
+            sistema["agregados"] = agregados = recalculados
+
+    reporte = {
+        "fecha": ordinal_a_fecha(dia),
+        **agregados.reporte(dia, habitaciones, _habitaciones_ocupadas(sistema, dia)),
+    }
+    if verificar:
+        reporte["verificado"] = verificado is not False
+    return reporte
+
+
+def _habitaciones_ocupadas(sistema: dict, dia: int) -> int:
+    # Habitaciones con alguna estadía [ingreso, salida) que incluye el día,
+    # sin contar a quien ya hizo check-out. O(log N + alojados) con el índice.
+    almacen = _almacen(sistema)
+    if almacen is not None:
+        return almacen.habitaciones_ocupadas(dia, ESTADO_CHECK_OUT)
+    pasajeros = sistema["pasajeros"]
+    alojados = [pasajeros[documento] for documento in sistema["estadias"].alojados(dia)]
+    return len({
+        pasajero["habitacion"]
+        for pasajero in alojados
+        if pasajero["estado"] != ESTADO_CHECK_OUT
+    })
+
+
+def _dia(fecha: str) -> int:
+    # Fecha "dd-mm-yyyy" como ordinal; ValueError si no es válida
+    dia = fecha_a_ordinal(fecha)
+    if dia is None:
+        raise ValueError(f"Fecha inválida: {fecha}")
+    return dia
+
+
+def pasajeros_alojados_en(sistema: dict, fecha: str) -> list:
+    # Pasajeros cuya estadía [ingreso, salida) incluye la fecha
+    almacen = _almacen(sistema)
+    if almacen is not None:
+        return almacen.alojados(_dia(fecha))
+    documentos = sistema["estadias"].alojados(_dia(fecha))
+    return [sistema["pasajeros"][documento] for documento in documentos]
+
+
+def llegadas_del_dia(sistema: dict, fecha: str) -> list:
+    # Pasajeros que ingresan en la fecha
+    almacen = _almacen(sistema)
+    if almacen is not None:
+        return almacen.llegadas(_dia(fecha))
+    documentos = sistema["estadias"].llegadas(_dia(fecha))
+    return [sistema["pasajeros"][documento] for documento in documentos]
+
+
+def salidas_del_dia(sistema: dict, fecha: str) -> list:
+    # Pasajeros que dejan su habitación en la fecha (habitaciones que se liberan)
+    almacen = _almacen(sistema)
+    if almacen is not None:
+        return almacen.salidas(_dia(fecha))
+    documentos = sistema["estadias"].salidas(_dia(fecha))
+    return [sistema["pasajeros"][documento] for documento in documentos]
+
+
+def reconstruir_indices(sistema: dict) -> None:
+    # Recalcula desde cero todas las estructuras derivadas (índices, estadías,
+    # disponibilidad, columnas), p. ej. tras modificar "pasajeros" a mano
+    sistema["habitaciones_ocupadas"].clear()
+    _reiniciar_derivados(sistema)
+    versiones = sistema["versiones"]
+    versiones.iniciar_recarga()
+    for documento, pasajero in sistema["pasajeros"].items():
+        _vincular(sistema, pasajero)
+        versiones.actualizar(documento, pasajero)
+    versiones.terminar_recarga()
+
+
+@medido
 def actualizar_pasajero(
     sistema: dict,
     documento: str,
@@ -167,44 +1392,209 @@ def actualizar_pasajero(
     persistir: bool = True
 ) -> bool:
     # Actualiza los datos de un pasajero existente
-    pasajero = sistema["pasajeros"].get(documento)
-    if pasajero is None:
-        return False
-
-    # Validar cambio de habitación
-    if "habitacion" in cambios:
-        nueva = cambios["habitacion"]
-        actual = pasajero.get("habitacion")
+    with _bloqueo_cambio(sistema, persistir):
+        almacen = _almacen(sistema)
+        if almacen is not None:
+            pasajero = almacen.buscar(documento)
+        else:
+            pasajero = sistema["pasajeros"].get(documento)
+        if pasajero is None:
+            return False
 
-        if nueva != actual and nueva in sistema["habitaciones_ocupadas"]:
+        ingreso = pasajero.ingreso
+        if "fecha_ingreso" in cambios:
+            ingreso = _fecha_compacta(cambios["fecha_ingreso"])
+        salida = pasajero.salida
+        if "fecha_salida" in cambios:
+            salida = _fecha_compacta(cambios["fecha_salida"])
+        if not _fechas_en_orden(ingreso, salida):
             return False
 
-        sistema["habitaciones_ocupadas"].discard(actual)
-        sistema["habitaciones_ocupadas"].add(nueva)
+        antes = despues = None
+        if persistir:
+            # Valores de los campos tocados antes y después, para el historial
+            actualizado = Pasajero(pasajero)
+            actualizado.update(cambios)
+            antes = {campo: pasajero.get(campo) for campo in cambios}
+            despues = {campo: actualizado.get(campo) for campo in cambios}
 
-    pasajero.update(cambios)
-    sistema["historial"].append(f"UPDATE: {documento}")
-    if persistir:
-        guardar_pasajeros_a_csv(sistema)
-    return True
+        if almacen is not None:
+            with _bloqueo_persistencia(sistema):
+                if not almacen.actualizar(documento, cambios):
+                    return False
+            return _anotar(sistema, ACCION_ACTUALIZAR, documento, antes, despues, persistir)
+
+        # Validar habitación y fechas nuevas sin contar la estadía actual
+        habitacion = cambios.get("habitacion", pasajero.get("habitacion"))
+        if type(ingreso) is not int or type(salida) is not int:
+            ingreso = salida = None
+
+        _recordar(sistema, documento)
+        _desvincular(sistema, pasajero)
+        with medir("validar_disponibilidad"):
+            libre = sistema["disponibilidad"].libre(habitacion, ingreso, salida)
+        if not libre:
+            _vincular(sistema, pasajero)
+            return False
 
+        pasajero.update(cambios)
+        _vincular(sistema, pasajero)
+        sistema["versiones"].actualizar(documento, pasajero)
+        return _anotar(sistema, ACCION_ACTUALIZAR, documento, antes, despues, persistir)
 
+
+@medido
 def eliminar_pasajero(
     sistema: dict,
     documento: str,
     persistir: bool = True
 ) -> bool:
     # Elimina un pasajero y libera su habitación
-    pasajero = sistema["pasajeros"].pop(documento, None)
-    if pasajero is None:
-        return False
+    with _bloqueo_cambio(sistema, persistir):
+        almacen = _almacen(sistema)
+        if almacen is not None:
+            with _bloqueo_persistencia(sistema):
+                pasajero = almacen.buscar(documento) if persistir else None
+                if not almacen.eliminar(documento):
+                    return False
+        else:
+            _recordar(sistema, documento)
+            pasajero = sistema["pasajeros"].pop(documento, None)
+            if pasajero is None:
+                return False
+            _desvincular(sistema, pasajero)
+            sistema["versiones"].actualizar(documento)
+
+        return _anotar(sistema, ACCION_ELIMINAR, documento, pasajero, None, persistir)
+
+
+# -------- TRANSACCIONES --------
+
+class TransaccionCancelada(Exception):
+    # Se lanza dentro de `with transaccion(...)` para descartar los cambios
+    # sin que el error salga del bloque
+    pass
+
+
+def _recordar(sistema: dict, documento: str) -> None:
+    # Guarda una copia del pasajero la primera vez que la transacción en
+    # curso lo toca (None si aún no existe), para poder deshacer
+    transaccion = sistema.get("transaccion")
+    if transaccion is None or documento in transaccion["originales"]:
+        return
+    pasajero = sistema["pasajeros"].get(documento)
+    if pasajero is not None:
+        pasajero = Pasajero._desde_valores(pasajero._valores())
+    transaccion["originales"][documento] = pasajero
+
+
+def _deshacer_transaccion(sistema: dict, transaccion: dict) -> None:
+    # Devuelve "pasajeros" y sus estructuras derivadas al estado previo
+    almacen = _almacen(sistema)
+    if almacen is not None:
+        almacen.deshacer()
+        return
+    pasajeros = sistema["pasajeros"]
+    originales = transaccion["originales"]
+    # Primero se quitan todos los estados nuevos y después se ponen los
+    # originales, así una habitación intercambiada no choca consigo misma
+    for documento in originales:
+        actual = pasajeros.get(documento)
+        if actual is not None:
+            _desvincular(sistema, actual)
+            del pasajeros[documento]
+    for documento, original in originales.items():
+        if original is not None:
+            pasajeros[documento] = original
+            _vincular(sistema, original)
+        sistema["versiones"].actualizar(documento, original)
+
+
+def _confirmar_transaccion(sistema: dict, transaccion: dict) -> list:
+    # Persiste todos los cambios de una vez y los anota en el historial, con
+    # el cerrojo de la transacción todavía tomado (sin esperar al escritor en
+    # segundo plano). Todo o nada: si otra terminal escribió desde que empezó
+    # la transacción, se deshace completa y se devuelven todos sus documentos.
+    cambios = transaccion["cambios"]
+    if not cambios:
+        return []
+    config = sistema["persistencia"]
+    almacen = _almacen(sistema)
+    if almacen is not None:
+        # Se confirma con el cerrojo de la transacción todavía tomado
+        almacen.confirmar()
+        for _, *evento in cambios:
+            sistema["historial"].registrar(*evento)
+        return []
+
+    if leer_generacion(ruta_bloqueo(_ruta_sistema(sistema))) != config["generacion"]:
+        # Al fusionar se aplicaría una parte y se descartaría otra
+        _deshacer_transaccion(sistema, transaccion)
+        sincronizar_desde_csv(sistema)
+        return list(dict.fromkeys(documento for _, _, documento, *_ in cambios))
+
+    registros = [registro for registro, *_ in cambios]
+    if config["modo"] == "csv":
+        config["snapshot_pendiente"] = True
+    config["pendientes"].extend(registros)
+    # El historial se anota al escribirlos (ver _anotar_escritos)
+    for registro, *evento in cambios:
+        config["eventos"][id(registro)] = tuple(evento)
+    confirmar_cambios(sistema)
+    rechazados = _separar_conflictos(sistema, registros)
+    return [registro[1 + CAMPOS_CSV.index("documento")] for registro in rechazados]
 
-    habitacion = pasajero.get("habitacion")
-    sistema["habitaciones_ocupadas"].discard(habitacion)
-    sistema["historial"].append(f"DELETE: {documento}")
-    if persistir:
-        guardar_pasajeros_a_csv(sistema)
-    return True
+
+@contextmanager
+def transaccion(sistema: dict):
+    # Agrupa altas, cambios y bajas: dentro del bloque se aplican en memoria
+    # (los choques de habitación y documento se validan contra ese estado) y
+    # al salir se persisten con una sola escritura. Si el bloque lanza una
+    # excepción se deshace todo (pasajeros, habitaciones, índices e
+    # historial); TransaccionCancelada deshace sin propagar el error.
+    # Entrega un dict cuyo "conflictos" queda, al confirmar, con los
+    # documentos que otra terminal invalidó mientras tanto (en ese caso no
+    # se persiste ninguno de los cambios).
+    if sistema.get("transaccion") is not None:
+        yield sistema["transaccion"]  # anidada: es parte de la externa
+        return
+
+    estado = {"originales": {}, "cambios": [], "conflictos": []}
+    with _bloqueo_persistencia(sistema):
+        almacen = _almacen(sistema)
+        if almacen is not None:
+            almacen.confirmar()  # lo anterior no debe deshacerse con esto
+        else:
+            # Se valida contra lo último de disco (como la importación masiva):
+            # con el cerrojo tomado nadie más escribe hasta confirmar
+            sincronizar_desde_csv(sistema)
+        sistema["transaccion"] = estado
+        try:
+            yield estado
+        except BaseException as error:
+            sistema["transaccion"] = None
+            _deshacer_transaccion(sistema, estado)
+            if isinstance(error, TransaccionCancelada):
+                return
+            raise
+        sistema["transaccion"] = None
+        estado["conflictos"] = _confirmar_transaccion(sistema, estado)
+
+
+@medido
+def registrar_grupo(sistema: dict, pasajeros: list) -> list:
+    # Registra un grupo completo o nada. Devuelve los documentos rechazados
+    # (ya registrados, habitación tomada o fechas invertidas); si hay alguno,
+    # no queda registrado ningún pasajero del grupo.
+    with transaccion(sistema) as estado:
+        rechazados = [
+            pasajero.get("documento")
+            for pasajero in pasajeros
+            if not registrar_pasajero(sistema, pasajero)
+        ]
+        if rechazados:
+            raise TransaccionCancelada
+    return rechazados or estado["conflictos"]
 
 
 # -------- FUNCIÓN RECURSIVA --------
@@ -214,7 +1604,8 @@ def buscar_por_habitacion_recursivo(
     habitacion: int,
     indice: int = 0
 ) -> dict | None:
-    # Búsqueda recursiva de pasajero por habitación
+    # Búsqueda recursiva de pasajero por habitación sobre una lista.
+    # Se mantiene por compatibilidad; el sistema usa el índice por habitación.
     if indice >= len(pasajeros):
         return None
 
@@ -228,10 +1619,58 @@ def buscar_por_habitacion_recursivo(
     )
 
 
+@medido
 def buscar_pasajero_por_habitacion(
     sistema: dict,
     habitacion: int
 ) -> dict | None:
-    # Función envolvente para la búsqueda recursiva
-    pasajeros = list(sistema["pasajeros"].values())
-    return buscar_por_habitacion_recursivo(pasajeros, habitacion)
+    # Búsqueda en O(1) usando el índice habitación -> documentos. Si la
+    # habitación tiene reservas futuras, prioriza al pasajero alojado y luego
+    # la estadía que empieza antes.
+    almacen = _almacen(sistema)
+    if almacen is not None:
+        return almacen.buscar_por_habitacion(habitacion)
+    documentos = documentos_en_habitacion(sistema["indices"], habitacion)
+    if not documentos:
+        return None
+    if len(documentos) == 1:
+        return sistema["pasajeros"][next(iter(documentos))]
+
+    def prioridad(pasajero: Pasajero) -> tuple:
+        ingreso = pasajero.ingreso if type(pasajero.ingreso) is int else float("inf")
+        return (pasajero.estado != ESTADO_ALOJADO, ingreso, pasajero.documento)
+
+    return min((sistema["pasajeros"][d] for d in documentos), key=prioridad)
+
+
+def habitacion_disponible(
+    sistema: dict,
+    habitacion: int,
+    fecha_ingreso: str,
+    fecha_salida: str
+) -> bool:
+    # True si la habitación está libre entre fecha_ingreso y fecha_salida
+    almacen = _almacen(sistema)
+    if almacen is not None:
+        return not almacen.choque(habitacion, _dia(fecha_ingreso), _dia(fecha_salida))
+    return sistema["disponibilidad"].libre(
+        habitacion, _dia(fecha_ingreso), _dia(fecha_salida)
+    )
+
+
+def habitaciones_disponibles(
+    sistema: dict,
+    fecha_ingreso: str,
+    fecha_salida: str,
+    habitaciones=None
+) -> list:
+    # Habitaciones libres entre las fechas. Por defecto revisa las que ya
+    # tienen estadías; `habitaciones` permite pasar el inventario completo.
+    almacen = _almacen(sistema)
+    if almacen is not None:
+        return almacen.habitaciones_libres(
+            _dia(fecha_ingreso), _dia(fecha_salida), habitaciones
+        )
+    return sistema["disponibilidad"].habitaciones_libres(
+        _dia(fecha_ingreso), _dia(fecha_salida), habitaciones
+    )
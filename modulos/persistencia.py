@@ -0,0 +1,248 @@
+# Archivo: modulos/persistencia.py
+# Bitácora (journal) de solo anexado: cada cambio se agrega como una línea CSV
+# y el CSV principal queda como la última "foto" (snapshot) del sistema.
+
+from __future__ import annotations
+
+import csv
+import io
+import os
+import tempfile
+import threading
+from collections.abc import Callable
+from contextlib import contextmanager, suppress
+from pathlib import Path
+
+from modulos.metricas import contar
+
+try:
+    import fcntl
+except ImportError:  # Windows: sin cerrojos entre procesos, solo entre hilos
+    fcntl = None
+
+# Tamaño de bitácora a partir del cual conviene reescribir el snapshot
+UMBRAL_COMPACTACION = 1 << 20
+
+# Cada cuánto el escritor en segundo plano agrupa los cambios pendientes
+INTERVALO_ESCRITURA_MS = 200
+
+# Buffer de las escrituras atómicas binarias (exportaciones)
+TAMANO_BUFFER_ESCRITURA = 1 << 20
+
+
+def ruta_journal(ruta_csv: Path) -> Path:
+    # La bitácora vive junto al CSV: datos_prueba.csv -> datos_prueba.journal
+    return ruta_csv.with_suffix(".journal")
+
+
+def ruta_bloqueo(ruta_csv: Path) -> Path:
+    # Archivo de cerrojo y contador de generación: datos_prueba.lock
+    return ruta_csv.with_suffix(".lock")
+
+
+def tamano_journal(ruta: Path) -> int:
+    # Tamaño actual de la bitácora (0 si todavía no existe)
+    try:
+        return ruta.stat().st_size
+    except FileNotFoundError:
+        return 0
+
+
+def anexar_registros(ruta: Path, registros: list) -> int:
+    # Agrega los registros al final con una sola escritura y un solo fsync.
+    # Devuelve el tamaño de la bitácora luego de escribir.
+    buffer = io.StringIO()
+    escritor = csv.writer(buffer, lineterminator="\n")
+    escritor.writerows(registros)
+    datos = buffer.getvalue().encode("utf-8")
+
+    descriptor = os.open(ruta, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+    try:
+        tamano = os.fstat(descriptor).st_size
+        try:
+            os.write(descriptor, datos)
+            os.fsync(descriptor)
+        except OSError:
+            # Sin registros a medias: el próximo intento anexa desde aquí
+            with suppress(OSError):
+                os.ftruncate(descriptor, tamano)
+            raise
+        contar("bytes_escritos", len(datos))
+        return os.fstat(descriptor).st_size
+    finally:
+        os.close(descriptor)
+
+
+def leer_registros(ruta: Path, desplazamiento: int = 0) -> tuple:
+    # Lee registros completos desde un desplazamiento en bytes.
+    # Devuelve (registros, bytes_consumidos); una línea a medio escribir se ignora.
+    try:
+        with ruta.open("rb") as archivo:
+            archivo.seek(desplazamiento)
+            datos = archivo.read()
+    except FileNotFoundError:
+        return [], desplazamiento
+
+    fin = datos.rfind(b"\n") + 1
+    lector = csv.reader(io.StringIO(datos[:fin].decode("utf-8"), newline=""))
+    return [registro for registro in lector if registro], desplazamiento + fin
+
+
+def vaciar_journal(ruta: Path) -> None:
+    # Descarta la bitácora una vez que el snapshot ya contiene sus cambios
+    try:
+        with ruta.open("r+b") as archivo:
+            archivo.truncate(0)
+            archivo.flush()
+            os.fsync(archivo.fileno())
+    except FileNotFoundError:
+        pass
+
+
+def _sincronizar_directorio(directorio: Path) -> None:
+    # Asegura en disco el renombrado (no disponible en todas las plataformas)
+    try:
+        descriptor = os.open(directorio, os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(descriptor)
+    except OSError:
+        pass
+    finally:
+        os.close(descriptor)
+
+
+@contextmanager
+def escritura_atomica(ruta: Path, binario: bool = False):
+    # Escribe en un temporal del mismo directorio, lo sincroniza y lo renombra.
+    # Quien lea el archivo ve la versión anterior completa o la nueva completa.
+    # Con binario=True el archivo es de bytes, con un buffer grande.
+    descriptor, temporal = tempfile.mkstemp(
+        dir=ruta.parent, prefix=f".{ruta.name}.", suffix=".tmp"
+    )
+    try:
+        try:
+            os.chmod(temporal, ruta.stat().st_mode & 0o777)
+        except FileNotFoundError:
+            os.chmod(temporal, 0o644)
+
+        if binario:
+            archivo = os.fdopen(descriptor, "wb", buffering=TAMANO_BUFFER_ESCRITURA)
+        else:
+            archivo = os.fdopen(descriptor, "w", newline="", encoding="utf-8")
+        with archivo:
+            yield archivo
+            archivo.flush()
+            os.fsync(archivo.fileno())
+            contar("bytes_escritos", os.fstat(archivo.fileno()).st_size)
+        os.replace(temporal, ruta)
+    except BaseException:
+        with suppress(FileNotFoundError):
+            os.unlink(temporal)
+        raise
+
+    _sincronizar_directorio(ruta.parent)
+
+
+def leer_generacion(ruta: Path) -> int:
+    # Generación del almacén: sube con cada cambio confirmado por cualquier
+    # terminal, así basta compararla para saber si otro escribió (0 si no hay)
+    try:
+        contenido = ruta.read_bytes()
+    except FileNotFoundError:
+        return 0
+    return int(contenido) if contenido.strip() else 0
+
+
+def incrementar_generacion(ruta: Path) -> int:
+    # Sube la generación en uno y devuelve la nueva (llamar con el cerrojo tomado)
+    generacion = leer_generacion(ruta) + 1
+    descriptor = os.open(ruta, os.O_WRONLY | os.O_CREAT, 0o644)
+    try:
+        os.ftruncate(descriptor, 0)
+        os.write(descriptor, str(generacion).encode("ascii"))
+    finally:
+        os.close(descriptor)
+    return generacion
+
+
+class BloqueoArchivo:
+    # Cerrojo reentrante para hilos y procesos: un RLock para los hilos de este
+    # proceso y un flock exclusivo (advisory) sobre el archivo .lock para las
+    # demás terminales. `obtener_ruta` se evalúa al tomar el cerrojo.
+
+    def __init__(self, obtener_ruta: Callable[[], Path]) -> None:
+        self._obtener_ruta = obtener_ruta
+        self._hilos = threading.RLock()
+        self._nivel = 0
+        self._descriptor = None
+
+    @property
+    def hilos(self) -> threading.RLock:
+        # Solo el cerrojo entre hilos de este proceso, sin tocar el archivo
+        return self._hilos
+
+    def __enter__(self) -> BloqueoArchivo:
+        self._hilos.acquire()
+        if self._nivel == 0 and fcntl is not None:
+            try:
+                descriptor = os.open(
+                    self._obtener_ruta(), os.O_RDWR | os.O_CREAT, 0o644
+                )
+                fcntl.flock(descriptor, fcntl.LOCK_EX)
+            except BaseException:
+                self._hilos.release()
+                raise
+            self._descriptor = descriptor
+        self._nivel += 1
+        return self
+
+    def __exit__(self, *_) -> None:
+        self._nivel -= 1
+        if self._nivel == 0 and self._descriptor is not None:
+            fcntl.flock(self._descriptor, fcntl.LOCK_UN)
+            os.close(self._descriptor)
+            self._descriptor = None
+        self._hilos.release()
+
+
+class EscritorEnSegundoPlano(threading.Thread):
+    # Hilo que junta ráfagas de cambios y los escribe una vez cada intervalo,
+    # para que el menú interactivo no espere al disco.
+
+    def __init__(
+        self,
+        escribir: Callable[[], object],
+        intervalo_ms: int = INTERVALO_ESCRITURA_MS
+    ) -> None:
+        super().__init__(name="escritor-pasajeros", daemon=True)
+        self._escribir = escribir
+        self._intervalo = intervalo_ms / 1000
+        self._aviso = threading.Event()
+        self._detenido = threading.Event()
+        self.error: BaseException | None = None
+
+    def avisar(self) -> None:
+        # Indica que hay cambios pendientes por escribir
+        self._aviso.set()
+
+    def run(self) -> None:
+        while not self._detenido.is_set():
+            self._aviso.wait()
+            # Espera el intervalo para agrupar los cambios que sigan llegando
+            self._detenido.wait(self._intervalo)
+            self._aviso.clear()
+            try:
+                self._escribir()
+            except Exception as error:
+                # Los cambios quedan pendientes: se reintenta al siguiente
+                # intervalo y el menú informa el error (tomar_error_escritura)
+                self.error = error
+                self._aviso.set()
+
+    def detener(self) -> None:
+        # Termina el hilo; la escritura final la hace quien lo detiene
+        self._detenido.set()
+        self._aviso.set()
+        self.join()
@@ -1,14 +1,186 @@
 # modulos/reportes.py
-# Funciones relacionadas con reportes y visualización de información
+# Funciones relacionadas con reportes y visualización de información.
+# Agregados guarda los totales del reporte de ocupación ya calculados: las
+# altas y bajas de pasajeros los ajustan en O(1), así leer el reporte no
+# recorre los pasajeros.
 
-def mostrar_historial(sistema: dict) -> None:
-    # Muestra el historial de acciones del sistema
-    historial = sistema.get("historial", [])
+from modulos.metricas import contadores, metricas_activas, resumen
 
-    if not historial:
-        print("No hay acciones registradas.")
+# Estado de quien ocupa hoy la habitación
+ESTADO_ALOJADO = "Alojado"
+
+
+def _sumar(contador: dict, clave, cantidad: int) -> None:
+    # Suma al contador y borra la clave al llegar a cero, así dos Agregados
+    # con los mismos pasajeros son iguales sin importar el orden de los cambios
+    total = contador.get(clave, 0) + cantidad
+    if total:
+        contador[clave] = total
+    else:
+        del contador[clave]
+
+
+class Agregados:
+    # Totales mantenidos en línea con "pasajeros":
+    #   pasajeros: cantidad total
+    #   por_estado, por_nacionalidad: conteos
+    #   alojados_por_nacionalidad: solo con estado Alojado
+    #   por_habitacion: pasajeros (estadías) por habitación
+    #   alojados_por_habitacion: pasajeros Alojado por habitación
+    #   llegadas, salidas: día (ordinal) -> cantidad de ingresos / salidas
+
+    CONTADORES = (
+        "por_estado",
+        "por_nacionalidad",
+        "alojados_por_nacionalidad",
+        "por_habitacion",
+        "alojados_por_habitacion",
+        "llegadas",
+        "salidas",
+    )
+
+    def __init__(self) -> None:
+        self.limpiar()
+
+    def limpiar(self) -> None:
+        self.pasajeros = 0
+        for nombre in self.CONTADORES:
+            setattr(self, nombre, {})
+
+    def _aplicar(self, pasajero, cantidad: int) -> None:
+        # Suma (cantidad=1) o resta (cantidad=-1) un pasajero de los totales
+        self.pasajeros += cantidad
+        estado = pasajero.estado
+        _sumar(self.por_estado, estado, cantidad)
+        _sumar(self.por_nacionalidad, pasajero.nacionalidad, cantidad)
+        _sumar(self.por_habitacion, pasajero.habitacion, cantidad)
+        if estado == ESTADO_ALOJADO:
+            _sumar(self.alojados_por_nacionalidad, pasajero.nacionalidad, cantidad)
+            _sumar(self.alojados_por_habitacion, pasajero.habitacion, cantidad)
+        if type(pasajero.ingreso) is int:
+            _sumar(self.llegadas, pasajero.ingreso, cantidad)
+        if type(pasajero.salida) is int:
+            _sumar(self.salidas, pasajero.salida, cantidad)
+
+    def agregar(self, pasajero) -> None:
+        self._aplicar(pasajero, 1)
+
+    def quitar(self, pasajero) -> None:
+        self._aplicar(pasajero, -1)
+
+    @classmethod
+    def recalcular(cls, pasajeros) -> "Agregados":
+        # Totales calculados desde cero (para verificar los mantenidos)
+        agregados = cls()
+        for pasajero in pasajeros:
+            agregados.agregar(pasajero)
+        return agregados
+
+    @classmethod
+    def desde_totales(cls, totales: dict) -> "Agregados":
+        # Totales ya contados en otra parte (p. ej. con GROUP BY en SQLite)
+        agregados = cls()
+        agregados.pasajeros = totales["pasajeros"]
+        for nombre in cls.CONTADORES:
+            setattr(agregados, nombre, totales[nombre])
+        return agregados
+
+    def __eq__(self, otro) -> bool:
+        if not isinstance(otro, Agregados):
+            return NotImplemented
+        return self.pasajeros == otro.pasajeros and all(
+            getattr(self, nombre) == getattr(otro, nombre) for nombre in self.CONTADORES
+        )
+
+    def reporte(
+        self,
+        dia: int,
+        habitaciones: int | None = None,
+        ocupadas: int | None = None
+    ) -> dict:
+        # Reporte de ocupación para el día `dia` (ordinal). `habitaciones` es
+        # el inventario del hotel; por defecto, las habitaciones con estadías.
+        # `ocupadas` son las habitaciones ocupadas ese día (las estadías no
+        # están en los agregados); por defecto, las que hoy tienen a alguien
+        # Alojado. El costo depende de cuántos estados y nacionalidades hay,
+        # no de cuántos pasajeros.
+        total = habitaciones if habitaciones is not None else len(self.por_habitacion)
+        if ocupadas is None:
+            ocupadas = len(self.alojados_por_habitacion)
+        return {
+            "pasajeros": self.pasajeros,
+            "por_estado": dict(sorted(self.por_estado.items(), key=_orden_conteo)),
+            "por_nacionalidad": dict(sorted(self.por_nacionalidad.items(), key=_orden_conteo)),
+            "alojados_por_nacionalidad": dict(
+                sorted(self.alojados_por_nacionalidad.items(), key=_orden_conteo)
+            ),
+            "habitaciones": total,
+            "habitaciones_ocupadas": ocupadas,
+            "tasa_ocupacion": round(ocupadas / total, 4) if total else 0.0,
+            "llegadas": self.llegadas.get(dia, 0),
+            "salidas": self.salidas.get(dia, 0),
+        }
+
+
+def _orden_conteo(item: tuple) -> tuple:
+    # Mayor cantidad primero; a igual cantidad, por nombre
+    clave, cantidad = item
+    return -cantidad, str(clave)
+
+
+def mostrar_historial(sistema: dict, pagina: int = 1, tamano: int = 20) -> bool:
+    # Muestra una página del historial, de la acción más reciente a la más
+    # antigua (primero lo que está en memoria y luego el registro de
+    # auditoría). Devuelve True si quedan acciones más antiguas por ver.
+    eventos, quedan_mas = sistema["historial"].pagina(pagina, tamano)
+
+    if not eventos:
+        if pagina == 1:
+            print("No hay acciones registradas.")
+        return False
+
+    print(f"\n--- Historial de acciones (página {pagina}) ---")
+    for evento in eventos:
+        print(evento)
+    return quedan_mas
+
+
+def mostrar_metricas() -> None:
+    # Muestra las latencias por operación y los contadores de E/S
+    if not metricas_activas():
+        print("Las métricas están desactivadas (iniciar con HOTEL_METRICAS=1).")
+        return
+
+    filas = resumen()
+    if not filas:
+        print("Todavía no hay mediciones.")
         return
 
-    print("\n--- Historial de acciones ---")
-    for accion in historial:
-        print(accion)
\ No newline at end of file
+    print("\n--- Métricas de rendimiento ---")
+    print(f"{'operación':<32} {'llamadas':>9} {'prom. ms':>9} {'p50 ms':>8} {'p95 ms':>8}")
+    for operacion, llamadas, promedio, p50, p95 in filas:
+        print(f"{operacion:<32} {llamadas:>9} {promedio:>9.3f} {p50:>8.2f} {p95:>8.2f}")
+    for nombre, total in sorted(contadores().items()):
+        print(f"{nombre}: {total:,}")
+
+
+def mostrar_reporte(reporte: dict) -> None:
+    # Muestra el reporte de ocupación (ver reporte_ocupacion en operaciones.py)
+    print(f"\n--- Reporte de ocupación ({reporte['fecha']}) ---")
+    print(f"Pasajeros registrados: {reporte['pasajeros']}")
+    print(
+        f"Habitaciones ocupadas: {reporte['habitaciones_ocupadas']} de "
+        f"{reporte['habitaciones']} ({reporte['tasa_ocupacion']:.1%})"
+    )
+    print(f"Llegadas del día: {reporte['llegadas']} | Salidas del día: {reporte['salidas']}")
+    print("Por estado:")
+    for estado, cantidad in reporte["por_estado"].items():
+        print(f"  {estado}: {cantidad}")
+    print("Alojados por nacionalidad:")
+    for nacionalidad, cantidad in reporte["alojados_por_nacionalidad"].items():
+        print(f"  {nacionalidad}: {cantidad}")
+    if "verificado" in reporte:
+        if reporte["verificado"]:
+            print("Verificado contra un recálculo completo: coincide.")
+        else:
+            print("Atención: los totales no coinciden con un recálculo completo.")
@@ -1,35 +1,54 @@
 # modulos/rut.py
 # Validación de RUT chileno (cálculo y verificación del dígito verificador)
 
+from itertools import cycle
+from operator import getitem, mul
+
+from modulos.cache import cache_lru
+
+# RUT validados que se recuerdan (ver validar_rut.estadisticas())
+TAMANO_CACHE_RUT = 100_000
+
+
+def es_cuerpo_rut(cuerpo: str) -> bool:
+    # Solo dígitos ASCII: isdigit() también acepta "²" o "١", que no son RUT
+    # (y "²" ni siquiera pasa por int()).
+    return cuerpo.isascii() and cuerpo.isdigit()
+
 
 def limpiar_rut(rut: str) -> str:
     # Elimina puntos, guion y espacios; deja solo números + K si existe.
     return rut.strip().replace(".", "").replace("-", "").upper()
 
 
-def calcular_dv(cuerpo_rut: str) -> str:
-    # Calcula el dígito verificador (DV) del RUT a partir del cuerpo (sin DV).
-    suma = 0
-    multiplicador = 2
-
-    for digito in reversed(cuerpo_rut):
-        suma += int(digito) * multiplicador
-        multiplicador += 1
+# Pesos del módulo 11, aplicados de derecha a izquierda y en ciclo
+_PESOS = (2, 3, 4, 5, 6, 7)
 
-        if multiplicador > 7:
-            multiplicador = 2
+# Tabla por posición (desde la derecha): carácter -> dígito * peso
+_PRODUCTOS = tuple(
+    {str(digito): digito * _PESOS[posicion % len(_PESOS)] for digito in range(10)}
+    for posicion in range(24)
+)
 
-    resto = 11 - (suma % 11)
-
-    if resto == 11:
-        return "0"
-    if resto == 10:
-        return "K"
-    return str(resto)
+# DV según (suma % 11): 0 -> "0", 1 -> "K", 2 -> "9", ..., 10 -> "1"
+_DV_POR_RESTO = "0K987654321"
 
 
+def calcular_dv(cuerpo_rut: str) -> str:
+    # Calcula el dígito verificador (DV) del RUT a partir del cuerpo (sin DV),
+    # que debe pasar es_cuerpo_rut(). La suma ponderada sale de tablas
+    # precalculadas por posición; cuerpos más largos que las tablas se suman
+    # con int().
+    if len(cuerpo_rut) <= len(_PRODUCTOS):
+        suma = sum(map(getitem, _PRODUCTOS, reversed(cuerpo_rut)))
+    else:
+        suma = sum(map(mul, map(int, reversed(cuerpo_rut)), cycle(_PESOS)))
+    return _DV_POR_RESTO[suma % 11]
+
+
+@cache_lru(TAMANO_CACHE_RUT)
 def validar_rut(rut: str) -> bool:
-    # Verifica que el DV ingresado coincida con el DV calculado.
+    # Verifica que el DV ingresado coincida con el DV calculado (memorizado).
     rut_limpio = limpiar_rut(rut)
 
     if len(rut_limpio) < 2:
@@ -38,7 +57,7 @@ def validar_rut(rut: str) -> bool:
     cuerpo = rut_limpio[:-1]
     dv_ingresado = rut_limpio[-1]
 
-    if not cuerpo.isdigit():
+    if not es_cuerpo_rut(cuerpo):
         return False
 
     if dv_ingresado not in "0123456789K":
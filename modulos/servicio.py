@@ -0,0 +1,426 @@
+# Archivo: modulos/servicio.py
+# Servicio HTTP/JSON con asyncio (solo biblioteca estándar) sobre las
+# operaciones del sistema, para integraciones y varios recepcionistas a la vez.
+# Las conexiones se mantienen abiertas (keep-alive) y las escrituras a disco se
+# agrupan por lote y corren fuera del bucle de eventos.
+#
+#   POST   /pasajeros                 registrar (cuerpo JSON con el pasajero)
+#   GET    /pasajeros?limite=&cursor=&orden=&estado=...   listar (paginado)
+#   GET    /pasajeros/<documento>     buscar por documento
+#   PATCH  /pasajeros/<documento>     actualizar (cuerpo JSON con los cambios)
+#   DELETE /pasajeros/<documento>     eliminar
+#   GET    /habitaciones/<numero>     buscar pasajero por habitación
+#   GET    /reporte?fecha=&verificar= reporte de ocupación (agregados mantenidos)
+#   GET    /metricas                  métricas en texto Prometheus (HOTEL_METRICAS=1)
+
+from __future__ import annotations
+
+import asyncio
+import json
+from urllib.parse import parse_qs, unquote, urlsplit
+
+from modulos.comandos import CONVERSIONES
+from modulos.documentos import normalizar_documento
+from modulos.metricas import metricas_activas, texto_prometheus
+from modulos.operaciones import (
+    ACCION_ACTUALIZAR,
+    ACCION_ELIMINAR,
+    ACCION_REGISTRAR,
+    CAMPOS_PASAJERO,
+    actualizar_pasajero,
+    buscar_pasajero_por_habitacion,
+    buscar_por_documento,
+    cerrar_persistencia,
+    confirmar_cambios,
+    eliminar_pasajero,
+    pagina_pasajeros,
+    registrar_pasajero,
+    reporte_ocupacion,
+    sincronizar_desde_csv,
+    tomar_conflictos,
+)
+from modulos.validaciones import es_entero_positivo
+
+HOST_POR_DEFECTO = "127.0.0.1"
+PUERTO_POR_DEFECTO = 8080
+
+# Cada cuánto el servicio incorpora lo que escribieron otras terminales
+INTERVALO_SINCRONIZACION_S = 1.0
+
+# Pasajeros por página del listado si no se pide otro límite
+LIMITE_PAGINA = 100
+
+# Límite del cuerpo de una petición
+TAMANO_MAXIMO_CUERPO = 1 << 20
+
+_MOTIVOS = {
+    200: "OK",
+    201: "Created",
+    204: "No Content",
+    400: "Bad Request",
+    404: "Not Found",
+    405: "Method Not Allowed",
+    409: "Conflict",
+    413: "Payload Too Large",
+    500: "Internal Server Error",
+}
+
+
+class ErrorHTTP(Exception):
+    # Error que se responde al cliente con su código y un mensaje JSON
+
+    def __init__(self, codigo: int, mensaje: str) -> None:
+        super().__init__(mensaje)
+        self.codigo = codigo
+        self.mensaje = mensaje
+
+
+class LoteDeEscrituras:
+    # Reemplaza al escritor en segundo plano dentro del servicio: los cambios
+    # de todas las peticiones que llegan mientras se escribe el lote anterior
+    # se confirman juntos (un fsync por lote) en un hilo del ejecutor. Cada
+    # petición responde recién cuando su cambio quedó en disco. `cerrojo`
+    # evita que el bucle modifique la memoria mientras el hilo confirma (al
+    # confirmar puede recargar lo escrito por otras terminales).
+
+    def __init__(self, sistema: dict) -> None:
+        self.sistema = sistema
+        self.error: BaseException | None = None
+        self.cerrojo = asyncio.Lock()
+        self._esperando = []
+        self._tarea = None
+
+    def avisar(self) -> None:
+        # Llamado por operaciones al encolar un cambio (ver _persistir)
+        pass
+
+    async def confirmar(self, accion: str, documento: str) -> bool:
+        # Espera a que el lote que incluye este cambio se escriba. Devuelve
+        # False si al confirmar otra terminal ya lo había invalidado.
+        futuro = asyncio.get_running_loop().create_future()
+        self._esperando.append((accion, documento, futuro))
+        if self._tarea is None:
+            self._tarea = asyncio.create_task(self._escribir_lotes())
+        return await futuro
+
+    async def _escribir_lotes(self) -> None:
+        bucle = asyncio.get_running_loop()
+        while self._esperando:
+            # Deja correr a las peticiones ya listas para que entren al lote
+            await asyncio.sleep(0)
+            async with self.cerrojo:
+                lote, self._esperando = self._esperando, []
+                try:
+                    await bucle.run_in_executor(None, confirmar_cambios, self.sistema)
+                except Exception as error:
+                    self.error = error
+                    for _, _, futuro in lote:
+                        futuro.set_exception(error)
+                    continue
+                rechazados = set(tomar_conflictos(self.sistema))
+            for accion, documento, futuro in lote:
+                futuro.set_result((accion, documento) not in rechazados)
+        self._tarea = None
+
+    def detener(self) -> None:
+        # La escritura final la hace cerrar_persistencia
+        pass
+
+
+# -------- PROTOCOLO HTTP --------
+
+async def _leer_peticion(lector: asyncio.StreamReader) -> tuple | None:
+    # Lee una petición completa. Devuelve (método, ruta, consulta, cabeceras,
+    # cuerpo) o None si el cliente cerró la conexión.
+    try:
+        cabecera = await lector.readuntil(b"\r\n\r\n")
+    except asyncio.IncompleteReadError:
+        return None
+    lineas = cabecera.decode("latin-1").split("\r\n")
+    try:
+        metodo, destino, version = lineas[0].split(" ", 2)
+    except ValueError:
+        raise ErrorHTTP(400, "Línea de petición inválida") from None
+
+    cabeceras = {"_version": version}
+    for linea in lineas[1:]:
+        if ":" in linea:
+            nombre, valor = linea.split(":", 1)
+            cabeceras[nombre.strip().lower()] = valor.strip()
+
+    largo = int(cabeceras.get("content-length", "0") or 0)
+    if largo > TAMANO_MAXIMO_CUERPO:
+        raise ErrorHTTP(413, "Cuerpo demasiado grande")
+    cuerpo = await lector.readexactly(largo) if largo else b""
+
+    partes = urlsplit(destino)
+    return metodo.upper(), unquote(partes.path), partes.query, cabeceras, cuerpo
+
+
+def _mantener_abierta(cabeceras: dict) -> bool:
+    # HTTP/1.1 mantiene la conexión salvo "Connection: close"; HTTP/1.0 al revés
+    conexion = cabeceras.get("connection", "").lower()
+    if cabeceras.get("_version") == "HTTP/1.0":
+        return conexion == "keep-alive"
+    return conexion != "close"
+
+
+def _respuesta(codigo: int, datos=None, mantener: bool = True) -> bytes:
+    # Los datos se envían como JSON; un texto (p. ej. /metricas) va tal cual
+    if isinstance(datos, str):
+        cuerpo, tipo = datos.encode(), "text/plain; version=0.0.4; charset=utf-8"
+    else:
+        cuerpo = b"" if datos is None else json.dumps(datos, ensure_ascii=False).encode()
+        tipo = "application/json; charset=utf-8"
+    cabecera = (
+        f"HTTP/1.1 {codigo} {_MOTIVOS.get(codigo, '')}\r\n"
+        f"Content-Type: {tipo}\r\n"
+        f"Content-Length: {len(cuerpo)}\r\n"
+        f"Connection: {'keep-alive' if mantener else 'close'}\r\n\r\n"
+    )
+    return cabecera.encode("ascii") + cuerpo
+
+
+# -------- RUTAS --------
+
+def _leer_json(cuerpo: bytes) -> dict:
+    try:
+        datos = json.loads(cuerpo or b"{}")
+    except ValueError:
+        raise ErrorHTTP(400, "JSON inválido") from None
+    if not isinstance(datos, dict):
+        raise ErrorHTTP(400, "Se esperaba un objeto JSON")
+    return datos
+
+
+def _validar_campos(datos: dict, obligatorios: bool) -> dict:
+    # Revisa los campos del pasajero con las mismas conversiones del menú y
+    # del modo por lotes, y devuelve una copia normalizada. En JSON la
+    # habitación es un número y el resto de los campos, texto.
+    desconocidos = set(datos) - set(CAMPOS_PASAJERO)
+    if desconocidos:
+        raise ErrorHTTP(400, f"Campos desconocidos: {', '.join(sorted(desconocidos))}")
+    if obligatorios:
+        for campo in ("nombre", "documento", "habitacion"):
+            if not datos.get(campo):
+                raise ErrorHTTP(400, f"Falta el campo {campo}")
+
+    limpio = {}
+    for campo, valor in datos.items():
+        tipo = int if campo == "habitacion" else str
+        if type(valor) is not tipo:
+            raise ErrorHTTP(400, f"{campo}: debe ser {'un número' if tipo is int else 'texto'}")
+        try:
+            limpio[campo] = CONVERSIONES[campo](valor)
+        except ValueError as error:
+            raise ErrorHTTP(400, f"{campo}: {error}") from None
+    return limpio
+
+
+def _listar(sistema: dict, consulta: str) -> dict:
+    # Página del listado según la consulta (?limite=&cursor=&orden=&descendente=
+    # y los filtros de iterar_pasajeros)
+    parametros = {clave: valores[-1] for clave, valores in parse_qs(consulta).items()}
+    try:
+        limite = int(parametros.pop("limite", LIMITE_PAGINA))
+        for campo in ("habitacion_desde", "habitacion_hasta"):
+            if campo in parametros:
+                parametros[campo] = int(parametros[campo])
+        descendente = parametros.pop("descendente", "") in ("1", "true", "si")
+        pagina, siguiente = pagina_pasajeros(
+            sistema,
+            limite=limite,
+            cursor=parametros.pop("cursor", None),
+            orden=parametros.pop("orden", "documento"),
+            descendente=descendente,
+            **parametros,
+        )
+    except (TypeError, ValueError) as error:
+        raise ErrorHTTP(400, str(error)) from None
+    return {"pasajeros": [dict(p) for p in pagina], "siguiente": siguiente}
+
+
+def _pasajero_o_404(sistema: dict, documento: str) -> dict:
+    pasajero = buscar_por_documento(sistema, documento)
+    if pasajero is None:
+        raise ErrorHTTP(404, "Pasajero no encontrado")
+    return pasajero
+
+
+async def _en_hilo(funcion, *argumentos):
+    # Corre una operación que toma el cerrojo entre terminales (flock) o
+    # escribe en disco fuera del bucle de eventos
+    return await asyncio.get_running_loop().run_in_executor(None, funcion, *argumentos)
+
+
+async def _atender(
+    sistema: dict,
+    lote: LoteDeEscrituras,
+    metodo: str,
+    ruta: str,
+    consulta: str,
+    cuerpo: bytes
+) -> tuple:
+    # Ejecuta la operación de la ruta y devuelve (código, datos). Toda lectura
+    # o cambio del sistema se hace con lote.cerrojo tomado: así no se cruza
+    # con la recarga de _sincronizar_periodicamente (que reconstruye los
+    # diccionarios) ni con la escritura de un lote.
+    partes = [parte for parte in ruta.split("/") if parte]
+
+    if partes == ["pasajeros"]:
+        if metodo == "GET":
+            async with lote.cerrojo:
+                return 200, _listar(sistema, consulta)
+        if metodo == "POST":
+            pasajero = _validar_campos(_leer_json(cuerpo), obligatorios=True)
+            async with lote.cerrojo:
+                registrado = await _en_hilo(registrar_pasajero, sistema, pasajero)
+            if not registrado:
+                raise ErrorHTTP(
+                    409, "Documento duplicado, habitación ocupada o salida anterior al ingreso"
+                )
+            if not await lote.confirmar(ACCION_REGISTRAR, pasajero["documento"]):
+                raise ErrorHTTP(409, "Otra terminal ocupó la habitación")
+            async with lote.cerrojo:
+                return 201, dict(_pasajero_o_404(sistema, pasajero["documento"]))
+        raise ErrorHTTP(405, "Método no permitido")
+
+    if len(partes) == 2 and partes[0] == "pasajeros":
+        documento = normalizar_documento(partes[1]) or partes[1]
+        if metodo == "GET":
+            async with lote.cerrojo:
+                return 200, dict(_pasajero_o_404(sistema, documento))
+        if metodo in ("PATCH", "PUT"):
+            cambios = _validar_campos(_leer_json(cuerpo), obligatorios=False)
+            cambios.pop("documento", None)
+            async with lote.cerrojo:
+                _pasajero_o_404(sistema, documento)
+                actualizado = await _en_hilo(actualizar_pasajero, sistema, documento, cambios)
+            if not actualizado:
+                raise ErrorHTTP(409, "Habitación ocupada o salida anterior al ingreso")
+            if not await lote.confirmar(ACCION_ACTUALIZAR, documento):
+                raise ErrorHTTP(409, "Otra terminal modificó al pasajero")
+            async with lote.cerrojo:
+                return 200, dict(_pasajero_o_404(sistema, documento))
+        if metodo == "DELETE":
+            async with lote.cerrojo:
+                eliminado = await _en_hilo(eliminar_pasajero, sistema, documento)
+            if not eliminado:
+                raise ErrorHTTP(404, "Pasajero no encontrado")
+            await lote.confirmar(ACCION_ELIMINAR, documento)
+            return 204, None
+        raise ErrorHTTP(405, "Método no permitido")
+
+    if len(partes) == 2 and partes[0] == "habitaciones" and metodo == "GET":
+        if not es_entero_positivo(partes[1]):
+            raise ErrorHTTP(400, "La habitación debe ser un entero positivo")
+        async with lote.cerrojo:
+            pasajero = buscar_pasajero_por_habitacion(sistema, int(partes[1]))
+        if pasajero is None:
+            raise ErrorHTTP(404, "No hay pasajero asignado a esa habitación")
+        return 200, dict(pasajero)
+
+    if partes == ["reporte"] and metodo == "GET":
+        # ?fecha=dd-mm-yyyy&habitaciones=N&verificar=1
+        parametros = {clave: valores[-1] for clave, valores in parse_qs(consulta).items()}
+        try:
+            habitaciones = parametros.get("habitaciones")
+            async with lote.cerrojo:
+                return 200, reporte_ocupacion(
+                    sistema,
+                    parametros.get("fecha"),
+                    None if habitaciones is None else int(habitaciones),
+                    parametros.get("verificar", "") in ("1", "true", "si"),
+                )
+        except ValueError as error:
+            raise ErrorHTTP(400, str(error)) from None
+
+    if partes == ["metricas"] and metodo == "GET":
+        if not metricas_activas():
+            raise ErrorHTTP(404, "Métricas desactivadas (HOTEL_METRICAS=1)")
+        return 200, texto_prometheus()
+
+    raise ErrorHTTP(404, "Ruta no encontrada")
+
+
+async def _conexion(
+    sistema: dict,
+    lote: LoteDeEscrituras,
+    lector: asyncio.StreamReader,
+    escritor: asyncio.StreamWriter
+) -> None:
+    # Atiende peticiones de una conexión hasta que el cliente la cierre
+    try:
+        while True:
+            try:
+                peticion = await _leer_peticion(lector)
+            except (ErrorHTTP, ValueError, asyncio.LimitOverrunError) as error:
+                codigo = error.codigo if isinstance(error, ErrorHTTP) else 400
+                escritor.write(_respuesta(codigo, {"error": str(error)}, False))
+                await escritor.drain()
+                break
+            if peticion is None:
+                break
+
+            metodo, ruta, consulta, cabeceras, cuerpo = peticion
+            mantener = _mantener_abierta(cabeceras)
+            try:
+                codigo, datos = await _atender(
+                    sistema, lote, metodo, ruta, consulta, cuerpo
+                )
+            except ErrorHTTP as error:
+                codigo, datos = error.codigo, {"error": error.mensaje}
+            except Exception as error:  # p. ej. el disco falló al confirmar
+                codigo, datos = 500, {"error": str(error)}
+            escritor.write(_respuesta(codigo, datos, mantener))
+            await escritor.drain()
+            if not mantener:
+                break
+    except ConnectionError:
+        pass
+    finally:
+        escritor.close()
+
+
+async def _sincronizar_periodicamente(sistema: dict, lote: LoteDeEscrituras) -> None:
+    # Incorpora lo confirmado por otras terminales sin bloquear el bucle
+    bucle = asyncio.get_running_loop()
+    while True:
+        await asyncio.sleep(INTERVALO_SINCRONIZACION_S)
+        async with lote.cerrojo:
+            await bucle.run_in_executor(None, sincronizar_desde_csv, sistema)
+
+
+async def iniciar_servicio(
+    sistema: dict,
+    host: str = HOST_POR_DEFECTO,
+    puerto: int = PUERTO_POR_DEFECTO
+) -> asyncio.Server:
+    # Abre el servidor y devuelve el asyncio.Server (puerto 0 = uno libre)
+    lote = LoteDeEscrituras(sistema)
+    sistema["persistencia"]["escritor"] = lote
+    return await asyncio.start_server(
+        lambda lector, escritor: _conexion(sistema, lote, lector, escritor),
+        host,
+        puerto,
+    )
+
+
+async def servir(
+    sistema: dict,
+    host: str = HOST_POR_DEFECTO,
+    puerto: int = PUERTO_POR_DEFECTO
+) -> None:
+    # Atiende peticiones hasta que se interrumpa (Ctrl+C) y luego deja todo en disco
+    servidor = await iniciar_servicio(sistema, host, puerto)
+    sincronizacion = asyncio.create_task(
+        _sincronizar_periodicamente(sistema, sistema["persistencia"]["escritor"])
+    )
+    direccion = servidor.sockets[0].getsockname()
+    print(f"Servicio escuchando en http://{direccion[0]}:{direccion[1]}")
+    try:
+        async with servidor:
+            await servidor.serve_forever()
+    finally:
+        sincronizacion.cancel()
+        cerrar_persistencia(sistema)
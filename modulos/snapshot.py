@@ -0,0 +1,157 @@
+# Archivo: modulos/snapshot.py
+# Caché binaria del CSV para arrancar rápido: junto a datos_prueba.csv se
+# guarda datos_prueba.snapshot con los pasajeros ya convertidos (textos en
+# una tabla única y columnas de enteros empaquetadas con array). La caché se
+# identifica con la huella del CSV (mtime, tamaño, inodo) y lleva un CRC; si
+# no coincide o está dañada se ignora y se vuelve a leer el CSV.
+#
+# Formato (little endian):
+#   cabecera   CABECERA (mágico, versión, huella del CSV, filas, largos, CRC)
+#   meta       JSON: {"consumido", "encabezado", "completo"} de la lectura
+#   posiciones array("q") con el inicio de cada texto (más el final)
+#   textos     todos los textos distintos concatenados (UTF-8)
+#   columnas   7 array("q") de `filas` valores, en el orden de Pasajero.__slots__
+# Cada valor de columna es v << 1 para un entero v, (i << 1) | 1 para el
+# texto i de la tabla y VACIO para None.
+
+from __future__ import annotations
+
+import json
+import mmap
+import os
+import struct
+import tempfile
+import zlib
+from array import array
+from contextlib import suppress
+from pathlib import Path
+
+MAGICO = b"HOTELSNP"
+VERSION_FORMATO = 1
+
+# mágico, versión, mtime_ns, tamaño, inodo, filas, textos, bytes de meta,
+# bytes de textos, CRC32 de todo lo que sigue a la cabecera
+CABECERA = struct.Struct("<8sIqqqqqqqI")
+
+# Cantidad de columnas por pasajero (Pasajero.__slots__)
+COLUMNAS = 7
+
+# Valor de columna para "sin dato"
+VACIO = -1
+
+# Con menos filas el CSV se lee tan rápido que no vale la pena la caché
+MINIMO_FILAS_SNAPSHOT = 5_000
+
+
+def ruta_snapshot(ruta_csv: Path) -> Path:
+    # La caché vive junto al CSV: datos_prueba.csv -> datos_prueba.snapshot
+    return ruta_csv.with_suffix(".snapshot")
+
+
+def escribir_snapshot(ruta: Path, firma: tuple, lectura: dict, filas: list) -> None:
+    # Guarda `filas` (tuplas de COLUMNAS valores: None, int o str) asociadas a
+    # la huella `firma` del CSV. Se escribe en un temporal y se renombra.
+    indices = {}
+    columnas = [array("q", bytes(8 * len(filas))) for _ in range(COLUMNAS)]
+    for numero, valores in enumerate(filas):
+        for columna, valor in zip(columnas, valores):
+            if valor is None:
+                columna[numero] = VACIO
+            elif type(valor) is int:
+                columna[numero] = valor << 1
+            else:
+                indice = indices.get(valor)
+                if indice is None:
+                    indice = indices[valor] = len(indices)
+                columna[numero] = (indice << 1) | 1
+
+    textos = "".join(indices)
+    posiciones = array("q", [0])
+    for texto in indices:
+        posiciones.append(posiciones[-1] + len(texto))
+    meta = json.dumps(lectura).encode("utf-8")
+    datos_textos = textos.encode("utf-8")
+
+    cuerpo = [meta, posiciones.tobytes(), datos_textos]
+    cuerpo += [columna.tobytes() for columna in columnas]
+    crc = 0
+    for parte in cuerpo:
+        crc = zlib.crc32(parte, crc)
+    cabecera = CABECERA.pack(
+        MAGICO, VERSION_FORMATO, *firma, len(filas), len(indices),
+        len(meta), len(datos_textos), crc,
+    )
+
+    descriptor, temporal = tempfile.mkstemp(
+        dir=ruta.parent, prefix=f".{ruta.name}.", suffix=".tmp"
+    )
+    try:
+        with os.fdopen(descriptor, "wb") as archivo:
+            archivo.write(cabecera)
+            for parte in cuerpo:
+                archivo.write(parte)
+        os.replace(temporal, ruta)
+    except BaseException:
+        with suppress(FileNotFoundError):
+            os.unlink(temporal)
+        raise
+
+
+def leer_snapshot(ruta: Path, firma: tuple) -> tuple | None:
+    # (lectura, columnas) si la caché corresponde a `firma` y está íntegra;
+    # None en cualquier otro caso. `columnas` son COLUMNAS listas de valores.
+    try:
+        archivo = ruta.open("rb")
+    except FileNotFoundError:
+        return None
+    with archivo:
+        try:
+            mapa = mmap.mmap(archivo.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:  # archivo vacío
+            return None
+    with mapa:
+        return _decodificar(memoryview(mapa), firma)
+
+
+def _decodificar(datos: memoryview, firma: tuple) -> tuple | None:
+    try:
+        (magico, version, mtime, tamano, inodo, filas, cantidad_textos,
+         largo_meta, largo_textos, crc) = CABECERA.unpack_from(datos)
+    except struct.error:
+        return None
+    if magico != MAGICO or version != VERSION_FORMATO:
+        return None
+    if (mtime, tamano, inodo) != tuple(firma):
+        return None
+
+    inicio = CABECERA.size
+    esperado = largo_meta + 8 * (cantidad_textos + 1) + largo_textos + 8 * COLUMNAS * filas
+    cuerpo = datos[inicio:]
+    if len(cuerpo) != esperado or zlib.crc32(cuerpo) != crc:
+        del cuerpo
+        return None
+
+    try:
+        lectura = json.loads(bytes(cuerpo[:largo_meta]))
+        posicion = largo_meta
+        posiciones = array("q")
+        posiciones.frombytes(cuerpo[posicion:posicion + 8 * (cantidad_textos + 1)])
+        posicion += 8 * (cantidad_textos + 1)
+        todo = str(cuerpo[posicion:posicion + largo_textos], "utf-8")
+        posicion += largo_textos
+    except ValueError:
+        del cuerpo
+        return None
+    textos = [todo[a:b] for a, b in zip(posiciones, posiciones[1:])]
+
+    columnas = []
+    for _ in range(COLUMNAS):
+        codigos = array("q")
+        codigos.frombytes(cuerpo[posicion:posicion + 8 * filas])
+        posicion += 8 * filas
+        columnas.append([
+            None if codigo == VACIO else textos[codigo >> 1] if codigo & 1 else codigo >> 1
+            for codigo in codigos
+        ])
+    del cuerpo
+    return lectura, columnas
@@ -1,6 +1,16 @@
 # modulos/validaciones.py
 # Funciones de validación para asegurar datos correctos.
 
+from datetime import date
+
+from modulos.cache import cache_lru
+
+# Fechas distintas que se recuerdan al convertir entre texto y ordinal
+TAMANO_CACHE_FECHAS = 8192
+
+# Días de cada mes en un año no bisiesto (índice 1 = enero)
+_DIAS_POR_MES = (0, 31, 28, 31, 30, 31, 30, 31, 31, 30, 31, 30, 31)
+
 def texto_no_vacio(texto: str) -> bool:
     # Valida que el texto no esté vacío (luego de quitar espacios).
     return texto.strip() != ""
@@ -8,45 +18,60 @@ def texto_no_vacio(texto: str) -> bool:
 
 def es_entero_positivo(valor: str) -> bool:
     # Valida que el string represente un entero positivo (1, 2, 3, ...).
-    return valor.isdigit() and int(valor) > 0
+    # Solo dígitos ASCII: "²" pasa isdigit() pero int() no lo acepta.
+    return valor.isascii() and valor.isdigit() and int(valor) > 0
 
 
-def es_fecha_dd_mm_yyyy(valor: str) -> bool:
-    # Valida una fecha con formato dd-mm-yyyy.
+def _leer_fecha(valor: str) -> tuple | None:
+    # Devuelve (día, mes, año) si el texto es una fecha dd-mm-yyyy válida.
     if not valor:
-        return False
+        return None
 
     partes = valor.split("-")
     if len(partes) != 3:
-        return False
+        return None
 
     dia, mes, anio = partes
-    if not (dia.isdigit() and mes.isdigit() and anio.isdigit()):
-        return False
+    # isdecimal y no isdigit: "²" es dígito pero int() no lo acepta
+    if not (dia.isdecimal() and mes.isdecimal() and anio.isdecimal()):
+        return None
 
     dia_i = int(dia)
     mes_i = int(mes)
     anio_i = int(anio)
 
-    if anio_i < 1900 or mes_i < 1 or mes_i > 12 or dia_i < 1:
-        return False
-
-    dias_por_mes = {
-        1: 31,
-        2: 29 if _es_bisiesto(anio_i) else 28,
-        3: 31,
-        4: 30,
-        5: 31,
-        6: 30,
-        7: 31,
-        8: 31,
-        9: 30,
-        10: 31,
-        11: 30,
-        12: 31,
-    }
-
-    return dia_i <= dias_por_mes[mes_i]
+    # date() solo admite años hasta 9999
+    if anio_i < 1900 or anio_i > 9999 or mes_i < 1 or mes_i > 12 or dia_i < 1:
+        return None
+
+    if mes_i == 2 and _es_bisiesto(anio_i):
+        maximo = 29
+    else:
+        maximo = _DIAS_POR_MES[mes_i]
+    return (dia_i, mes_i, anio_i) if dia_i <= maximo else None
+
+
+def es_fecha_dd_mm_yyyy(valor: str) -> bool:
+    # Valida una fecha con formato dd-mm-yyyy.
+    return _leer_fecha(valor) is not None
+
+
+@cache_lru(TAMANO_CACHE_FECHAS)
+def fecha_a_ordinal(valor: str) -> int | None:
+    # Convierte "dd-mm-yyyy" en número de día (date.toordinal); None si no es válida.
+    # Las fechas se repiten mucho entre pasajeros, por eso se memoriza.
+    partes = _leer_fecha(valor)
+    if partes is None:
+        return None
+    dia, mes, anio = partes
+    return date(anio, mes, dia).toordinal()
+
+
+@cache_lru(TAMANO_CACHE_FECHAS)
+def ordinal_a_fecha(ordinal: int) -> str:
+    # Convierte un número de día de vuelta a "dd-mm-yyyy".
+    fecha = date.fromordinal(ordinal)
+    return f"{fecha.day:02d}-{fecha.month:02d}-{fecha.year:04d}"
 
 
 def _es_bisiesto(anio: int) -> bool:
@@ -0,0 +1,74 @@
+# Archivo: modulos/versiones.py
+# Versión de los datos en memoria: un contador que sube con cada cambio real,
+# un resumen (digest) del contenido que se mantiene con XOR al agregar o
+# quitar pasajeros, y la versión del último cambio de cada documento para
+# responder "qué cambió desde la versión v" sin comparar copias.
+
+from __future__ import annotations
+
+
+def huella(pasajero) -> int:
+    # Resumen de un registro (válido dentro del mismo proceso)
+    return hash(pasajero._valores())
+
+
+class Versiones:
+    # version: sube en cada cambio (alta, modificación, baja o recarga distinta)
+    # digest: XOR de las huellas de todos los pasajeros
+    # _huellas: documento -> huella actual
+    # _cambios: documento -> versión de su último cambio, en orden de versión
+
+    def __init__(self) -> None:
+        self.version = 0
+        self.digest = 0
+        self._huellas = {}
+        self._cambios = {}
+        self._anteriores = None  # huellas previas mientras dura una recarga
+
+    def _marcar(self, documentos) -> None:
+        # Una versión nueva para todos los documentos dados
+        self.version += 1
+        for documento in documentos:
+            # Se reinserta para que el dict quede ordenado por versión
+            self._cambios.pop(documento, None)
+            self._cambios[documento] = self.version
+
+    def actualizar(self, documento: str, pasajero=None) -> None:
+        # Registra el estado nuevo de un documento (pasajero=None si se borró)
+        anterior = self._huellas.pop(documento, None)
+        nueva = None if pasajero is None else huella(pasajero)
+        if anterior is not None:
+            self.digest ^= anterior
+        if nueva is not None:
+            self._huellas[documento] = nueva
+            self.digest ^= nueva
+        if anterior != nueva and self._anteriores is None:
+            self._marcar((documento,))
+
+    def iniciar_recarga(self) -> None:
+        # Durante una recarga completa no se cuenta cada alta: al terminar se
+        # compara contra lo que había y se sube la versión una sola vez
+        if self._anteriores is None:
+            self._anteriores = (self._huellas, self.digest)
+        self._huellas = {}
+        self.digest = 0
+
+    def terminar_recarga(self) -> None:
+        anteriores, digest = self._anteriores
+        self._anteriores = None
+        if digest == self.digest and len(anteriores) == len(self._huellas):
+            return  # mismo contenido: no hay nada que recorrer
+        actuales = self._huellas
+        cambiados = [d for d, h in actuales.items() if anteriores.get(d) != h]
+        cambiados += [d for d in anteriores if d not in actuales]
+        if cambiados:
+            self._marcar(cambiados)
+
+    def cambios_desde(self, version: int) -> set:
+        # Documentos agregados, modificados o borrados después de `version`
+        cambiados = set()
+        for documento in reversed(self._cambios):
+            if self._cambios[documento] <= version:
+                break
+            cambiados.add(documento)
+        return cambiados
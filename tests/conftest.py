@@ -0,0 +1,17 @@
+import shutil
+from pathlib import Path
+
+import pytest
+
+import modulos.operaciones as operaciones
+
+CSV_EJEMPLO = Path(__file__).resolve().parents[1] / "data" / "datos_prueba.csv"
+
+
+@pytest.fixture(autouse=True)
+def csv_temporal(tmp_path, monkeypatch):
+    # Cada prueba trabaja sobre una copia del CSV de ejemplo, nunca sobre el real
+    ruta = tmp_path / "datos_prueba.csv"
+    shutil.copy(CSV_EJEMPLO, ruta)
+    monkeypatch.setattr(operaciones, "_ruta_csv_por_defecto", lambda: ruta)
+    return ruta
@@ -0,0 +1,122 @@
+import csv
+import sqlite3
+
+from modulos.operaciones import (
+    actualizar_pasajero,
+    buscar_pasajero_por_habitacion,
+    buscar_por_documento,
+    cerrar_persistencia,
+    contar_por_nacionalidad,
+    crear_estructura,
+    eliminar_pasajero,
+    guardar_pasajeros_a_csv,
+    habitacion_disponible,
+    importar_csv_a_sqlite,
+    llegadas_del_dia,
+    registrar_pasajero,
+    reporte_ocupacion,
+)
+
+
+def _pasajero(documento, habitacion, ingreso, salida, estado="Alojado"):
+    return {
+        "nombre": f"Pasajero {documento}",
+        "documento": documento,
+        "nacionalidad": "Chilena",
+        "habitacion": habitacion,
+        "fecha_ingreso": ingreso,
+        "fecha_salida": salida,
+        "estado": estado,
+    }
+
+
+def test_sqlite_importa_csv_y_consulta_sin_cargar_en_memoria(csv_temporal, tmp_path):
+    ruta_db = tmp_path / "hotel.sqlite3"
+    sistema = crear_estructura(ruta=csv_temporal, almacen="sqlite", ruta_db=ruta_db)
+
+    with csv_temporal.open(newline="", encoding="utf-8") as archivo:
+        primera = next(csv.DictReader(archivo))
+
+    assert sistema["pasajeros"] == {}
+    assert sistema["almacen"].contar() > 0
+    encontrado = buscar_por_documento(sistema, primera["documento"])
+    assert encontrado["nombre"] == primera["nombre"]
+    assert encontrado["fecha_ingreso"] == primera["fecha_ingreso"]
+    cerrar_persistencia(sistema)
+
+
+def test_sqlite_registra_actualiza_y_elimina_con_choques_por_fecha(tmp_path):
+    ruta_db = tmp_path / "hotel.sqlite3"
+    sistema = crear_estructura(cargar_csv=False, almacen="sqlite", ruta_db=ruta_db)
+
+    assert registrar_pasajero(sistema, _pasajero("A1", 101, "10-01-2025", "12-01-2025"))
+    assert not registrar_pasajero(sistema, _pasajero("A1", 102, "10-01-2025", "12-01-2025"))
+    assert not registrar_pasajero(sistema, _pasajero("B2", 101, "11-01-2025", "13-01-2025"))
+    assert registrar_pasajero(
+        sistema, _pasajero("B2", 101, "12-01-2025", "14-01-2025", "Reservado")
+    )
+
+    assert buscar_pasajero_por_habitacion(sistema, 101)["documento"] == "A1"
+    assert not habitacion_disponible(sistema, 101, "13-01-2025", "15-01-2025")
+    assert [p["documento"] for p in llegadas_del_dia(sistema, "12-01-2025")] == ["B2"]
+    assert contar_por_nacionalidad(sistema, fecha="10-01-2025") == {"Chilena": 1}
+
+    assert not actualizar_pasajero(sistema, "A1", {"fecha_salida": "13-01-2025"})
+    assert actualizar_pasajero(sistema, "A1", {"habitacion": 102})
+    assert eliminar_pasajero(sistema, "B2")
+    assert not eliminar_pasajero(sistema, "B2")
+    cerrar_persistencia(sistema)
+
+    # Lo confirmado queda en la base para la próxima sesión
+    sistema = crear_estructura(cargar_csv=False, almacen="sqlite", ruta_db=ruta_db)
+    assert buscar_por_documento(sistema, "A1")["habitacion"] == 102
+    assert buscar_por_documento(sistema, "B2") is None
+
+    exportado = tmp_path / "exportado.csv"
+    guardar_pasajeros_a_csv(sistema, exportado)
+    with exportado.open(newline="", encoding="utf-8") as archivo:
+        assert [fila["documento"] for fila in csv.DictReader(archivo)] == ["A1"]
+    cerrar_persistencia(sistema)
+
+
+def test_base_tomada_por_otra_conexion_es_un_rechazo_no_una_excepcion(tmp_path):
+    ruta_db = tmp_path / "hotel.sqlite3"
+    sistema = crear_estructura(cargar_csv=False, almacen="sqlite", ruta_db=ruta_db)
+    sistema["almacen"].conexion.execute("PRAGMA busy_timeout = 50")
+    otra = sqlite3.connect(ruta_db, isolation_level=None)
+    otra.execute("BEGIN IMMEDIATE")
+
+    assert not registrar_pasajero(sistema, _pasajero("A1", 101, "10-01-2025", "12-01-2025"))
+    otra.rollback()
+    assert registrar_pasajero(sistema, _pasajero("A1", 101, "10-01-2025", "12-01-2025"))
+    # Confirmado al registrar: la otra conexión ya puede escribir
+    otra.execute("BEGIN IMMEDIATE")
+    otra.rollback()
+    otra.close()
+    cerrar_persistencia(sistema)
+
+
+def test_importar_csv_valida_como_la_carga_en_memoria(tmp_path):
+    ruta = tmp_path / "pasajeros.csv"
+    ruta.write_text(
+        "nombre,documento,nacionalidad,habitacion,fecha_ingreso,fecha_salida,estado\n"
+        "Ana,AB123456,Chilena,101,10-01-2025,12-01-2025,Alojado\n"
+        "Luis,CD654321,Peruana,101,11-01-2025,13-01-2025,Alojado\n"
+        "Eva,EF111111,Chilena,102,15-01-2025,12-01-2025,Alojado\n"
+        "Ana,AB123456,Chilena,103,10-01-2025,12-01-2025,Alojado\n"
+        "Rosa,GH222222,Chilena,104,10-01-2025,12-01-2025,Check-out\n",
+        encoding="utf-8",
+    )
+    en_memoria = crear_estructura(ruta=ruta)
+    sistema = crear_estructura(
+        ruta=ruta, almacen="sqlite", ruta_db=tmp_path / "hotel.sqlite3", cargar_csv=False
+    )
+    rechazados = []
+    assert importar_csv_a_sqlite(sistema, ruta, rechazados) == 2
+    assert rechazados == ["CD654321", "EF111111", "AB123456"]
+    assert sistema["almacen"].contar() == len(en_memoria["pasajeros"])
+
+    # El reporte se cuenta en la base y coincide con el de memoria
+    for fecha in ("10-01-2025", "12-01-2025"):
+        assert reporte_ocupacion(sistema, fecha) == reporte_ocupacion(en_memoria, fecha)
+    cerrar_persistencia(sistema)
@@ -0,0 +1,98 @@
+from modulos.operaciones import (
+    actualizar_pasajero,
+    contar_por_nacionalidad,
+    crear_estructura,
+    eliminar_pasajero,
+    registrar_pasajero,
+)
+
+
+def _pasajero(documento, habitacion, nacionalidad, ingreso, salida, estado="Alojado"):
+    return {
+        "documento": documento,
+        "nombre": f"Pasajero {documento}",
+        "nacionalidad": nacionalidad,
+        "habitacion": habitacion,
+        "fecha_ingreso": ingreso,
+        "fecha_salida": salida,
+        "estado": estado,
+    }
+
+
+def _sistemas():
+    columnar = crear_estructura(cargar_csv=False, columnar=True)
+    simple = crear_estructura(cargar_csv=False)
+    return columnar, simple
+
+
+def test_conteo_columnar_coincide_con_recorrido():
+    columnar, simple = _sistemas()
+    for sistema in (columnar, simple):
+        registrar_pasajero(sistema, _pasajero("1", 101, "Chilena", "10-01-2025", "15-01-2025"), False)
+        registrar_pasajero(sistema, _pasajero("2", 102, "Peruana", "12-01-2025", "13-01-2025"), False)
+        registrar_pasajero(sistema, _pasajero("3", 103, "Chilena", "01-01-2025", "05-01-2025"), False)
+        registrar_pasajero(
+            sistema, _pasajero("4", 104, "Chilena", "10-01-2025", "20-01-2025", "Check-out"), False
+        )
+
+    for filtros in (
+        {},
+        {"fecha": "12-01-2025"},
+        {"fecha": "12-01-2025", "estado": "Alojado"},
+        {"estado": "Check-out"},
+        {"fecha": "13-01-2025", "estado": "Alojado"},
+    ):
+        assert contar_por_nacionalidad(columnar, **filtros) == contar_por_nacionalidad(
+            simple, **filtros
+        )
+    assert contar_por_nacionalidad(columnar, fecha="12-01-2025", estado="Alojado") == {
+        "Chilena": 1,
+        "Peruana": 1,
+    }
+
+
+def test_columnar_sigue_actualizaciones_y_eliminaciones():
+    sistema = crear_estructura(cargar_csv=False, columnar=True)
+    registrar_pasajero(sistema, _pasajero("1", 101, "Chilena", "10-01-2025", "15-01-2025"), False)
+    registrar_pasajero(sistema, _pasajero("2", 102, "Peruana", "10-01-2025", "15-01-2025"), False)
+
+    actualizar_pasajero(sistema, "1", {"nacionalidad": "Argentina"}, persistir=False)
+    eliminar_pasajero(sistema, "2", persistir=False)
+
+    almacen = sistema["columnar"]
+    assert contar_por_nacionalidad(sistema, fecha="11-01-2025") == {"Argentina": 1}
+    assert almacen.documentos_filtrados(estado="Alojado") == ["1"]
+    assert len(almacen) == 1
+    # Las lápidas se compactan cuando son mayoría
+    assert almacen.borrados < len(almacen.vivo)
+
+
+def test_mascara_de_fechas_coincide_con_comparar_fila_por_fila():
+    import random
+
+    from modulos.columnar import AlmacenColumnar
+    from modulos.operaciones import Pasajero
+
+    azar = random.Random(7)
+    almacen = AlmacenColumnar()
+    filas = []
+    for numero in range(600):
+        ingreso = 739_000 + azar.randrange(400)
+        salida = ingreso + azar.randrange(1, 30)
+        pasajero = Pasajero({"documento": str(numero), "habitacion": numero + 1})
+        pasajero.ingreso = ingreso if numero % 50 else "sin fecha"
+        pasajero.salida = salida
+        almacen.agregar(pasajero)
+        filas.append((pasajero.ingreso, salida))
+
+    def esperado(desde, hasta):
+        return [
+            str(numero) for numero, (ingreso, salida) in enumerate(filas)
+            if type(ingreso) is int
+            and (hasta is None or ingreso < hasta)
+            and (desde is None or salida > desde)
+        ]
+
+    # Con solo `hasta` o solo `desde` el rango queda abierto por el otro lado
+    for desde, hasta in ((739_100, 739_101), (739_255, 739_300), (None, 739_050), (739_390, None)):
+        assert almacen.documentos_filtrados(desde=desde, hasta=hasta) == esperado(desde, hasta)
@@ -0,0 +1,101 @@
+import io
+import json
+
+import pytest
+
+import main
+from modulos.comandos import ejecutar_comando, ejecutar_lote
+from modulos.entradas import convertir_documento, convertir_estado, convertir_habitacion
+from modulos.operaciones import crear_estructura
+
+REGISTRO = {
+    "accion": "registrar", "nombre": "Ana Soto", "documento": "12.345.678-5",
+    "nacionalidad": "Chilena", "habitacion": 901, "fecha_ingreso": "01-03-2025",
+    "fecha_salida": "05-03-2025", "estado": "1",
+}
+
+
+def test_convertir_usa_las_reglas_del_menu():
+    assert convertir_documento(" 12.345.678-5 ") == "12345678-5"
+    assert convertir_habitacion("12") == 12
+    assert convertir_estado("2") == "Check-out"
+    assert convertir_estado("alojado") == "Alojado"
+    for convertir, valor in (
+        (convertir_documento, "12345678-0"),
+        (convertir_habitacion, "0"),
+        (convertir_habitacion, True),
+        (convertir_estado, "3"),
+    ):
+        with pytest.raises(ValueError):
+            convertir(valor)
+
+
+def test_comandos_validan_y_ejecutan():
+    sistema = crear_estructura()
+    registro = ejecutar_comando(sistema, json.dumps(REGISTRO))
+    assert registro == {"accion": "registrar", "ok": True, "resultado": {"documento": "12345678-5"}}
+    assert sistema["pasajeros"]["12345678-5"]["estado"] == "Alojado"
+
+    duplicado = ejecutar_comando(sistema, json.dumps(REGISTRO))
+    assert duplicado["ok"] is False and "duplicado" in duplicado["error"]
+    fecha_mala = ejecutar_comando(sistema, json.dumps({**REGISTRO, "fecha_salida": "31-02-2025"}))
+    assert fecha_mala["error"].startswith("fecha_salida:")
+    assert ejecutar_comando(sistema, '{"accion": "volar"}')["ok"] is False
+    assert ejecutar_comando(sistema, "no es json")["error"] == "JSON inválido"
+
+    cambio = ejecutar_comando(
+        sistema, '{"accion": "actualizar", "documento": "12345678-5", "habitacion": "902"}'
+    )
+    assert cambio["resultado"]["habitacion"] == 902
+    buscado = ejecutar_comando(sistema, '{"accion": "buscar_habitacion", "habitacion": 902}')
+    assert buscado["resultado"]["documento"] == "12345678-5"
+
+
+def test_campos_de_texto_rechazan_objetos_y_listas():
+    sistema = crear_estructura()
+    for campo, valor in (
+        ("nombre", {"a": 1}),
+        ("nacionalidad", ["Chilena"]),
+        ("documento", 12345678),
+        ("fecha_ingreso", 20250301),
+        ("estado", 1),
+        ("habitacion", [901]),
+    ):
+        resultado = ejecutar_comando(sistema, json.dumps({**REGISTRO, campo: valor}))
+        assert resultado["ok"] is False and resultado["error"].startswith(f"{campo}:")
+    assert "12345678-5" not in sistema["pasajeros"]
+
+    nombre = ejecutar_comando(sistema, '{"accion": "buscar_nombre", "consulta": ["ana"]}')
+    assert nombre["error"] == "consulta: debe ser texto."
+
+
+def test_lote_escribe_una_linea_por_comando_sin_resincronizar(monkeypatch):
+    import modulos.operaciones as operaciones
+
+    sistema = crear_estructura()
+    monkeypatch.setattr(operaciones, "_leer_filas_csv", pytest.fail)
+    lineas = [
+        json.dumps(REGISTRO),
+        "",
+        '{"accion": "eliminar", "documento": "99999999-9"}',
+        '{"accion": "listar", "limite": 2}',
+    ]
+    salida = io.StringIO()
+    resumen = ejecutar_lote(sistema, lineas, salida)
+
+    resultados = [json.loads(linea) for linea in salida.getvalue().splitlines()]
+    assert [r["linea"] for r in resultados] == [1, 3, 4]
+    assert [r["ok"] for r in resultados] == [True, False, True]
+    assert resumen["comandos"] == 3 and resumen["errores"] == 1
+    assert resumen["por_segundo"] > 0
+
+
+def test_main_batch_lee_archivo_y_persiste(tmp_path, capsys):
+    comandos = tmp_path / "comandos.jsonl"
+    comandos.write_text(json.dumps(REGISTRO) + "\n", encoding="utf-8")
+    main.main(["--batch", str(comandos)])
+
+    salida = capsys.readouterr()
+    assert json.loads(salida.out)["ok"] is True
+    assert "ops/s" in salida.err
+    assert "12345678-5" in crear_estructura()["pasajeros"]
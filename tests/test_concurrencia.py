@@ -0,0 +1,228 @@
+import multiprocessing
+import random
+
+import pytest
+
+from modulos.importacion import importar_pasajeros_masivo
+from modulos.operaciones import (
+    CAMPOS_CSV,
+    buscar_por_documento,
+    cerrar_persistencia,
+    crear_estructura,
+    iniciar_escritor,
+    registrar_grupo,
+    registrar_pasajero,
+    tomar_conflictos,
+    transaccion,
+)
+from modulos.persistencia import incrementar_generacion, ruta_bloqueo
+
+fcntl = pytest.importorskip("fcntl")
+
+TERMINALES = 4
+CHECK_INS_POR_TERMINAL = 30
+
+
+def _pasajero(documento, habitacion, dia_ingreso, noches):
+    return {
+        "nombre": f"Pasajero {documento}",
+        "documento": documento,
+        "nacionalidad": "Chilena",
+        "habitacion": habitacion,
+        "fecha_ingreso": f"{dia_ingreso:02d}-03-2025",
+        "fecha_salida": f"{dia_ingreso + noches:02d}-03-2025",
+        "estado": "Reservado",
+    }
+
+
+def _terminal(ruta, numero, resultados):
+    # Una terminal que hace check-ins al azar sin sincronizar antes
+    azar = random.Random(numero)
+    sistema = crear_estructura(ruta=ruta)
+    sistema["persistencia"]["umbral_compactacion"] = 2_000  # compacta seguido
+    aceptados = []
+    for i in range(CHECK_INS_POR_TERMINAL):
+        documento = f"T{numero}-{i}"
+        pasajero = _pasajero(
+            documento, azar.randint(1, 8), azar.randint(1, 20), azar.randint(1, 5)
+        )
+        if registrar_pasajero(sistema, pasajero):
+            aceptados.append(documento)
+    resultados.put(aceptados)
+
+
+def test_terminales_concurrentes_no_pierden_check_ins(tmp_path):
+    ruta = tmp_path / "compartido.csv"
+    contexto = multiprocessing.get_context("fork")
+    resultados = contexto.Queue()
+    procesos = [
+        contexto.Process(target=_terminal, args=(ruta, numero, resultados))
+        for numero in range(TERMINALES)
+    ]
+    for proceso in procesos:
+        proceso.start()
+    aceptados = set()
+    for _ in procesos:
+        aceptados.update(resultados.get(timeout=60))
+    for proceso in procesos:
+        proceso.join(timeout=60)
+        assert proceso.exitcode == 0
+
+    # Cada check-in confirmado sigue ahí y no aparece ninguno rechazado
+    final = crear_estructura(ruta=ruta)
+    assert aceptados
+    assert set(final["pasajeros"]) == aceptados
+
+
+def test_conflicto_con_otra_terminal_se_rechaza_al_confirmar(tmp_path):
+    ruta = tmp_path / "compartido.csv"
+    terminal_a = crear_estructura(ruta=ruta)
+    terminal_b = crear_estructura(ruta=ruta)
+
+    assert registrar_pasajero(terminal_a, _pasajero("A1", 101, 10, 2))
+    # B no sincronizó: valida contra datos viejos, pero al confirmar ve a A
+    assert not registrar_pasajero(terminal_b, _pasajero("B1", 101, 11, 2))
+    # Ya se informó al devolver False: no queda pendiente de informar
+    assert tomar_conflictos(terminal_b) == []
+    assert buscar_por_documento(terminal_b, "A1") is not None
+    assert registrar_pasajero(terminal_b, _pasajero("B2", 102, 11, 2))
+
+    assert set(crear_estructura(ruta=ruta)["pasajeros"]) == {"A1", "B2"}
+
+
+def test_conflicto_del_escritor_en_segundo_plano_se_informa(tmp_path):
+    ruta = tmp_path / "compartido.csv"
+    terminal_a = crear_estructura(ruta=ruta)
+    terminal_b = crear_estructura(ruta=ruta)
+    iniciar_escritor(terminal_b, intervalo_ms=10_000)
+
+    # B lo da por hecho al encolarlo; el choque aparece recién al escribir
+    assert registrar_pasajero(terminal_b, _pasajero("B1", 101, 11, 2))
+    assert registrar_pasajero(terminal_a, _pasajero("A1", 101, 10, 2))
+    cerrar_persistencia(terminal_b)
+
+    assert tomar_conflictos(terminal_b) == [("CHECK-IN", "B1")]
+    assert tomar_conflictos(terminal_b) == []
+    # Lo que no se guardó tampoco queda en el historial
+    assert [evento.documento for evento in terminal_b["historial"]] == []
+
+
+def test_grupo_con_vista_vieja_no_se_confirma_a_medias(tmp_path):
+    ruta = tmp_path / "compartido.csv"
+    terminal_a = crear_estructura(ruta=ruta)
+    terminal_b = crear_estructura(ruta=ruta)
+    assert registrar_pasajero(terminal_b, _pasajero("B1", 101, 10, 2))
+
+    # A no sincronizó, pero la transacción valida contra lo último de disco
+    grupo = [_pasajero("G1", 101, 10, 2), _pasajero("G2", 102, 10, 2)]
+    assert registrar_grupo(terminal_a, grupo) == ["G1"]
+    assert "G2" not in terminal_a["pasajeros"]
+    assert set(crear_estructura(ruta=ruta)["pasajeros"]) == {"B1"}
+
+
+def test_transaccion_se_deshace_completa_si_otra_terminal_escribio(tmp_path):
+    ruta = tmp_path / "compartido.csv"
+    sistema = crear_estructura(ruta=ruta)
+    with transaccion(sistema) as estado:
+        assert registrar_pasajero(sistema, _pasajero("T1", 101, 10, 2))
+        assert registrar_pasajero(sistema, _pasajero("T2", 102, 10, 2))
+        # Otra terminal confirmó sin respetar el cerrojo
+        incrementar_generacion(ruta_bloqueo(ruta))
+
+    assert estado["conflictos"] == ["T1", "T2"]
+    assert not {"T1", "T2"} & set(sistema["pasajeros"])
+    assert not {"T1", "T2"} & set(crear_estructura(ruta=ruta)["pasajeros"])
+
+
+def test_importacion_no_se_pierde_si_otra_terminal_escribio(tmp_path):
+    ruta = tmp_path / "compartido.csv"
+    importadora = crear_estructura(ruta=ruta)
+    otra = crear_estructura(ruta=ruta)
+    assert registrar_pasajero(otra, _pasajero("O1", 101, 10, 2))
+
+    auditoria = tmp_path / "auditoria.csv"
+    auditoria.write_text(
+        ",".join(CAMPOS_CSV) + "\n"
+        "AB123456,Ana,Chilena,102,10-03-2025,12-03-2025,Alojado\n"
+        "CD654321,Luis,Peruana,101,11-03-2025,12-03-2025,Alojado\n",
+        encoding="utf-8",
+    )
+    resumen = importar_pasajeros_masivo(importadora, auditoria)
+
+    # La habitación 101 ya era de O1: se rechaza al importar, no después
+    assert (resumen["aceptados"], resumen["rechazados"]) == (1, 1)
+    assert set(crear_estructura(ruta=ruta)["pasajeros"]) == {"O1", "AB123456"}
+
+
+def _terminal_con_escritor(ruta, numero, resultados):
+    # Check-ins sin choques (habitación propia) con el escritor en segundo
+    # plano confirmando mientras otras terminales escriben
+    sistema = crear_estructura(ruta=ruta)
+    iniciar_escritor(sistema, intervalo_ms=1)
+    aceptados = []
+    for i in range(CHECK_INS_POR_TERMINAL * 10):
+        documento = f"E{numero}-{i}"
+        if registrar_pasajero(sistema, _pasajero(documento, numero * 1000 + i, 1, 2)):
+            aceptados.append(documento)
+    cerrar_persistencia(sistema)
+    resultados.put((aceptados, tomar_conflictos(sistema), len(sistema["pasajeros"])))
+
+
+def test_escritor_en_segundo_plano_no_pierde_check_ins(tmp_path):
+    ruta = tmp_path / "compartido.csv"
+    contexto = multiprocessing.get_context("fork")
+    resultados = contexto.Queue()
+    procesos = [
+        contexto.Process(target=_terminal_con_escritor, args=(ruta, numero, resultados))
+        for numero in range(2)
+    ]
+    for proceso in procesos:
+        proceso.start()
+    aceptados = set()
+    for _ in procesos:
+        documentos, conflictos, _ = resultados.get(timeout=120)
+        # Sin choques reales no hay conflictos ni rechazos
+        assert conflictos == []
+        assert len(documentos) == CHECK_INS_POR_TERMINAL * 10
+        aceptados.update(documentos)
+    for proceso in procesos:
+        proceso.join(timeout=60)
+        assert proceso.exitcode == 0
+
+    assert set(crear_estructura(ruta=ruta)["pasajeros"]) == aceptados
+
+
+def _terminal_sqlite(ruta, numero, resultados):
+    # Misma base SQLite y mismas habitaciones: solo uno puede quedarse cada una
+    sistema = crear_estructura(ruta=ruta, almacen="sqlite")
+    iniciar_escritor(sistema, intervalo_ms=50)
+    aceptados = []
+    for i in range(CHECK_INS_POR_TERMINAL):
+        documento = f"Q{numero}-{i}"
+        if registrar_pasajero(sistema, _pasajero(documento, 7 + i, 1, 2)):
+            aceptados.append(documento)
+    cerrar_persistencia(sistema)
+    resultados.put(aceptados)
+
+
+def test_sqlite_compartido_con_escritor_no_queda_bloqueado(tmp_path):
+    ruta = tmp_path / "compartido.csv"
+    contexto = multiprocessing.get_context("fork")
+    resultados = contexto.Queue()
+    procesos = [
+        contexto.Process(target=_terminal_sqlite, args=(ruta, numero, resultados))
+        for numero in range(2)
+    ]
+    for proceso in procesos:
+        proceso.start()
+    aceptados = []
+    for _ in procesos:
+        aceptados += resultados.get(timeout=60)
+    for proceso in procesos:
+        proceso.join(timeout=60)
+        assert proceso.exitcode == 0
+
+    # Cada habitación quedó para una sola terminal, sin "database is locked"
+    assert len(aceptados) == CHECK_INS_POR_TERMINAL
+    final = crear_estructura(ruta=ruta, almacen="sqlite", cargar_csv=False)
+    assert final["almacen"].contar() == CHECK_INS_POR_TERMINAL
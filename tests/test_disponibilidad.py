@@ -0,0 +1,66 @@
+from modulos.disponibilidad import Disponibilidad
+from modulos.operaciones import (
+    actualizar_pasajero,
+    buscar_pasajero_por_habitacion,
+    crear_estructura,
+    eliminar_pasajero,
+    habitacion_disponible,
+    habitaciones_disponibles,
+    registrar_pasajero,
+)
+
+
+def _estadia(documento, habitacion, ingreso, salida, estado="Alojado"):
+    return {
+        "documento": documento,
+        "habitacion": habitacion,
+        "fecha_ingreso": ingreso,
+        "fecha_salida": salida,
+        "estado": estado,
+    }
+
+
+def test_reserva_futura_en_habitacion_ocupada_hoy():
+    sistema = crear_estructura(cargar_csv=False)
+    assert registrar_pasajero(sistema, _estadia("A", 101, "10-01-2025", "12-01-2025"))
+    # El pasajero A sale el 12: la habitación queda libre desde esa noche
+    assert registrar_pasajero(sistema, _estadia("B", 101, "12-01-2025", "15-01-2025", "Reservado"))
+    assert not registrar_pasajero(sistema, _estadia("C", 101, "11-01-2025", "13-01-2025"))
+
+    assert buscar_pasajero_por_habitacion(sistema, 101)["documento"] == "A"
+    assert habitacion_disponible(sistema, 101, "15-01-2025", "16-01-2025")
+    assert not habitacion_disponible(sistema, 101, "14-01-2025", "16-01-2025")
+
+    eliminar_pasajero(sistema, "A")
+    assert 101 in sistema["habitaciones_ocupadas"]
+    assert habitacion_disponible(sistema, 101, "10-01-2025", "12-01-2025")
+
+
+def test_actualizar_fechas_respeta_otras_estadias():
+    sistema = crear_estructura(cargar_csv=False)
+    registrar_pasajero(sistema, _estadia("A", 101, "10-01-2025", "12-01-2025"))
+    registrar_pasajero(sistema, _estadia("B", 101, "12-01-2025", "15-01-2025"))
+
+    assert not actualizar_pasajero(sistema, "A", {"fecha_salida": "13-01-2025"})
+    assert actualizar_pasajero(sistema, "A", {"fecha_ingreso": "09-01-2025"})
+    assert habitaciones_disponibles(sistema, "09-01-2025", "10-01-2025", [101, 102]) == [102]
+    assert habitaciones_disponibles(sistema, "15-01-2025", "20-01-2025") == [101]
+
+
+def test_mapa_de_bits_coincide_con_fuerza_bruta():
+    disponibilidad = Disponibilidad()
+    ocupadas = set()
+    for ingreso, salida in ((100, 103), (90, 95), (103, 110), (80, 80)):
+        assert disponibilidad.libre(7, ingreso, salida)
+        disponibilidad.ocupar(7, ingreso, salida)
+        ocupadas |= set(range(ingreso, max(salida, ingreso + 1)))
+
+    for ingreso in range(70, 120):
+        for salida in range(ingreso, ingreso + 6):
+            noches = set(range(ingreso, max(salida, ingreso + 1)))
+            assert disponibilidad.libre(7, ingreso, salida) == (not noches & ocupadas)
+
+    disponibilidad.liberar(7, 90, 95)
+    disponibilidad.recortar(100)
+    assert disponibilidad.libre(7, 90, 100)
+    assert not disponibilidad.libre(7, 95, 101)
@@ -0,0 +1,57 @@
+from modulos.cache import cache_lru
+from modulos.documentos import normalizar_documento, normalizar_documentos
+from modulos.rut import calcular_dv
+
+
+def test_calcular_dv_casos_conocidos():
+    assert calcular_dv("11111111") == "1"
+    assert calcular_dv("22222222") == "2"
+    assert calcular_dv("12345678") == "5"
+    assert calcular_dv("10000013") == "K"
+    assert calcular_dv("1" * 30) == calcular_dv("1" * 24 + "111111")
+
+
+def test_solo_digitos_ascii_forman_un_rut():
+    # isdigit() también acepta "²" o "١"; no son RUT y "²" ni pasa por int()
+    from modulos.rut import validar_rut
+    from modulos.validaciones import es_entero_positivo
+
+    assert normalizar_documento("1²-K") is None
+    assert normalizar_documento("١٢٣٤٥٦٧٨-5") is None
+    assert not validar_rut("1²-K")
+    assert not es_entero_positivo("1²")
+    assert normalizar_documento("12.345.678-5") == "12345678-5"
+
+
+def test_normalizar_documentos_por_lotes_respeta_el_orden():
+    documentos = ["11.111.111-1", "22222222-3", "  ab12345 ", "", "12345678-5", "abc"] * 50
+    esperado = [normalizar_documento(documento) for documento in documentos]
+
+    assert normalizar_documentos(documentos, procesos=1) == esperado
+    assert normalizar_documentos(iter(documentos), procesos=2, tamano_lote=7) == esperado
+    assert esperado[:6] == ["11111111-1", None, "AB12345", None, "12345678-5", None]
+
+
+def test_cache_lru_cuenta_aciertos_y_desalojos():
+    llamadas = []
+
+    @cache_lru(2)
+    def doble(valor):
+        llamadas.append(valor)
+        return valor * 2
+
+    assert [doble(1), doble(1), doble(2), doble(3), doble(1)] == [2, 2, 4, 6, 2]
+    assert llamadas == [1, 2, 3, 1]
+    estadisticas = doble.estadisticas()
+    assert (estadisticas["aciertos"], estadisticas["fallos"], estadisticas["desalojos"]) == (1, 4, 2)
+
+    doble.configurar(0)
+    doble(5)
+    assert doble.estadisticas()["tamano"] == 0
+
+
+def test_normalizar_documento_usa_cache():
+    normalizar_documento.limpiar()
+    for _ in range(3):
+        assert normalizar_documento("11.111.111-1") == "11111111-1"
+    assert normalizar_documento.estadisticas()["aciertos"] == 2
@@ -0,0 +1,103 @@
+import random
+
+import pytest
+
+from modulos.estadias import IndiceEstadias
+from modulos.operaciones import (
+    actualizar_pasajero,
+    crear_estructura,
+    eliminar_pasajero,
+    llegadas_del_dia,
+    pasajeros_alojados_en,
+    registrar_pasajero,
+    salidas_del_dia,
+)
+
+
+def _documentos(pasajeros):
+    return sorted(p["documento"] for p in pasajeros)
+
+
+def test_consultas_por_fecha():
+    sistema = crear_estructura(cargar_csv=False)
+    registrar_pasajero(sistema, {"documento": "A", "habitacion": 1, "fecha_ingreso": "10-01-2025", "fecha_salida": "12-01-2025"})
+    registrar_pasajero(sistema, {"documento": "B", "habitacion": 2, "fecha_ingreso": "11-01-2025", "fecha_salida": "20-01-2025"})
+    registrar_pasajero(sistema, {"documento": "C", "habitacion": 3, "fecha_ingreso": "12-01-2025", "fecha_salida": "13-01-2025"})
+
+    assert _documentos(pasajeros_alojados_en(sistema, "11-01-2025")) == ["A", "B"]
+    assert _documentos(pasajeros_alojados_en(sistema, "12-01-2025")) == ["B", "C"]
+    assert _documentos(llegadas_del_dia(sistema, "12-01-2025")) == ["C"]
+    assert _documentos(salidas_del_dia(sistema, "12-01-2025")) == ["A"]
+
+    actualizar_pasajero(sistema, "B", {"fecha_salida": "12-01-2025"})
+    eliminar_pasajero(sistema, "C")
+    assert _documentos(pasajeros_alojados_en(sistema, "12-01-2025")) == []
+    assert _documentos(salidas_del_dia(sistema, "12-01-2025")) == ["A", "B"]
+
+
+def test_salida_anterior_al_ingreso_se_rechaza():
+    sistema = crear_estructura(cargar_csv=False)
+    assert registrar_pasajero(
+        sistema, {"documento": "A", "habitacion": 1, "fecha_ingreso": "10-01-2025", "fecha_salida": "09-01-2025"}
+    ) is False
+    registrar_pasajero(sistema, {"documento": "A", "habitacion": 1, "fecha_ingreso": "10-01-2025", "fecha_salida": "12-01-2025"})
+    assert actualizar_pasajero(sistema, "A", {"fecha_ingreso": "13-01-2025"}) is False
+    assert sistema["pasajeros"]["A"]["fecha_ingreso"] == "10-01-2025"
+
+
+def test_indice_coincide_con_recorrido_completo():
+    azar = random.Random(7)
+    indice = IndiceEstadias()
+    estadias = {}
+    for numero in range(500):
+        ingreso = azar.randint(0, 100)
+        estadias[str(numero)] = (ingreso, ingreso + azar.randint(0, 15))
+        indice.agregar(str(numero), *estadias[str(numero)])
+    for documento in list(estadias)[::3]:
+        indice.quitar(documento, *estadias.pop(documento))
+
+    for dia in range(-2, 120):
+        esperado = sorted(d for d, (i, s) in estadias.items() if i <= dia < s)
+        assert sorted(indice.alojados(dia)) == esperado
+        assert sorted(indice.llegadas(dia)) == sorted(d for d, (i, _) in estadias.items() if i == dia)
+
+
+def test_una_estadia_muy_larga_no_degrada_las_consultas():
+    # Antes la ventana de búsqueda era la duración máxima: una sola estadía de
+    # años hacía recorrer casi todo el índice en cada consulta
+    azar = random.Random(11)
+    indice = IndiceEstadias()
+    hoy = 739_000
+    estadias = {"LARGA": (hoy - 3_650, hoy + 3_650)}
+    for numero in range(2_000):
+        ingreso = hoy + azar.randint(-400, 400)
+        estadias[str(numero)] = (ingreso, ingreso + azar.randint(1, 10))
+    for documento, (ingreso, salida) in estadias.items():
+        indice.agregar(documento, ingreso, salida)
+    indice.quitar("0", *estadias.pop("0"))
+
+    # Cada consulta visita a lo sumo un nodo por nivel y solo copia estadías
+    # que sí están alojadas
+    assert indice.niveles <= 23
+    for dia in range(hoy - 3_700, hoy + 3_700, 7):
+        alojados = indice.alojados(dia)
+        assert len(alojados) == len(set(alojados))
+        assert sorted(alojados) == sorted(d for d, (i, s) in estadias.items() if i <= dia < s)
+
+
+def test_fechas_fuera_de_rango_se_rechazan_sin_excepcion():
+    from modulos.entradas import convertir_fecha
+    from modulos.validaciones import es_fecha_dd_mm_yyyy, fecha_a_ordinal
+
+    for fecha in ("01-01-10000", "31-12-99999", "0²-01-2025"):
+        assert not es_fecha_dd_mm_yyyy(fecha)
+        assert fecha_a_ordinal(fecha) is None
+        with pytest.raises(ValueError):
+            convertir_fecha(fecha)
+    assert fecha_a_ordinal("31-12-9999") == 3_652_059
+
+    sistema = crear_estructura(cargar_csv=False)
+    assert registrar_pasajero(sistema, {
+        "documento": "1", "habitacion": 101,
+        "fecha_ingreso": "01-01-2025", "fecha_salida": "01-01-10000",
+    })
@@ -0,0 +1,67 @@
+import bz2
+import gzip
+import json
+import lzma
+
+import pytest
+
+from modulos.exportacion import deducir_formato, exportar
+from modulos.operaciones import crear_estructura, guardar_pasajeros_a_csv, registrar_pasajero
+
+
+def test_exportar_csv_igual_a_guardar(tmp_path):
+    sistema = crear_estructura()
+    guardar_pasajeros_a_csv(sistema, tmp_path / "guardado.csv")
+    resumen = exportar(sistema, tmp_path / "exportado.csv", procesos=1, filas_por_bloque=2)
+
+    guardado = (tmp_path / "guardado.csv").read_text(encoding="utf-8").splitlines()
+    exportado = (tmp_path / "exportado.csv").read_text(encoding="utf-8").splitlines()
+    assert exportado[0] == guardado[0]
+    assert sorted(exportado[1:]) == sorted(guardado[1:])
+    assert resumen["filas"] == len(sistema["pasajeros"])
+    assert resumen["mb_por_segundo"] > 0
+
+
+@pytest.mark.parametrize("extension, abrir", [
+    ("jsonl.gz", gzip.open), ("jsonl.bz2", bz2.open), ("jsonl.xz", lzma.open),
+])
+def test_bloques_comprimidos_en_procesos_se_leen_como_un_archivo(tmp_path, extension, abrir):
+    sistema = crear_estructura()
+    ruta = tmp_path / f"pasajeros.{extension}"
+    resumen = exportar(sistema, ruta, procesos=2, filas_por_bloque=2)
+
+    with abrir(ruta, "rt", encoding="utf-8") as archivo:
+        filas = [json.loads(linea) for linea in archivo]
+    assert {fila["documento"] for fila in filas} == set(sistema["pasajeros"])
+    assert resumen["bytes"] == ruta.stat().st_size
+
+
+def test_exportar_filtra_por_fechas_y_estado(tmp_path):
+    sistema = crear_estructura(cargar_csv=False)
+    for numero, (ingreso, salida, estado) in enumerate([
+        ("01-03-2025", "05-03-2025", "Check-out"),
+        ("04-03-2025", "08-03-2025", "Alojado"),
+        ("10-03-2025", "12-03-2025", "Alojado"),
+    ]):
+        registrar_pasajero(sistema, {
+            "documento": f"D{numero}", "nombre": "X", "habitacion": 100 + numero,
+            "fecha_ingreso": ingreso, "fecha_salida": salida, "estado": estado,
+        })
+    ruta = tmp_path / "marzo.csv"
+    assert exportar(sistema, ruta, fecha_desde="04-03-2025", fecha_hasta="06-03-2025")["filas"] == 2
+    assert exportar(
+        sistema, ruta, fecha_desde="04-03-2025", fecha_hasta="06-03-2025", estado="Alojado"
+    )["filas"] == 1
+    assert ruta.read_text(encoding="utf-8").splitlines()[1].startswith("D1,")
+
+
+def test_formato_por_extension_y_errores(tmp_path):
+    assert deducir_formato(tmp_path / "a.jsonl.gz") == ("jsonl", "gzip")
+    assert deducir_formato(tmp_path / "a.csv") == ("csv", None)
+    sistema = crear_estructura()
+    with pytest.raises(ValueError):
+        exportar(sistema, tmp_path / "a.csv", formato="xml")
+    with pytest.raises(ValueError):
+        exportar(sistema, tmp_path / "a.csv", compresion="rar")
+    assert not (tmp_path / "a.csv").exists()
+    assert not list(tmp_path.glob(".a.csv.*"))
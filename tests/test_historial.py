@@ -0,0 +1,70 @@
+from modulos.historial import Historial
+from modulos.operaciones import (
+    actualizar_pasajero,
+    cerrar_persistencia,
+    crear_estructura,
+    eliminar_pasajero,
+    recargar_desde_csv,
+    registrar_pasajero,
+)
+
+
+def test_buffer_circular_vuelca_y_pagina_desde_disco(tmp_path):
+    ruta = tmp_path / "hotel.auditoria"
+    historial = Historial(lambda: ruta, capacidad=3, tamano_maximo=200, archivos=10)
+    for numero in range(10):
+        historial.registrar("CHECK-IN", f"D{numero}")
+        historial.volcar()  # un lote por evento, para forzar la rotación
+
+    assert len(historial) == 3
+    assert (tmp_path / "hotel.auditoria.1").exists()  # ya rotó al menos una vez
+
+    documentos = []
+    pagina, quedan_mas = 1, True
+    while quedan_mas:
+        eventos, quedan_mas = historial.pagina(pagina, 4)
+        documentos += [evento.documento for evento in eventos]
+        pagina += 1
+    assert documentos == [f"D{numero}" for numero in range(9, -1, -1)]
+
+
+def test_historial_guarda_cambios_y_sobrevive_a_recargas(csv_temporal):
+    sistema = crear_estructura()
+    cargados = len(sistema["historial"])
+    registrar_pasajero(sistema, {"documento": "H1", "nombre": "Ana", "habitacion": 901})
+    actualizar_pasajero(sistema, "H1", {"habitacion": 902, "nombre": "Ana"})
+    eliminar_pasajero(sistema, "H1")
+    recargar_desde_csv(sistema)
+
+    registro, cambio, baja = list(sistema["historial"])
+    assert cargados == 0  # cargar el CSV no es una acción del usuario
+    assert registro.cambios["nombre"] == [None, "Ana"]
+    assert cambio.accion == "UPDATE" and cambio.cambios == {"habitacion": [901, 902]}
+    assert baja.cambios["habitacion"] == [902, None]
+
+    # Al salir todo queda en el registro de auditoría y otra sesión lo ve
+    cerrar_persistencia(sistema)
+    otra = crear_estructura()
+    eventos, _ = otra["historial"].pagina(1, 10)
+    assert [evento.accion for evento in eventos] == ["DELETE", "UPDATE", "CHECK-IN"]
+
+
+def test_linea_cortada_por_una_caida_se_salta(tmp_path):
+    ruta = tmp_path / "hotel.auditoria"
+    historial = Historial(lambda: ruta, capacidad=1)
+    for numero in range(3):
+        historial.registrar("CHECK-IN", f"D{numero}")
+    historial.volcar(todo=True)
+    # Caída a mitad de la escritura: la última línea quedó incompleta
+    with ruta.open("ab") as archivo:
+        archivo.write('{"fecha": 1.0, "accion": "CHECK-IN", "documento": "Ñ'.encode()[:-1])
+
+    eventos, quedan_mas = Historial(lambda: ruta).pagina(1, 10)
+    assert [evento.documento for evento in eventos] == ["D2", "D1", "D0"]
+    assert not quedan_mas
+
+    # Lo que se escribe después no queda pegado a la línea cortada
+    historial.registrar("CHECK-IN", "D3")
+    historial.volcar(todo=True)
+    eventos, _ = Historial(lambda: ruta).pagina(1, 10)
+    assert [evento.documento for evento in eventos] == ["D3", "D2", "D1", "D0"]
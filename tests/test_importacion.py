@@ -0,0 +1,68 @@
+import csv
+
+from modulos.importacion import importar_pasajeros_masivo
+from modulos.operaciones import CAMPOS_CSV, crear_estructura
+
+
+def test_importacion_masiva_valida_y_reporta_rechazos(tmp_path):
+    ruta = tmp_path / "auditoria.csv"
+    filas = [
+        "11111111-1,Ana,Chilena,101,10-01-2025,12-01-2025,Alojado",
+        "11111111-2,RUT malo,Chilena,102,10-01-2025,12-01-2025,Alojado",
+        "AB123456,Luis,Peruana,abc,10-01-2025,12-01-2025,Alojado",
+        "CD654321,Eva,Peruana,103,31-02-2025,12-01-2025,Alojado",
+        "EF111111,Sin Pieza,Peruana,101,10-01-2025,12-01-2025,Alojado",
+        "GH222222,Repetido,Peruana,104,10-01-2025,12-01-2025,Alojado",
+        "GH222222,Repetido,Peruana,105,10-01-2025,12-01-2025,Alojado",
+        "22.222.222-2,Felipe,Chilena,106,10-01-2025,12-01-2025,Alojado",
+    ]
+    ruta.write_text(",".join(CAMPOS_CSV) + "\n" + "\n".join(filas) + "\n", encoding="utf-8")
+
+    sistema = crear_estructura(cargar_csv=False)
+    resumen = importar_pasajeros_masivo(sistema, ruta, tamano_lote=4, persistir=False)
+
+    assert resumen["filas"] == 8
+    # De un documento repetido se queda la primera fila
+    assert set(sistema["pasajeros"]) == {"11111111-1", "GH222222", "22222222-2"}
+    assert sistema["pasajeros"]["GH222222"]["habitacion"] == 104
+    assert resumen["aceptados"] == 3
+    assert resumen["rechazados"] == 5
+    assert resumen["filas_por_segundo"] > 0
+
+    with resumen["ruta_rechazos"].open(newline="", encoding="utf-8") as archivo:
+        motivos = {fila["nombre"]: fila["motivo"] for fila in csv.DictReader(archivo)}
+    assert motivos == {
+        "RUT malo": "documento inválido",
+        "Luis": "habitación inválida",
+        "Eva": "fecha inválida",
+        "Sin Pieza": "habitación ocupada",
+        "Repetido": "documento duplicado",
+    }
+
+
+def test_duplicado_entre_lotes_no_depende_del_tamano_del_lote(tmp_path):
+    ruta = tmp_path / "auditoria.csv"
+    filas = [
+        "AA111111,Uno,Chilena,201,10-01-2025,12-01-2025,Alojado",
+        "BB222222,Primero,Chilena,202,10-01-2025,12-01-2025,Alojado",
+        "BB222222,Segundo,Chilena,203,10-01-2025,12-01-2025,Alojado",
+        "CC333333,Pieza Ocupada,Chilena,201,10-01-2025,12-01-2025,Alojado",
+        "CC333333,Otra Pieza,Chilena,204,10-01-2025,12-01-2025,Alojado",
+    ]
+    ruta.write_text(",".join(CAMPOS_CSV) + "\n" + "\n".join(filas) + "\n", encoding="utf-8")
+
+    # Con lotes de 2 cada par de repetidos queda a caballo entre dos lotes;
+    # con 5 todo cae en el mismo lote
+    for tamano_lote in (2, 5):
+        sistema = crear_estructura(cargar_csv=False)
+        resumen = importar_pasajeros_masivo(
+            sistema, ruta, tmp_path / f"rechazos_{tamano_lote}.csv",
+            tamano_lote=tamano_lote, persistir=False,
+        )
+        assert resumen["aceptados"] == 3
+        assert sistema["pasajeros"]["BB222222"]["nombre"] == "Primero"
+        # Si la primera fila no entra, la siguiente con el mismo documento sí
+        assert sistema["pasajeros"]["CC333333"]["nombre"] == "Otra Pieza"
+        with resumen["ruta_rechazos"].open(newline="", encoding="utf-8") as archivo:
+            motivos = {fila["nombre"]: fila["motivo"] for fila in csv.DictReader(archivo)}
+        assert motivos == {"Segundo": "documento duplicado", "Pieza Ocupada": "habitación ocupada"}
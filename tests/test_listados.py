@@ -0,0 +1,77 @@
+import pytest
+
+from modulos.operaciones import (
+    crear_estructura,
+    iterar_pasajeros,
+    pagina_pasajeros,
+    registrar_pasajero,
+)
+
+
+def _cargar(sistema):
+    datos = [
+        ("D5", "Ñandú", "Chilena", 105, "01-02-2025", "03-02-2025", "Alojado"),
+        ("D1", "ana", "Peruana", 101, "05-02-2025", "07-02-2025", "Reservado"),
+        ("D3", "Beto", "Chilena", 103, "02-02-2025", "04-02-2025", "Alojado"),
+        ("D2", "Álvaro", "Chilena", 102, None, None, "Alojado"),
+        ("D4", "Carla", "Argentina", 104, "10-02-2025", "12-02-2025", "Check-out"),
+    ]
+    for documento, nombre, nacionalidad, habitacion, ingreso, salida, estado in datos:
+        registrar_pasajero(sistema, {
+            "documento": documento,
+            "nombre": nombre,
+            "nacionalidad": nacionalidad,
+            "habitacion": habitacion,
+            "fecha_ingreso": ingreso,
+            "fecha_salida": salida,
+            "estado": estado,
+        }, persistir=False)
+
+
+def _todas_las_paginas(sistema, limite, **opciones):
+    documentos, cursor = [], None
+    while True:
+        pagina, cursor = pagina_pasajeros(sistema, limite, cursor, **opciones)
+        documentos += [p["documento"] for p in pagina]
+        if cursor is None:
+            return documentos
+
+
+@pytest.fixture(params=["memoria", "sqlite"])
+def sistema(request, tmp_path):
+    sistema = crear_estructura(
+        cargar_csv=False, almacen=request.param, ruta_db=tmp_path / "hotel.sqlite3"
+    )
+    _cargar(sistema)
+    return sistema
+
+
+def test_paginas_recorren_todo_en_orden_estable(sistema):
+    assert _todas_las_paginas(sistema, 2) == ["D1", "D2", "D3", "D4", "D5"]
+    assert _todas_las_paginas(sistema, 2, orden="nombre") == ["D1", "D3", "D4", "D2", "D5"]
+    assert _todas_las_paginas(sistema, 3, orden="fecha_ingreso", descendente=True) == [
+        "D4", "D1", "D3", "D5", "D2"
+    ]
+    # Las páginas coinciden con el recorrido ordenado completo
+    assert [p["documento"] for p in iterar_pasajeros(sistema, orden="habitacion")] == [
+        "D1", "D2", "D3", "D4", "D5"
+    ]
+
+
+def test_cursor_sigue_valido_si_llegan_pasajeros_nuevos(sistema):
+    pagina, cursor = pagina_pasajeros(sistema, 2, orden="habitacion")
+    registrar_pasajero(sistema, {"documento": "D0", "nombre": "Cero", "habitacion": 100})
+    siguientes, _ = pagina_pasajeros(sistema, 10, cursor, orden="habitacion")
+    assert [p["documento"] for p in pagina] == ["D1", "D2"]
+    assert [p["documento"] for p in siguientes] == ["D3", "D4", "D5"]
+
+
+def test_filtros_del_listado(sistema):
+    def documentos(**filtros):
+        return sorted(p["documento"] for p in iterar_pasajeros(sistema, **filtros))
+
+    assert documentos(estado="Alojado", nacionalidad="Chilena") == ["D2", "D3", "D5"]
+    assert documentos(habitacion_desde=102, habitacion_hasta=104) == ["D2", "D3", "D4"]
+    assert documentos(fecha_desde="03-02-2025", fecha_hasta="05-02-2025") == ["D1", "D3"]
+    with pytest.raises(ValueError):
+        documentos(color="rojo")
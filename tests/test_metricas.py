@@ -0,0 +1,51 @@
+import pytest
+
+from modulos import metricas
+from modulos.operaciones import (
+    buscar_por_documento,
+    confirmar_cambios,
+    crear_estructura,
+    registrar_pasajero,
+)
+
+
+@pytest.fixture
+def activas():
+    metricas.reiniciar_metricas()
+    metricas.activar_metricas()
+    yield
+    metricas.activar_metricas(False)
+    metricas.reiniciar_metricas()
+
+
+def test_desactivadas_no_registran_nada():
+    metricas.reiniciar_metricas()
+    metricas.activar_metricas(False)
+    crear_estructura()
+    assert metricas.texto_prometheus().count("\n") == 2  # solo los encabezados
+    assert metricas.contadores() == {}
+
+
+def test_latencias_y_contadores_en_texto_prometheus(activas, csv_temporal):
+    sistema = crear_estructura(ruta=csv_temporal)
+    registrar_pasajero(sistema, {"documento": "M1", "nombre": "Ana", "habitacion": 901})
+    confirmar_cambios(sistema)
+    buscar_por_documento(sistema, "M1")
+
+    texto = metricas.texto_prometheus()
+    assert 'hotel_operacion_segundos_count{operacion="buscar_por_documento"} 1' in texto
+    assert 'hotel_operacion_segundos_bucket{operacion="recargar_desde_csv",le="+Inf"} 1' in texto
+    contadores = metricas.contadores()
+    assert contadores["bytes_leidos"] == csv_temporal.stat().st_size
+    assert contadores["filas_parseadas"] >= 1
+    assert contadores["bytes_escritos"] > 0
+    assert metricas.percentil("buscar_por_documento", 0.95) <= 10.0
+
+
+def test_sesion_perfilada_escribe_informes(tmp_path):
+    informes = tmp_path / "informes"
+    informes.mkdir()
+    with metricas.sesion_perfilada("ambos", informes):
+        crear_estructura()
+    assert {p.name for p in informes.iterdir()} == {"perfil.prof", "perfil.txt", "memoria.txt"}
+    assert "crear_estructura" in (informes / "perfil.txt").read_text()
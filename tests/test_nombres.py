@@ -0,0 +1,71 @@
+from modulos.nombres import IndiceNombres, normalizar_nombre
+from modulos.operaciones import (
+    actualizar_pasajero,
+    buscar_por_nombre,
+    crear_estructura,
+    eliminar_pasajero,
+    registrar_pasajero,
+)
+
+
+def test_normalizar_nombre_quita_tildes_mayusculas_y_espacios():
+    assert normalizar_nombre("  José   PÉREZ Ñúñez ") == "jose perez nunez"
+
+
+def test_indice_ordena_exacto_prefijo_y_parecidos():
+    indice = IndiceNombres()
+    for documento, nombre in [
+        ("1", "Ana Pérez"),
+        ("2", "Anabel Soto"),
+        ("3", "Juana Pérez"),
+        ("4", "Ana Perez"),
+        ("5", "Luis Rojas"),
+    ]:
+        indice.agregar(documento, nombre)
+
+    assert [d for _, _, d in indice.buscar("ana perez")] == ["1", "4", "3"]
+    assert [d for _, _, d in indice.buscar("ana")] == ["1", "4", "2"]
+    assert [d for _, _, d in indice.buscar("perez")] == ["1", "4", "3"]
+    # Con error de tipeo solo sirve la búsqueda por trigramas
+    assert [d for _, _, d in indice.buscar("luis rjas")] == ["5"]
+
+    indice.quitar("1", "Ana Pérez")
+    indice.quitar("4", "Ana Perez")
+    assert [d for _, _, d in indice.buscar("ana p")] == []
+    assert "ana perez" not in indice.documentos
+
+
+def test_buscar_por_nombre_se_mantiene_con_cada_operacion():
+    sistema = crear_estructura(cargar_csv=False)
+    registrar_pasajero(sistema, {"documento": "A1", "nombre": "María José", "habitacion": 1})
+    registrar_pasajero(sistema, {"documento": "A2", "nombre": "Mario Díaz", "habitacion": 2})
+
+    assert [p["documento"] for p in buscar_por_nombre(sistema, "MARI")] == ["A1", "A2"]
+    actualizar_pasajero(sistema, "A1", {"nombre": "Josefa Ruiz"})
+    assert [p["documento"] for p in buscar_por_nombre(sistema, "mari")] == ["A2"]
+    assert [p["documento"] for p in buscar_por_nombre(sistema, "ruiz")] == ["A1"]
+    eliminar_pasajero(sistema, "A2")
+    assert buscar_por_nombre(sistema, "mario") == []
+
+
+def test_prefijo_ordena_por_relevancia_antes_de_cortar():
+    indice = IndiceNombres()
+    # Los apellidos "soto" quedan antes en orden alfabético que "soto zuniga"
+    for numero in range(20):
+        indice.agregar(f"A{numero}", f"aa{numero:02d} soto")
+    indice.agregar("S", "Soto Zúñiga")
+
+    assert indice.por_prefijo("soto", 1) == [(2.0, "soto zuniga")]
+    assert [d for _, _, d in indice.buscar("soto", limite=2)] == ["S", "A0"]
+
+
+def test_altas_se_indexan_al_agregar():
+    indice = IndiceNombres()
+    indice.agregar("1", "Luis Rojas")
+    indice.agregar("2", 12345)
+
+    # Los trigramas ya están listos antes de la primera búsqueda aproximada
+    assert "luis rojas" in indice.trigramas[" lu"]
+    assert [d for _, _, d in indice.buscar("12345")] == ["2"]
+    indice.quitar("2", 12345)
+    assert len(indice) == 1
@@ -1,11 +1,25 @@
+from datetime import date
+
+import pytest
+
 from modulos.operaciones import (
+    CAMPOS_CSV,
+    Pasajero,
+    buscar_por_campo,
+    cerrar_persistencia,
     crear_estructura,
+    iniciar_escritor,
+    guardar_pasajeros_a_csv,
+    sincronizar_desde_csv,
     registrar_pasajero,
     buscar_por_documento,
     actualizar_pasajero,
     eliminar_pasajero,
     buscar_pasajero_por_habitacion,
+    cambios_desde,
+    version_datos,
 )
+from modulos.persistencia import ruta_bloqueo, ruta_journal
 
 
 def test_registrar_pasajero_ok():
@@ -87,3 +101,264 @@ def test_buscar_recursivo_por_habitacion():
 
     no_encontrado = buscar_pasajero_por_habitacion(sistema, 999)
     assert no_encontrado is None
+
+
+def _escribir_csv(ruta, filas, modo="w"):
+    with ruta.open(modo, newline="", encoding="utf-8") as archivo:
+        if modo == "w":
+            archivo.write(",".join(CAMPOS_CSV) + "\r\n")
+        for fila in filas:
+            archivo.write(fila + "\r\n")
+
+
+def test_sincronizar_sin_cambios_no_recarga(tmp_path):
+    ruta = tmp_path / "datos.csv"
+    _escribir_csv(ruta, ["111,Ana,Chilena,101,10-01-2025,12-01-2025,Alojado"])
+    sistema = crear_estructura(cargar_csv=False)
+    assert sincronizar_desde_csv(sistema, ruta) is True
+    assert sincronizar_desde_csv(sistema, ruta) is False
+    assert "111" in sistema["pasajeros"]
+
+
+def test_sincronizar_lee_solo_filas_anexadas(tmp_path):
+    ruta = tmp_path / "datos.csv"
+    _escribir_csv(ruta, ["111,Ana,Chilena,101,10-01-2025,12-01-2025,Alojado"])
+    sistema = crear_estructura(cargar_csv=False)
+    sincronizar_desde_csv(sistema, ruta)
+    original = sistema["pasajeros"]["111"]
+
+    _escribir_csv(ruta, ["222,Luis,Peruana,102,10-01-2025,12-01-2025,Alojado"], "a")
+    assert sincronizar_desde_csv(sistema, ruta) is True
+    assert "222" in sistema["pasajeros"]
+    # El registro previo no se volvió a parsear
+    assert sistema["pasajeros"]["111"] is original
+
+
+def test_sincronizar_recarga_si_el_archivo_se_reescribe(tmp_path):
+    ruta = tmp_path / "datos.csv"
+    _escribir_csv(ruta, ["111,Ana,Chilena,101,10-01-2025,12-01-2025,Alojado"])
+    sistema = crear_estructura(cargar_csv=False)
+    sincronizar_desde_csv(sistema, ruta)
+
+    _escribir_csv(ruta, ["333,Eva,Chilena,103,10-01-2025,12-01-2025,Alojado"])
+    assert sincronizar_desde_csv(sistema, ruta) is True
+    assert set(sistema["pasajeros"]) == {"333"}
+    assert sistema["habitaciones_ocupadas"] == {103}
+
+
+def test_version_y_cambios_desde_sin_comparar_copias(tmp_path):
+    ruta = tmp_path / "datos.csv"
+    _escribir_csv(ruta, [
+        "111,Ana,Chilena,101,10-01-2025,12-01-2025,Alojado",
+        "222,Luis,Peruana,102,10-01-2025,12-01-2025,Alojado",
+    ])
+    sistema = crear_estructura(cargar_csv=False)
+    sincronizar_desde_csv(sistema, ruta)
+    inicial = version_datos(sistema)
+
+    fila = "333,Eva,Chilena,103,10-01-2025,12-01-2025,Alojado"
+    datos = dict(zip(CAMPOS_CSV, fila.split(",")), habitacion=103)
+    registrar_pasajero(sistema, datos, persistir=False)
+    # Un cambio rechazado (habitación ocupada) no cambia la versión
+    version = version_datos(sistema)
+    assert not actualizar_pasajero(sistema, "111", {"habitacion": 102}, persistir=False)
+    assert version_datos(sistema) == version
+    assert cambios_desde(sistema, inicial) == {"333"}
+
+    # Reescritura con el mismo contenido (otro formato): recarga sin cambios
+    _escribir_csv(ruta, [
+        "222,Luis,Peruana,102,10-01-2025,12-01-2025,Alojado",
+        "111,Ana,Chilena,101,10-01-2025,12-01-2025,Alojado",
+        fila,
+    ])
+    assert sincronizar_desde_csv(sistema, ruta) is False
+    assert version_datos(sistema) == version
+
+    # Reescritura distinta: solo los documentos tocados aparecen en el delta
+    _escribir_csv(ruta, [
+        "111,Ana,Chilena,104,10-01-2025,12-01-2025,Alojado",
+        "222,Luis,Peruana,102,10-01-2025,12-01-2025,Alojado",
+    ])
+    assert sincronizar_desde_csv(sistema, ruta) is True
+    assert cambios_desde(sistema, version) == {"111", "333"}
+
+
+def test_guardar_no_provoca_resincronizacion(tmp_path):
+    ruta = tmp_path / "datos.csv"
+    _escribir_csv(ruta, [])
+    sistema = crear_estructura(cargar_csv=False)
+    sincronizar_desde_csv(sistema, ruta)
+    registrar_pasajero(sistema, {"documento": "123", "habitacion": 101}, persistir=False)
+    guardar_pasajeros_a_csv(sistema, ruta)
+    assert sincronizar_desde_csv(sistema, ruta) is False
+
+
+def test_journal_anexa_cambios_sin_reescribir_csv(csv_temporal):
+    contenido_csv = csv_temporal.read_bytes()
+    sistema = crear_estructura()
+    registrar_pasajero(sistema, {"documento": "123", "habitacion": 101, "nombre": "Juan"})
+    actualizar_pasajero(sistema, "123", {"habitacion": 102})
+    eliminar_pasajero(sistema, "11111111-1")
+
+    assert csv_temporal.read_bytes() == contenido_csv
+    lineas = ruta_journal(csv_temporal).read_text(encoding="utf-8").splitlines()
+    assert [linea.split(",")[0] for linea in lineas] == ["CHECK-IN", "UPDATE", "DELETE"]
+
+
+def test_journal_se_reproduce_al_iniciar(csv_temporal):
+    sistema = crear_estructura()
+    registrar_pasajero(sistema, {"documento": "123", "habitacion": 101, "nombre": "Juan"})
+    actualizar_pasajero(sistema, "123", {"habitacion": 102})
+    eliminar_pasajero(sistema, "11111111-1")
+
+    otro = crear_estructura()
+    assert otro["pasajeros"]["123"]["habitacion"] == 102
+    assert "11111111-1" not in otro["pasajeros"]
+    assert otro["habitaciones_ocupadas"] == sistema["habitaciones_ocupadas"]
+
+
+def test_journal_se_compacta_al_superar_umbral(csv_temporal):
+    sistema = crear_estructura()
+    sistema["persistencia"]["umbral_compactacion"] = 0
+    registrar_pasajero(sistema, {"documento": "123", "habitacion": 101, "nombre": "Juan"})
+
+    assert ruta_journal(csv_temporal).stat().st_size == 0
+    assert "123" in crear_estructura()["pasajeros"]
+    assert sincronizar_desde_csv(sistema) is False
+
+
+def test_sincronizar_lee_journal_de_otra_terminal(csv_temporal):
+    sistema = crear_estructura()
+    otra_terminal = crear_estructura()
+    registrar_pasajero(otra_terminal, {"documento": "123", "habitacion": 101, "nombre": "Juan"})
+
+    assert sincronizar_desde_csv(sistema) is True
+    assert "123" in sistema["pasajeros"]
+    assert sincronizar_desde_csv(otra_terminal) is False
+
+
+def test_guardar_csv_no_deja_temporales(csv_temporal):
+    sistema = crear_estructura(persistencia="csv")
+    registrar_pasajero(sistema, {"documento": "123", "habitacion": 101, "nombre": "Juan"})
+
+    # Junto al CSV solo queda el archivo de cerrojo entre terminales
+    assert sorted(p.name for p in csv_temporal.parent.iterdir()) == [
+        csv_temporal.name, ruta_bloqueo(csv_temporal).name
+    ]
+    assert "123" in crear_estructura()["pasajeros"]
+
+
+def test_escritor_en_segundo_plano_agrupa_y_cierra(csv_temporal):
+    sistema = crear_estructura()
+    iniciar_escritor(sistema, intervalo_ms=10_000)
+    for numero in range(5):
+        registrar_pasajero(
+            sistema,
+            {"documento": f"doc-{numero}", "habitacion": 500 + numero, "nombre": "Ana"},
+        )
+    # Nada se escribió todavía: el hilo espera el intervalo
+    assert not ruta_journal(csv_temporal).exists()
+
+    cerrar_persistencia(sistema)
+    assert sistema["persistencia"]["escritor"] is None
+    recargado = crear_estructura()
+    assert {f"doc-{numero}" for numero in range(5)} <= set(recargado["pasajeros"])
+
+
+def test_indices_se_mantienen_en_cada_operacion():
+    sistema = crear_estructura(cargar_csv=False)
+    registrar_pasajero(
+        sistema,
+        {"documento": "111", "habitacion": 101, "estado": "Alojado", "nacionalidad": "Chilena"},
+    )
+    registrar_pasajero(
+        sistema,
+        {"documento": "222", "habitacion": 102, "estado": "Alojado", "nacionalidad": "Peruana"},
+    )
+    actualizar_pasajero(sistema, "111", {"habitacion": 103, "estado": "Check-out"})
+
+    assert buscar_pasajero_por_habitacion(sistema, 101) is None
+    assert buscar_pasajero_por_habitacion(sistema, 103)["documento"] == "111"
+    assert [p["documento"] for p in buscar_por_campo(sistema, "estado", "Alojado")] == ["222"]
+
+    eliminar_pasajero(sistema, "222")
+    assert buscar_por_campo(sistema, "nacionalidad", "Peruana") == []
+    assert buscar_pasajero_por_habitacion(sistema, 102) is None
+
+
+def test_buscar_por_habitacion_no_usa_recursion_con_muchos_pasajeros():
+    sistema = crear_estructura(cargar_csv=False)
+    for numero in range(5000):
+        registrar_pasajero(
+            sistema, {"documento": f"doc-{numero}", "habitacion": numero + 1}, persistir=False
+        )
+    assert buscar_pasajero_por_habitacion(sistema, 5000)["documento"] == "doc-4999"
+
+
+def test_pasajero_compacto_se_usa_como_diccionario():
+    datos = {
+        "nombre": "Ana",
+        "documento": "111",
+        "nacionalidad": "Chilena",
+        "habitacion": 101,
+        "fecha_ingreso": "10-01-2025",
+        "fecha_salida": "15-01-2025",
+        "estado": "Alojado",
+    }
+    pasajero = Pasajero(datos)
+
+    assert pasajero == datos
+    assert dict(pasajero) == datos
+    assert pasajero.ingreso == date(2025, 1, 10).toordinal()
+    assert "estado" in pasajero and "otro" not in pasajero
+    assert Pasajero({"documento": "1", "habitacion": 1}).get("nombre") is None
+
+    otro = Pasajero(dict(datos, documento="222"))
+    assert otro.nacionalidad is pasajero.nacionalidad
+
+
+def test_registrar_guarda_pasajero_compacto():
+    sistema = crear_estructura(cargar_csv=False)
+    registrar_pasajero(sistema, {"documento": "123", "habitacion": 101, "fecha_ingreso": "01-02-2025"})
+    guardado = sistema["pasajeros"]["123"]
+    assert isinstance(guardado, Pasajero)
+    assert guardado["fecha_ingreso"] == "01-02-2025"
+
+
+def test_escritura_fallida_devuelve_los_cambios_a_la_cola(csv_temporal, monkeypatch):
+    import modulos.operaciones as operaciones
+
+    sistema = crear_estructura()
+    iniciar_escritor(sistema, intervalo_ms=10_000)
+    registrar_pasajero(sistema, {"documento": "doc-1", "habitacion": 501, "nombre": "Ana"})
+
+    def disco_lleno(*_):
+        raise OSError(28, "No space left on device")
+
+    monkeypatch.setattr(operaciones, "anexar_registros", disco_lleno)
+    with pytest.raises(OSError):
+        operaciones.confirmar_cambios(sistema)  # lo que hace el hilo en cada intervalo
+    assert len(sistema["persistencia"]["pendientes"]) == 1
+
+    sistema["persistencia"]["escritor"].error = OSError(28, "No space left on device")
+    assert isinstance(operaciones.tomar_error_escritura(sistema), OSError)
+    assert operaciones.tomar_error_escritura(sistema) is None
+
+    monkeypatch.undo()
+    monkeypatch.setattr(operaciones, "_ruta_csv_por_defecto", lambda: csv_temporal)
+    cerrar_persistencia(sistema)
+    assert "doc-1" in crear_estructura()["pasajeros"]
+
+
+def test_guardar_csv_recorre_sin_ordenar(tmp_path):
+    # Se escribe en el orden de alta: nada obliga a armar una lista ordenada
+    sistema = crear_estructura(cargar_csv=False)
+    for numero, documento in enumerate(("C3", "A1", "B2")):
+        registrar_pasajero(
+            sistema, {"documento": documento, "habitacion": numero + 1}, persistir=False
+        )
+    ruta = tmp_path / "guardado.csv"
+    guardar_pasajeros_a_csv(sistema, ruta)
+    assert [linea.split(",")[0] for linea in ruta.read_text().splitlines()[1:]] == [
+        "C3", "A1", "B2"
+    ]
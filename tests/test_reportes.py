@@ -0,0 +1,103 @@
+import json
+
+import pytest
+
+from modulos.comandos import ejecutar_comando
+from modulos.operaciones import (
+    TransaccionCancelada,
+    actualizar_pasajero,
+    crear_estructura,
+    eliminar_pasajero,
+    recargar_desde_csv,
+    registrar_pasajero,
+    reporte_ocupacion,
+    transaccion,
+)
+from modulos.reportes import Agregados
+
+
+def _recalculados(sistema):
+    return Agregados.recalcular(sistema["pasajeros"].values())
+
+
+def test_agregados_siguen_cada_cambio():
+    sistema = crear_estructura()
+    assert sistema["agregados"] == _recalculados(sistema)
+
+    for documento, habitacion in (("N0", 900), ("N1", 901)):
+        registrar_pasajero(sistema, {
+            "documento": documento, "nombre": "Ana", "nacionalidad": "Peruana",
+            "habitacion": habitacion, "fecha_ingreso": "10-06-2025",
+            "fecha_salida": "12-06-2025", "estado": "Alojado",
+        })
+    actualizar_pasajero(sistema, "N1", {"estado": "Check-out", "fecha_salida": "11-06-2025"})
+    assert actualizar_pasajero(sistema, "N1", {"habitacion": 900}) is False  # ocupada
+    eliminar_pasajero(sistema, "11111111-1")
+    with transaccion(sistema):
+        registrar_pasajero(sistema, {"documento": "N2", "habitacion": 902, "estado": "Alojado"})
+        raise TransaccionCancelada
+    assert sistema["agregados"] == _recalculados(sistema)
+
+    recargar_desde_csv(sistema)
+    assert sistema["agregados"] == _recalculados(sistema)
+
+
+def test_reporte_de_ocupacion():
+    sistema = crear_estructura(cargar_csv=False)
+    for numero, (estado, habitacion) in enumerate(
+        [("Alojado", 101), ("Alojado", 102), ("Check-out", 103)]
+    ):
+        registrar_pasajero(sistema, {
+            "documento": f"D{numero}", "nombre": "X", "nacionalidad": "Chilena",
+            "habitacion": habitacion, "fecha_ingreso": "01-03-2025",
+            "fecha_salida": "05-03-2025", "estado": estado,
+        })
+    reporte = reporte_ocupacion(sistema, "01-03-2025", habitaciones=10)
+    assert reporte["pasajeros"] == 3
+    assert reporte["por_estado"] == {"Alojado": 2, "Check-out": 1}
+    assert reporte["alojados_por_nacionalidad"] == {"Chilena": 2}
+    assert reporte["habitaciones_ocupadas"] == 2 and reporte["tasa_ocupacion"] == 0.2
+    assert reporte["llegadas"] == 3 and reporte["salidas"] == 0
+    assert reporte_ocupacion(sistema, "05-03-2025")["salidas"] == 3
+    with pytest.raises(ValueError):
+        reporte_ocupacion(sistema, "31-02-2025")
+
+
+def test_ocupacion_corresponde_a_la_fecha_del_reporte(tmp_path):
+    en_memoria = crear_estructura(cargar_csv=False)
+    en_sqlite = crear_estructura(
+        ruta=tmp_path / "vacio.csv", almacen="sqlite", ruta_db=tmp_path / "hotel.sqlite3"
+    )
+    for sistema in (en_memoria, en_sqlite):
+        for documento, habitacion, ingreso, salida in (
+            ("F1", 201, "01-07-2025", "04-07-2025"),
+            ("F2", 202, "03-07-2025", "06-07-2025"),
+        ):
+            registrar_pasajero(sistema, {
+                "documento": documento, "nombre": "X", "habitacion": habitacion,
+                "fecha_ingreso": ingreso, "fecha_salida": salida, "estado": "Reservado",
+            }, persistir=False)
+
+        ocupadas = [
+            reporte_ocupacion(sistema, fecha, habitaciones=4)["habitaciones_ocupadas"]
+            for fecha in ("30-06-2025", "01-07-2025", "03-07-2025", "05-07-2025", "06-07-2025")
+        ]
+        assert ocupadas == [0, 1, 2, 1, 0]
+
+
+def test_verificar_detecta_y_corrige_desvios():
+    sistema = crear_estructura()
+    assert reporte_ocupacion(sistema, verificar=True)["verificado"] is True
+
+    sistema["agregados"].por_estado["Fantasma"] = 7  # desvío simulado
+    reporte = reporte_ocupacion(sistema, verificar=True)
+    assert reporte["verificado"] is False
+    assert "Fantasma" not in reporte["por_estado"]
+    assert sistema["agregados"] == _recalculados(sistema)
+
+
+def test_reporte_como_comando_json():
+    sistema = crear_estructura()
+    resultado = ejecutar_comando(sistema, '{"accion": "reporte", "verificar": true}')
+    assert resultado["ok"] is True and resultado["resultado"]["verificado"] is True
+    json.dumps(resultado)  # serializable tal cual
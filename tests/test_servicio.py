@@ -0,0 +1,106 @@
+import asyncio
+import json
+
+import pytest
+
+from modulos.operaciones import crear_estructura
+from modulos.servicio import ErrorHTTP, _validar_campos, iniciar_servicio
+
+
+async def _pedir(lector, escritor, metodo, ruta, datos=None):
+    cuerpo = b"" if datos is None else json.dumps(datos).encode()
+    escritor.write(
+        f"{metodo} {ruta} HTTP/1.1\r\nHost: prueba\r\n"
+        f"Content-Length: {len(cuerpo)}\r\n\r\n".encode() + cuerpo
+    )
+    cabecera = await lector.readuntil(b"\r\n\r\n")
+    lineas = cabecera.decode().split("\r\n")
+    largo = next(
+        int(linea.split(":")[1]) for linea in lineas if linea.startswith("Content-Length")
+    )
+    respuesta = await lector.readexactly(largo)
+    return int(lineas[0].split()[1]), json.loads(respuesta) if respuesta else None
+
+
+def test_servicio_atiende_crud_en_una_conexion_keep_alive(csv_temporal):
+    async def escenario():
+        sistema = crear_estructura(ruta=csv_temporal)
+        servidor = await iniciar_servicio(sistema, "127.0.0.1", 0)
+        puerto = servidor.sockets[0].getsockname()[1]
+        lector, escritor = await asyncio.open_connection("127.0.0.1", puerto)
+        pasajero = {
+            "nombre": "Ana",
+            "documento": "ab123456",
+            "nacionalidad": "Peruana",
+            "habitacion": 901,
+            "fecha_ingreso": "10-01-2025",
+            "fecha_salida": "12-01-2025",
+            "estado": "Alojado",
+        }
+
+        codigo, creado = await _pedir(lector, escritor, "POST", "/pasajeros", pasajero)
+        assert codigo == 201 and creado["documento"] == "AB123456"
+        assert (await _pedir(lector, escritor, "POST", "/pasajeros", pasajero))[0] == 409
+        assert (await _pedir(lector, escritor, "POST", "/pasajeros", {"nombre": "X"}))[0] == 400
+
+        codigo, reporte = await _pedir(
+            lector, escritor, "GET", "/reporte?fecha=10-01-2025&verificar=1"
+        )
+        assert codigo == 200 and reporte["verificado"] and reporte["llegadas"] >= 1
+        codigo, encontrado = await _pedir(lector, escritor, "GET", "/habitaciones/901")
+        assert codigo == 200 and encontrado["nombre"] == "Ana"
+        codigo, cambiado = await _pedir(
+            lector, escritor, "PATCH", "/pasajeros/AB123456", {"estado": "Check-out"}
+        )
+        assert codigo == 200 and cambiado["estado"] == "Check-out"
+        assert (await _pedir(lector, escritor, "DELETE", "/pasajeros/AB123456"))[0] == 204
+        assert (await _pedir(lector, escritor, "GET", "/pasajeros/AB123456"))[0] == 404
+
+        escritor.close()
+        servidor.close()
+        await servidor.wait_closed()
+
+    asyncio.run(escenario())
+
+    # Todo lo confirmado por el servicio ya está en disco
+    otra_terminal = crear_estructura(ruta=csv_temporal)
+    assert "AB123456" not in otra_terminal["pasajeros"]
+    assert any(
+        linea.startswith("DELETE,AB123456")
+        for linea in csv_temporal.with_suffix(".journal").read_text().splitlines()
+    )
+
+
+def test_campos_invalidos_se_rechazan_antes_de_registrar():
+    # Cada campo pasa por las conversiones del menú, no solo el documento
+    for datos in ({"estado": ["x"]}, {"nombre": 123}, {"estado": "Perdido"},
+                  {"nacionalidad": "  "}, {"habitacion": True}):
+        with pytest.raises(ErrorHTTP) as error:
+            _validar_campos(datos, obligatorios=False)
+        assert error.value.codigo == 400
+
+    assert _validar_campos({"estado": "check-out", "nombre": " Ana "}, obligatorios=False) == {
+        "estado": "Check-out", "nombre": "Ana"
+    }
+
+
+def test_lecturas_esperan_a_la_recarga_del_sistema(csv_temporal):
+    async def escenario():
+        sistema = crear_estructura(ruta=csv_temporal)
+        servidor = await iniciar_servicio(sistema, "127.0.0.1", 0)
+        lote = sistema["persistencia"]["escritor"]
+        puerto = servidor.sockets[0].getsockname()[1]
+        lector, escritor = await asyncio.open_connection("127.0.0.1", puerto)
+
+        # Mientras se recarga (cerrojo tomado) el GET no ve diccionarios a medias
+        async with lote.cerrojo:
+            pedido = asyncio.create_task(_pedir(lector, escritor, "GET", "/pasajeros"))
+            await asyncio.sleep(0.05)
+            assert not pedido.done()
+        assert (await pedido)[0] == 200
+
+        escritor.close()
+        servidor.close()
+        await servidor.wait_closed()
+
+    asyncio.run(escenario())
@@ -0,0 +1,54 @@
+import pytest
+
+import modulos.operaciones as operaciones
+from modulos.operaciones import (
+    cerrar_persistencia,
+    crear_estructura,
+    registrar_pasajero,
+)
+from modulos.snapshot import ruta_snapshot
+
+
+@pytest.fixture(autouse=True)
+def snapshot_siempre(monkeypatch):
+    # El CSV de ejemplo es chico: se baja el mínimo para que haya caché
+    monkeypatch.setattr(operaciones, "MINIMO_FILAS_SNAPSHOT", 1)
+
+
+def _sin_leer_csv(monkeypatch):
+    def falla(*args, **kwargs):
+        raise AssertionError("se leyó el CSV")
+    monkeypatch.setattr(operaciones, "_leer_filas_csv", falla)
+
+
+def test_arranque_desde_la_cache_da_el_mismo_estado(csv_temporal, monkeypatch):
+    original = crear_estructura()
+    assert ruta_snapshot(csv_temporal).exists()
+
+    _sin_leer_csv(monkeypatch)
+    desde_cache = crear_estructura()
+    assert list(desde_cache["pasajeros"].items()) == list(original["pasajeros"].items())
+    assert desde_cache["habitaciones_ocupadas"] == original["habitaciones_ocupadas"]
+    assert desde_cache["indices"] == original["indices"]
+
+
+def test_cache_vieja_o_danada_se_ignora(csv_temporal):
+    crear_estructura()
+    with csv_temporal.open("a", encoding="utf-8") as archivo:
+        archivo.write("99999999-9,Nueva,Chilena,999,,,Alojado\n")
+    assert "99999999-9" in crear_estructura()["pasajeros"]
+
+    cache = ruta_snapshot(csv_temporal)
+    datos = bytearray(cache.read_bytes())
+    datos[-1] ^= 0xFF
+    cache.write_bytes(bytes(datos))
+    assert "99999999-9" in crear_estructura()["pasajeros"]
+
+
+def test_compactar_deja_la_cache_del_csv_nuevo(csv_temporal, monkeypatch):
+    sistema = crear_estructura()
+    registrar_pasajero(sistema, {"documento": "C1", "nombre": "Ana", "habitacion": 901})
+    cerrar_persistencia(sistema)
+
+    _sin_leer_csv(monkeypatch)
+    assert "C1" in crear_estructura()["pasajeros"]
@@ -0,0 +1,92 @@
+import pytest
+
+import modulos.operaciones as operaciones
+from modulos.operaciones import (
+    TransaccionCancelada,
+    actualizar_pasajero,
+    buscar_pasajero_por_habitacion,
+    crear_estructura,
+    eliminar_pasajero,
+    registrar_grupo,
+    registrar_pasajero,
+    transaccion,
+)
+from modulos.persistencia import ruta_journal
+
+
+def _grupo(cantidad, habitacion=500):
+    return [
+        {"documento": f"G{numero}", "nombre": f"Turista {numero}",
+         "habitacion": habitacion + numero, "estado": "Alojado"}
+        for numero in range(cantidad)
+    ]
+
+
+def test_transaccion_persiste_una_sola_vez(csv_temporal, monkeypatch):
+    escrituras = []
+    anexar = operaciones.anexar_registros
+    monkeypatch.setattr(
+        operaciones, "anexar_registros",
+        lambda ruta, registros: escrituras.append(len(registros)) or anexar(ruta, registros),
+    )
+    sistema = crear_estructura()
+    with transaccion(sistema) as estado:
+        for pasajero in _grupo(20):
+            assert registrar_pasajero(sistema, pasajero)
+        assert actualizar_pasajero(sistema, "G0", {"habitacion": 999})
+        assert eliminar_pasajero(sistema, "G1")
+        assert escrituras == []
+
+    assert escrituras == [22]
+    assert estado["conflictos"] == []
+    assert len(sistema["historial"]) == 22
+    otro = crear_estructura()
+    assert otro["pasajeros"]["G0"]["habitacion"] == 999
+    assert "G1" not in otro["pasajeros"]
+
+
+def test_error_deshace_pasajeros_habitaciones_e_historial(csv_temporal):
+    sistema = crear_estructura()
+    registrar_pasajero(sistema, {"documento": "123", "habitacion": 101, "nombre": "Juan"})
+    pasajeros = {d: dict(p) for d, p in sistema["pasajeros"].items()}
+    ocupadas = set(sistema["habitaciones_ocupadas"])
+    digest = sistema["versiones"].digest
+    historial = len(sistema["historial"])
+    journal = ruta_journal(csv_temporal).read_bytes()
+
+    with pytest.raises(RuntimeError):
+        with transaccion(sistema):
+            registrar_pasajero(sistema, {"documento": "N1", "habitacion": 777})
+            actualizar_pasajero(sistema, "123", {"habitacion": 101 + 1000})
+            eliminar_pasajero(sistema, "11111111-1")
+            raise RuntimeError("falla a mitad del grupo")
+
+    assert {d: dict(p) for d, p in sistema["pasajeros"].items()} == pasajeros
+    assert sistema["habitaciones_ocupadas"] == ocupadas
+    assert sistema["versiones"].digest == digest
+    assert len(sistema["historial"]) == historial
+    assert buscar_pasajero_por_habitacion(sistema, 101)["documento"] == "123"
+    assert buscar_pasajero_por_habitacion(sistema, 777) is None
+    assert ruta_journal(csv_temporal).read_bytes() == journal
+
+
+def test_registrar_grupo_es_todo_o_nada(csv_temporal):
+    sistema = crear_estructura()
+    grupo = _grupo(5)
+    grupo[3]["habitacion"] = grupo[1]["habitacion"]  # choca dentro del grupo
+    assert registrar_grupo(sistema, grupo) == ["G3"]
+    assert not any(p["documento"] in sistema["pasajeros"] for p in grupo)
+    assert all(buscar_pasajero_por_habitacion(sistema, 500 + n) is None for n in range(5))
+
+    assert registrar_grupo(sistema, _grupo(5)) == []
+    assert all(f"G{n}" in crear_estructura()["pasajeros"] for n in range(5))
+
+
+def test_transaccion_cancelada_en_sqlite(tmp_path):
+    sistema = crear_estructura(almacen="sqlite", ruta_db=tmp_path / "hotel.sqlite3")
+    total = sistema["almacen"].contar()
+    with transaccion(sistema):
+        registrar_pasajero(sistema, {"documento": "N1", "habitacion": 777})
+        assert sistema["almacen"].contar() == total + 1
+        raise TransaccionCancelada
+    assert sistema["almacen"].contar() == total